@@ -0,0 +1,166 @@
+"""JSON/HTTP API for the solver, mounted on the app that ui.run starts.
+
+    POST /api/solve        {"A": [[2, 1], [1, 3]], "B": [5, 10]}
+    POST /api/solve/batch  {"systems": [{"A": ..., "B": ...}, ...]}
+
+The single endpoint returns the fields of a solution dict (A, B, det_A,
+det_Ai_list, solutions, verification, det_sign, log_abs_det, cond and, for
+exact solves, exact). det_A is null when it overflows; det_sign and
+log_abs_det still describe it. The batch endpoint streams one JSON object
+per line (NDJSON) as chunks of systems are solved on the worker pool, with
+the same fields except A and B (the line's "index" points back to them); with
+"max_cond" it rejects systems whose condition estimate is higher. With
+"precision": "mixed" float systems are factored in float32 and refined to
+float64 accuracy; their lines add "refinement_steps" and "fallback" (true when
+refinement did not converge and the system was solved in float64).
+"""
+import asyncio
+import json
+import time
+from typing import List, Literal, Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, FiniteFloat, ValidationError
+
+from cramer_engine import solve
+from metrics import PhaseTimer
+from records import solution_json, solve_chunk
+
+
+class SystemRequest(BaseModel):
+    A: List[List[FiniteFloat]]
+    B: List[FiniteFloat]
+    exact: bool = True
+
+
+class BatchRequest(BaseModel):
+    systems: List[SystemRequest]
+    max_cond: Optional[FiniteFloat] = None
+    precision: Literal["double", "mixed"] = "double"
+
+
+class SolveAPI:
+    """HTTP endpoints that share the page's worker pool, solution cache and metrics.
+
+    At most max_concurrent API solves run on the pool at once (keep it below
+    the pool size so the page always has a free worker). Batches are solved
+    chunk by chunk and the next chunk only starts once the previous one has
+    been written to the client, so a slow reader holds back its own batch
+    instead of piling up results in memory.
+
+    A batch body is validated and turned into arrays on a thread, so a large
+    batch does not stall the event loop; max_coefficients caps the n·(n + 1)
+    values summed over its systems, and bodies longer than about 32 bytes of
+    JSON per allowed coefficient are refused before they are parsed.
+    """
+
+    def __init__(self, workers, cache, metrics, max_n, max_exact_n, offload_min_n,
+                 max_batch_size, max_coefficients, chunk_size, max_concurrent):
+        self.workers = workers
+        self.cache = cache
+        self.metrics = metrics
+        self.max_n = max_n
+        self.max_exact_n = max_exact_n
+        self.offload_min_n = offload_min_n
+        self.max_batch_size = max_batch_size
+        self.max_coefficients = max_coefficients
+        self.max_body_bytes = 32 * max_coefficients
+        self.chunk_size = chunk_size
+        self.slots = asyncio.Semaphore(max_concurrent)
+        self.router = APIRouter(prefix="/api", tags=["solver"])
+        self.router.add_api_route("/solve", self.solve, methods=["POST"])
+        self.router.add_api_route("/solve/batch", self.solve_batch, methods=["POST"])
+
+    def system_arrays(self, system, index=None):
+        """Validate the shape of one requested system and return float arrays"""
+        where = "" if index is None else f"systems[{index}]: "
+        n = len(system.B)
+        if not 2 <= n <= self.max_n:
+            raise HTTPException(422, f"{where}N must be between 2 and {self.max_n}, got {n}")
+        if len(system.A) != n or any(len(row) != n for row in system.A):
+            raise HTTPException(422, f"{where}A must be {n}×{n} to match the {n} values of B")
+        return np.array(system.A, dtype=float), np.array(system.B, dtype=float)
+
+    async def solve(self, system: SystemRequest):
+        """Solve one system and return the full solution record"""
+        timer = PhaseTimer()
+        A, B = self.system_arrays(system)
+        exact = system.exact and len(B) <= self.max_exact_n
+        mode = "exact" if exact else "float"
+        with timer.phase("cache_lookup"):
+            data = self.cache.get(A, B, mode)
+        if data is None:
+            try:
+                with timer.phase("solve"):
+                    if len(B) < self.offload_min_n:
+                        data = solve(A, B, exact=exact)
+                    else:
+                        async with self.slots:
+                            data = await self.workers.run(solve, A, B, exact=exact)
+            except np.linalg.LinAlgError as e:
+                self.metrics.count_singular("api")
+                raise HTTPException(422, str(e)) from None
+            timer.add_timings(data.get("timings", {}))
+            self.cache.put(A, B, mode, data)
+        record = solution_json(data)
+        self.metrics.record_solve(timer, len(B), mode, "api")
+        return record
+
+    def read_batch(self, body):
+        """Validate a batch body and return it with its (A, B, exact) systems; runs on a thread"""
+        try:
+            batch = BatchRequest.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False)) from None
+        if len(batch.systems) > self.max_batch_size:
+            raise HTTPException(
+                413, f"At most {self.max_batch_size} systems per batch, got {len(batch.systems)}"
+            )
+        coefficients = sum(len(system.B) * (len(system.B) + 1) for system in batch.systems)
+        if coefficients > self.max_coefficients:
+            raise HTTPException(
+                413, f"At most {self.max_coefficients} coefficients per batch, got {coefficients}"
+            )
+        # Reject the whole batch before streaming starts, so errors keep a proper status code
+        systems = [
+            (*self.system_arrays(system, index), system.exact)
+            for index, system in enumerate(batch.systems)
+        ]
+        return batch, systems
+
+    async def solve_batch(self, request: Request):
+        """Solve many systems and stream one NDJSON line per system, in order (body: BatchRequest)"""
+        body = bytearray()
+        async for part in request.stream():
+            body += part
+            if len(body) > self.max_body_bytes:
+                raise HTTPException(413, f"Batch bodies are limited to {self.max_body_bytes} bytes")
+        loop = asyncio.get_running_loop()
+        batch, systems = await loop.run_in_executor(None, self.read_batch, bytes(body))
+
+        async def lines():
+            for start in range(0, len(systems), self.chunk_size):
+                chunk = systems[start:start + self.chunk_size]
+                chunk_started = time.perf_counter()
+                async with self.slots:
+                    records = await self.workers.run(
+                        solve_chunk, chunk, self.max_exact_n, batch.max_cond, batch.precision
+                    )
+                self.metrics.observe_phase("batch_chunk", time.perf_counter() - chunk_started)
+                for (_, B, _), record in zip(chunk, records):
+                    if "error" in record:
+                        self.metrics.count_singular("api")
+                    elif "fallback" in record:
+                        mode = "batch_fallback" if record["fallback"] else "batch_mixed"
+                        self.metrics.count_solve(len(B), mode, "api")
+                    else:
+                        self.metrics.count_solve(len(B), "batch", "api")
+                yield "".join(
+                    json.dumps({"index": start + k, **record}) + "\n"
+                    for k, record in enumerate(records)
+                )
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+"""Solve files of stored systems in fixed-size chunks, with constant memory.
+
+Input files hold many systems of the same size n:
+
+    .npy   a stack of augmented matrices [A | B] of shape (count, n, n + 1),
+           memory-mapped; pages already solved are released again
+    .npz   arrays "A" (count, n, n) and "B" (count, n), as generators.py
+           writes them, or a single stack of augmented matrices; members are
+           streamed out of the archive, compressed or not
+    .csv   one system per line: the n * (n + 1) values of [A | B], row by row
+    .txt   the same, separated by spaces
+
+Every chunk is solved with one solve_batch call and its det_A, det_Ai,
+solutions and residuals (with the sign and log of det_A, the condition
+estimate and the singular flags) are written out before the next chunk is
+read. The output is a structured .npy, an .npz with one array per field or
+a CSV file with one line per system. With --workers, chunks are solved on a
+process pool while the main process reads and writes in order; at most two
+chunks per worker are in flight.
+
+    python batch.py systems.npz results.npz
+    python batch.py systems.csv results.csv --chunk 4096 --workers 4
+"""
+import argparse
+import math
+import mmap
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from cramer_engine import solve_batch
+
+DEFAULT_CHUNK = 1024  # Systems read, solved and written at a time
+# Output fields with one value per system, and their types
+SCALAR_FIELDS = {
+    "det_A": np.float64,
+    "det_sign": np.float64,
+    "log_abs_det": np.float64,
+    "cond": np.float64,
+    "singular": np.bool_,
+    "ill_conditioned": np.bool_,
+}
+MIXED_FIELDS = {"refinement_steps": np.int64, "fallback": np.bool_}  # Added in mixed precision
+VECTOR_FIELDS = ("det_Ai", "solutions", "residuals")  # n float64 values per system
+
+
+def read_npy_header(stream):
+    """(shape, dtype) of the .npy data that follows in stream"""
+    version = np.lib.format.read_magic(stream)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    if fortran_order and len(shape) > 1:
+        raise ValueError("Arrays in Fortran order cannot be streamed")
+    if dtype.hasobject:
+        raise ValueError("Arrays of Python objects cannot be loaded")
+    return shape, dtype
+
+
+def stream_rows(stream, shape, dtype, size):
+    """Yield blocks of up to size rows of the array whose data follows in stream"""
+    row_bytes = math.prod(shape[1:]) * dtype.itemsize
+    for start in range(0, shape[0], size):
+        rows = min(size, shape[0] - start)
+        data = stream.read(rows * row_bytes)
+        if len(data) != rows * row_bytes:
+            raise ValueError("The array data ends early")
+        yield np.frombuffer(data, dtype=dtype).reshape(rows, *shape[1:])
+
+
+def split_stack(M):
+    """(A, B) from a stack of augmented matrices of shape (count, n, n + 1)"""
+    return M[:, :, :-1], M[:, :, -1]
+
+
+class SystemFile:
+    """Systems of one size stored in a .npy, .npz, .csv or .txt file, read chunk by chunk"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.suffix = self.path.suffix.lower()
+        if self.suffix == ".npy":
+            with open(self.path, "rb") as stream:
+                shape, self.dtype = read_npy_header(stream)
+                self.offset = stream.tell()
+        elif self.suffix == ".npz":
+            with zipfile.ZipFile(self.path) as archive:
+                names = archive.namelist()
+                if {"A.npy", "B.npy"} <= set(names):
+                    self.members = ("A.npy", "B.npy")
+                elif len(names) == 1:
+                    self.members = (names[0],)
+                else:
+                    raise ValueError("Expected arrays named A and B, or a single stack of augmented matrices")
+                shapes = [self.member_header(archive, name)[0] for name in self.members]
+            shape = shapes[0]
+            if len(self.members) == 2:
+                count, n = shape[0], shape[-1]
+                if len(shape) != 3 or shape[1] != n or shapes[1] != (count, n):
+                    raise ValueError(
+                        f"Expected A of shape (count, n, n) and B of shape (count, n), "
+                        f"got {shape} and {shapes[1]}"
+                    )
+                shape = (count, n, n + 1)
+        elif self.suffix in (".csv", ".txt"):
+            shape = self.scan_text()
+        else:
+            raise ValueError(f"Unsupported file type {self.suffix or self.path.name!r}")
+        if len(shape) != 3 or shape[2] != shape[1] + 1:
+            raise ValueError(f"Expected augmented matrices of shape (count, n, n + 1), got {shape}")
+        self.count, self.n = shape[0], shape[1]
+
+    @staticmethod
+    def member_header(archive, name):
+        with archive.open(name) as stream:
+            return read_npy_header(stream)
+
+    def scan_text(self):
+        """Count the systems of a text file and infer n from the first one"""
+        count = 0
+        values = None
+        with open(self.path, encoding="utf-8") as stream:
+            for line in stream:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if values is None:
+                    values = len(line.replace(",", " ").split())
+                count += 1
+        if values is None:
+            raise ValueError("The file holds no systems")
+        n = round((math.sqrt(1 + 4 * values) - 1) / 2)
+        if n * (n + 1) != values:
+            raise ValueError(f"A line of [A | B] must hold n * (n + 1) values, got {values}")
+        return count, n, n + 1
+
+    def chunks(self, size):
+        """Yield (start, A, B) for consecutive chunks of up to size systems"""
+        if self.suffix == ".npy":
+            system_bytes = self.n * (self.n + 1) * self.dtype.itemsize
+            with open(self.path, "rb") as stream, \
+                    mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start in range(0, self.count, size):
+                    rows = min(size, self.count - start)
+                    stack = np.frombuffer(
+                        mapped, self.dtype, rows * self.n * (self.n + 1), self.offset + start * system_bytes
+                    ).reshape(rows, self.n, self.n + 1)
+                    chunk = stack.copy()
+                    del stack  # the mapping cannot close while an array still points into it
+                    yield (start, *split_stack(chunk))
+                    if hasattr(mmap, "MADV_DONTNEED"):
+                        # Mapped pages count as resident memory until they are dropped
+                        done = self.offset + (start + rows) * system_bytes
+                        mapped.madvise(mmap.MADV_DONTNEED, 0, done - done % mmap.PAGESIZE)
+        elif self.suffix == ".npz":
+            with zipfile.ZipFile(self.path) as archive:
+                streams = [archive.open(name) for name in self.members]
+                try:
+                    readers = [stream_rows(s, *read_npy_header(s), size) for s in streams]
+                    start = 0
+                    for blocks in zip(*readers):
+                        A, B = blocks if len(blocks) == 2 else split_stack(blocks[0])
+                        yield start, A, B
+                        start += len(A)
+                finally:
+                    for stream in streams:
+                        stream.close()
+        else:
+            delimiter = "," if self.suffix == ".csv" else None
+            with open(self.path, encoding="utf-8") as stream:
+                for start in range(0, self.count, size):
+                    rows = np.loadtxt(
+                        stream, delimiter=delimiter, comments="#", ndmin=2,
+                        max_rows=min(size, self.count - start),
+                    )
+                    if rows.shape[1] != self.n * (self.n + 1):
+                        raise ValueError(
+                            f"Every line must hold {self.n * (self.n + 1)} values, got {rows.shape[1]}"
+                        )
+                    yield (start, *split_stack(rows.reshape(-1, self.n, self.n + 1)))
+
+
+def solve_chunk(A, B, max_cond=None, precision="double"):
+    """Solve one chunk; only the output fields are sent back from a worker"""
+    result = solve_batch(A, B, max_cond, precision)
+    fields = [*SCALAR_FIELDS, *VECTOR_FIELDS, *(MIXED_FIELDS if precision == "mixed" else ())]
+    return {name: result[name] for name in fields}
+
+
+def output_fields(n, precision):
+    """(name, dtype, shape per system) of every output field"""
+    scalars = {**SCALAR_FIELDS, **(MIXED_FIELDS if precision == "mixed" else {})}
+    return [(name, dtype, ()) for name, dtype in scalars.items()] + [
+        (name, np.float64, (n,)) for name in VECTOR_FIELDS
+    ]
+
+
+def write_npy_header(stream, dtype, shape):
+    """Start a .npy file whose data will be appended to stream"""
+    np.lib.format.write_array_header_1_0(stream, {
+        "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        "fortran_order": False,
+        "shape": shape,
+    })
+
+
+class NpyWriter:
+    """One structured array with a record per system, appended chunk by chunk"""
+
+    def __init__(self, path, count, fields):
+        self.dtype = np.dtype([(name, field_type, shape) for name, field_type, shape in fields])
+        self.stream = open(path, "wb")
+        write_npy_header(self.stream, self.dtype, (count,))
+
+    def write(self, start, result):
+        records = np.empty(len(result["det_A"]), dtype=self.dtype)
+        for name, values in result.items():
+            records[name] = values
+        self.stream.write(records.tobytes())
+
+    def close(self):
+        self.stream.close()
+
+
+class NpzWriter:
+    """One array per field, appended to .npy files that are archived at the end"""
+
+    def __init__(self, path, count, fields):
+        self.path = Path(path)
+        self.folder = tempfile.TemporaryDirectory(dir=self.path.parent, prefix=".batch-")
+        self.streams = {}
+        for name, field_type, shape in fields:
+            stream = self.streams[name] = open(os.path.join(self.folder.name, f"{name}.npy"), "wb")
+            write_npy_header(stream, field_type, (count, *shape))
+        self.types = {name: field_type for name, field_type, _ in fields}
+
+    def write(self, start, result):
+        for name, values in result.items():
+            self.streams[name].write(np.ascontiguousarray(values, dtype=self.types[name]).tobytes())
+
+    def close(self):
+        for stream in self.streams.values():
+            stream.close()
+        try:
+            # Stored uncompressed like np.savez, so np.load reads it as usual
+            with zipfile.ZipFile(self.path, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+                for name in self.streams:
+                    archive.write(os.path.join(self.folder.name, f"{name}.npy"), f"{name}.npy")
+        finally:
+            self.folder.cleanup()
+
+
+class CsvWriter:
+    """One line per system: its index, the scalar fields and the n values of each vector field"""
+
+    def __init__(self, path, count, fields):
+        self.stream = open(path, "w", encoding="utf-8")
+        header = ["system"]
+        for name, _, shape in fields:
+            header += [f"{name}_{i + 1}" for i in range(shape[0])] if shape else [name]
+        self.stream.write(",".join(header) + "\n")
+        self.names = [name for name, _, _ in fields]
+
+    def write(self, start, result):
+        count = len(result["det_A"])
+        columns = [np.arange(start, start + count)] + [
+            np.asarray(result[name], dtype=float).reshape(count, -1) for name in self.names
+        ]
+        np.savetxt(self.stream, np.column_stack(columns), delimiter=",", fmt="%.17g")
+
+    def close(self):
+        self.stream.close()
+
+
+WRITERS = {".npy": NpyWriter, ".npz": NpzWriter, ".csv": CsvWriter, ".txt": CsvWriter}
+
+
+def solved_chunks(chunks, workers, max_cond, precision):
+    """Yield (start, result) in input order, solving on a process pool when workers > 0"""
+    if not workers:
+        for start, A, B in chunks:
+            yield start, solve_chunk(A, B, max_cond, precision)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for start, A, B in chunks:
+            # A bounded window keeps memory flat when reading outruns the workers
+            if len(pending) >= 2 * workers:
+                done_start, future = pending.popleft()
+                yield done_start, future.result()
+            pending.append((start, executor.submit(solve_chunk, A, B, max_cond, precision)))
+        while pending:
+            done_start, future = pending.popleft()
+            yield done_start, future.result()
+
+
+def solve_file(source, output, chunk_size=DEFAULT_CHUNK, workers=0, max_cond=None, precision="double"):
+    """Solve every system in source and write the results to output.
+
+    Returns (count, singular, ill_conditioned): the number of systems and of
+    those rejected as singular or as too ill-conditioned for max_cond.
+    """
+    writer_type = WRITERS.get(Path(output).suffix.lower())
+    if writer_type is None:
+        raise ValueError(f"The output must be a {', '.join(WRITERS)} file")
+    systems = SystemFile(source)
+    writer = writer_type(output, systems.count, output_fields(systems.n, precision))
+    singular = ill_conditioned = 0
+    try:
+        for start, result in solved_chunks(systems.chunks(chunk_size), workers, max_cond, precision):
+            writer.write(start, result)
+            singular += int(result["singular"].sum())
+            ill_conditioned += int(result["ill_conditioned"].sum())
+    finally:
+        writer.close()
+    return systems.count, singular, ill_conditioned
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a file of linear systems chunk by chunk")
+    parser.add_argument("source", help="systems in a .npy, .npz, .csv or .txt file")
+    parser.add_argument("output", help="results as a .npy, .npz, .csv or .txt file")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="systems per chunk")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: solve inline)")
+    parser.add_argument("--max-cond", type=float, help="reject systems with a higher condition estimate")
+    parser.add_argument("--precision", choices=("double", "mixed"), default="double")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        count, singular, ill_conditioned = solve_file(
+            args.source, args.output, args.chunk, args.workers, args.max_cond, args.precision
+        )
+    except (ValueError, OSError) as e:
+        print(f"batch.py: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    rejected = f", {ill_conditioned} too ill-conditioned" if args.max_cond is not None else ""
+    print(
+        f"Solved {count} systems ({singular} singular{rejected}) in {elapsed:.2f} s "
+        f"({count / elapsed:.0f} systems/s), results in {args.output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
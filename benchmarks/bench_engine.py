@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+"""Benchmark the solver math in cramer_engine.py.
+
+For every N and input kind (random, ill-conditioned) the phases of a float
+solve are timed separately (det, the Cramer step, verification), followed by
+the full cramer_solve, the textbook column-replacement loop for small N,
+exact mode for whole-number inputs, single versus batched solves, batches
+of every generator family (generators.py) and k right-hand sides solved one
+by one versus with one factorization.
+Batches are also solved in mixed precision (float32 factors refined to float64
+accuracy, with float64 and float32 input) to compare throughput, peak memory
+and accuracy against the float64 batch.
+
+    python benchmarks/bench_engine.py
+    python benchmarks/bench_engine.py --sizes 2 3 18 --output engine.json
+"""
+import argparse
+
+import numpy as np
+
+from common import (
+    ill_conditioned_system,
+    integer_system,
+    peak_memory,
+    random_system,
+    time_call,
+    write_results,
+)
+from cramer_engine import cramer_solve, exact_cramer_solve, solve_batch
+from generators import FAMILIES, generate_systems
+
+DEFAULT_SIZES = [2, 3, 4, 6, 8, 12, 16, 18, 32, 64, 128, 256, 512]
+KINDS = {"random": random_system, "ill_conditioned": ill_conditioned_system}
+MAX_CLASSIC_N = 18  # Largest N for the n + 1 determinant reference loop
+MAX_EXACT_N = 18  # Largest N for exact (Bareiss) mode, as on the page
+MAX_BATCH_N = 32  # Largest N for single versus batched comparisons
+BATCH_SIZE = 256  # Systems per batched solve
+RHS_COLUMNS = 32  # Right-hand sides per system in the multiple-B comparison
+PRECISION_BATCH_BYTES = 16 * 2**20  # float64 size of the batch in precision comparisons
+
+
+def classic_cramer(A, B):
+    """Textbook Cramer's Rule: one determinant per column-replaced matrix"""
+    det_A = np.linalg.det(A)
+    solutions = np.empty(len(B))
+    for i in range(len(B)):
+        A_i = A.copy()
+        A_i[:, i] = B
+        solutions[i] = np.linalg.det(A_i) / det_A
+    return solutions
+
+
+def try_cramer_solve(A, B):
+    """cramer_solve, counting a singular verdict as a result rather than an error"""
+    try:
+        return cramer_solve(A, B)
+    except np.linalg.LinAlgError:
+        return None
+
+
+def bench_phases(n, kind, A, B):
+    """det, Cramer step and verification timed on their own, then the full solve"""
+    det_A = np.linalg.det(A)
+    x = np.linalg.solve(A, B)
+    residual = np.linalg.norm(A @ x - B) / (np.linalg.norm(A) * np.linalg.norm(x))
+    info = {"n": n, "kind": kind}
+    results = [
+        {"name": f"det/{kind}/n={n}", **info, **time_call(lambda: np.linalg.det(A))},
+        {
+            "name": f"cramer_step/{kind}/n={n}",
+            **info,
+            **time_call(lambda: det_A * np.linalg.solve(A, B)),
+        },
+        {"name": f"verification/{kind}/n={n}", **info, **time_call(lambda: A @ x)},
+        {
+            "name": f"cramer_solve/{kind}/n={n}",
+            **info,
+            "rejected_as_singular": try_cramer_solve(A, B) is None,
+            "relative_residual": float(residual),
+            **time_call(lambda: try_cramer_solve(A, B)),
+        },
+    ]
+    if n <= MAX_CLASSIC_N:
+        results.append(
+            {
+                "name": f"classic_cramer/{kind}/n={n}",
+                **info,
+                **time_call(lambda: classic_cramer(A, B)),
+            }
+        )
+    return results
+
+
+def bench_exact(n, rng):
+    A, B = integer_system(n, rng)
+    return {
+        "name": f"exact_cramer_solve/integer/n={n}",
+        "n": n,
+        "kind": "integer",
+        **time_call(lambda: exact_cramer_solve(A, B)),
+    }
+
+
+def bench_batch(n, rng):
+    """Per-system cost of a loop of cramer_solve calls versus one solve_batch call"""
+    A = rng.standard_normal((BATCH_SIZE, n, n))
+    B = rng.standard_normal((BATCH_SIZE, n))
+    info = {"n": n, "kind": "random", "batch": BATCH_SIZE}
+    loop = time_call(lambda: [cramer_solve(A[k], B[k]) for k in range(BATCH_SIZE)])
+    batch = time_call(lambda: solve_batch(A, B))
+    results = []
+    for name, timing in (("single_loop", loop), ("solve_batch", batch)):
+        per_system = {key: value / BATCH_SIZE for key, value in timing.items() if key.endswith("_s")}
+        results.append({"name": f"{name}/random/n={n}", **info, **timing, **{
+            f"per_system_{key}": value for key, value in per_system.items()
+        }})
+    return results
+
+
+def bench_families(n, rng):
+    """solve_batch on BATCH_SIZE systems of each generator family"""
+    results = []
+    for family in FAMILIES:
+        A, B = generate_systems(family, BATCH_SIZE, n, seed=rng)
+        singular = solve_batch(A, B)["singular"]
+        results.append(
+            {
+                "name": f"solve_batch/{family}/n={n}",
+                "n": n,
+                "kind": family,
+                "batch": BATCH_SIZE,
+                "singular": int(singular.sum()),
+                **time_call(lambda: solve_batch(A, B)),
+            }
+        )
+    return results
+
+
+def bench_rhs(n, rng):
+    """k separate cramer_solve calls versus one call with an (n, k) matrix B"""
+    A = rng.standard_normal((n, n))
+    B = rng.standard_normal((n, RHS_COLUMNS))
+    info = {"n": n, "kind": "random", "rhs": RHS_COLUMNS}
+    return [
+        {
+            "name": f"rhs_one_by_one/random/n={n}",
+            **info,
+            **time_call(lambda: [cramer_solve(A, B[:, c]) for c in range(RHS_COLUMNS)]),
+        },
+        {
+            "name": f"rhs_together/random/n={n}",
+            **info,
+            **time_call(lambda: cramer_solve(A, B)),
+        },
+    ]
+
+
+def stacked_systems(make_system, n, count, rng):
+    systems = [make_system(n, rng) for _ in range(count)]
+    return np.stack([A for A, _ in systems]), np.stack([B for _, B in systems])
+
+
+def bench_precision(n, kind, make_system, rng):
+    """float64 versus mixed-precision solve_batch on a batch of about PRECISION_BATCH_BYTES"""
+    count = max(1, PRECISION_BATCH_BYTES // (8 * n * n))
+    A, B = stacked_systems(make_system, n, count, rng)
+    A32 = A.astype(np.float32)
+    info = {"n": n, "kind": kind, "batch": count}
+    results = []
+    for name, matrices, precision in (
+        ("batch_float64", A, "double"),
+        ("batch_mixed", A, "mixed"),
+        ("batch_mixed_f32_input", A32, "mixed"),
+    ):
+        result = solve_batch(matrices, B, precision=precision)
+        solved = ~result["singular"]
+        # Normwise backward error ||Ax - B|| / (||A|| ||x||), infinity norms
+        backward = np.abs(result["residuals"][solved]).max(axis=1) / (
+            np.abs(matrices[solved]).sum(axis=2).max(axis=1)
+            * np.abs(result["solutions"][solved]).max(axis=1)
+        )
+        timing = time_call(lambda: solve_batch(matrices, B, precision=precision), repeat=3)
+        results.append({
+            "name": f"{name}/{kind}/n={n}",
+            **info,
+            **timing,
+            "systems_per_s": count / timing["median_s"],
+            "peak_mb": peak_memory(lambda: solve_batch(matrices, B, precision=precision)) / 2**20,
+            "input_mb": (matrices.nbytes + B.nbytes) / 2**20,
+            "max_backward_error": float(backward.max()) if solved.any() else None,
+            "max_refinement_steps": int(result["refinement_steps"].max()),
+            "fallbacks": int(result["fallback"].sum()),
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Cramer's Rule engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--skip-precision", action="store_true", help="Skip the float64 versus mixed-precision batches"
+    )
+    parser.add_argument(
+        "--output", default="benchmarks/results/engine.json", help="JSON file for the results"
+    )
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    results = []
+    for n in args.sizes:
+        for kind, make_system in KINDS.items():
+            A, B = make_system(n, rng)
+            results.extend(bench_phases(n, kind, A, B))
+        if n <= MAX_EXACT_N:
+            results.append(bench_exact(n, rng))
+        if n <= MAX_BATCH_N:
+            results.extend(bench_batch(n, rng))
+            results.extend(bench_families(n, rng))
+        results.extend(bench_rhs(n, rng))
+        if not args.skip_precision:
+            for kind, make_system in KINDS.items():
+                results.extend(bench_precision(n, kind, make_system, rng))
+
+    write_results(args.output, "engine", results)
+
+
+if __name__ == "__main__":
+    main()
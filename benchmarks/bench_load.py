@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+"""Load-test the running app with many concurrent browser sessions.
+
+Every simulated session loads the page over HTTP and connects its websocket
+the way the browser does, then works through a realistic workflow: set N
+and update the grid, and for each round fill it randomly, solve, open the
+detailed steps and toggle the theme. Clicks and value changes are sent as
+the browser's own socket events, so every handler runs on the server's
+event loop exactly as it would for real users.
+
+The number of concurrent sessions is raised level by level. For every level
+and action the p50/p95/p99 latency is reported, from sending the event to
+the last websocket message of the response (the session then stays quiet
+for QUIET_SECONDS), with the websocket messages and bytes each action
+received ("open" counts the page's HTML as its one message). Each level adds a summary with actions per second and the CPU
+use and peak RSS of the server process and its children (read from /proc,
+so only on Linux).
+
+    python main.py &
+    python benchmarks/bench_load.py --clients 1 5 10 25 --pid $!
+    python benchmarks/bench_load.py --start --clients 1 10 50 --rounds 5
+"""
+import argparse
+import ast
+import asyncio
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+import aiohttp
+import numpy as np
+import socketio
+
+from common import ROOT, write_results
+
+DEFAULT_CLIENTS = [1, 5, 10, 25]
+QUIET_SECONDS = 0.1  # A response is complete once no message arrived for this long
+ACTION_TIMEOUT = 30  # Seconds to wait for the first message of a response
+SAMPLE_SECONDS = 0.25  # Interval of the server CPU and memory readings
+HTML_UNESCAPE = (("&#36;", "$"), ("&#96;", "`"), ("&gt;", ">"), ("&lt;", "<"), ("&amp;", "&"))
+
+
+class Session:
+    """One browser tab: the page's elements, kept current from the websocket updates"""
+
+    def __init__(self, url):
+        self.url = url
+        self.elements = {}
+        self.client_id = None
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.sio.on("*", self.on_message)
+        self.next_message_id = 0
+        self.messages = 0
+        self.bytes = 0
+        self.last_message = 0.0
+        self.arrived = asyncio.Event()
+        self.latencies = {}  # action -> [seconds]
+        self.traffic = {}  # action -> [(messages, bytes)]
+        self.timeouts = 0
+
+    async def on_message(self, event, data):
+        self.last_message = time.perf_counter()
+        self.messages += 1
+        self.bytes += len(json.dumps([event, data], default=str))
+        if isinstance(data, dict) and "_id" in data:
+            self.next_message_id = data.pop("_id") + 1
+        if event == "update":
+            for element_id, element in data.items():
+                if element is None:
+                    self.elements.pop(element_id, None)
+                else:
+                    self.elements[element_id] = element
+        self.arrived.set()
+
+    async def open(self, http):
+        """Load the page, then connect its websocket with the implicit handshake"""
+        start = time.perf_counter()
+        async with http.get(self.url) as response:
+            page = await response.text()
+        raw = re.search(r"parseElements\(String\.raw`(.*?)`\)", page, re.S).group(1)
+        for escaped, char in HTML_UNESCAPE:
+            raw = raw.replace(escaped, char)
+        self.elements = json.loads(raw)
+        query = ast.literal_eval(re.search(r"query: (\{.*?\}),\n", page).group(1))
+        self.client_id = query["client_id"]
+        query.update(document_id=os.urandom(8).hex(), tab_id=os.urandom(8).hex())
+        query = {key: str(value).lower() if isinstance(value, bool) else value for key, value in query.items()}
+        await self.sio.connect(
+            f"{self.url}?{urllib.parse.urlencode(query)}",
+            socketio_path="/_nicegui_ws/socket.io",
+            transports=["websocket"],
+        )
+        self.record("open", time.perf_counter() - start, 1, len(page))
+
+    async def close(self):
+        await self.sio.disconnect()
+
+    def find(self, text):
+        """Id of the element showing text (as its text or label)"""
+        for element_id, element in self.elements.items():
+            if text in (element.get("text"), element.get("props", {}).get("label")):
+                return element_id
+        raise LookupError(f"No element shows {text!r}")
+
+    def theme_button(self):
+        """Id of the theme toggle, which shows 🌙 or ☀️ depending on the theme"""
+        try:
+            return self.find("🌙")
+        except LookupError:
+            return self.find("☀️")
+
+    def next_sibling(self, text):
+        """Id of the element right after the one showing text, e.g. the input of a label"""
+        element_id = self.find(text)
+        for parent in self.elements.values():
+            children = [str(child) for child in parent.get("children", [])]
+            if element_id in children:
+                return children[children.index(element_id) + 1]
+        raise LookupError(f"Nothing follows {text!r}")
+
+    async def act(self, action, element_id, event_type, *args):
+        """Send a browser event and wait for the complete response"""
+        listener_id = next(
+            event["listener_id"]
+            for event in self.elements[element_id].get("events", [])
+            if event["type"] == event_type
+        )
+        self.arrived.clear()
+        messages, sent = self.messages, self.bytes
+        start = time.perf_counter()
+        await self.sio.emit("event", {
+            "id": int(element_id),
+            "client_id": self.client_id,
+            "listener_id": listener_id,
+            "args": [json.dumps(arg) for arg in args],
+        })
+        try:
+            await asyncio.wait_for(self.arrived.wait(), ACTION_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return
+        while time.perf_counter() - self.last_message < QUIET_SECONDS:
+            await asyncio.sleep(QUIET_SECONDS / 4)
+        self.record(action, self.last_message - start, self.messages - messages, self.bytes - sent)
+        await self.sio.emit("ack", {"client_id": self.client_id, "next_message_id": self.next_message_id})
+
+    def record(self, action, seconds, messages, sent):
+        self.latencies.setdefault(action, []).append(seconds)
+        self.traffic.setdefault(action, []).append((messages, sent))
+
+
+async def workflow(session, http, n, rounds, think):
+    """The actions of one user: open the page, pick N, then fill, solve, read the steps, switch theme"""
+    await session.open(http)
+    try:
+        await session.act("set_n", session.next_sibling("Number of Variables (N):"), "update:modelValue", n)
+        await session.act("update_grid", session.find("Update Grid"), "click")
+        for _ in range(rounds):
+            await asyncio.sleep(think)
+            await session.act("random_fill", session.find("🎲 Random"), "click")
+            await asyncio.sleep(think)
+            await session.act("solve", session.find("🧮 Solve System"), "click")
+            await asyncio.sleep(think)
+            steps = session.find("📊 Show Detailed Solution Steps")
+            await session.act("open_steps", steps, "update:modelValue", True)
+            await asyncio.sleep(think)
+            await session.act("toggle_theme", session.theme_button(), "click")
+    finally:
+        await session.close()
+
+
+def process_tree(pid):
+    """pid and all of its descendants"""
+    pids = [pid]
+    for parent in pids:
+        for task in Path(f"/proc/{parent}/task").glob("*"):
+            try:
+                pids.extend(int(child) for child in (task / "children").read_text().split())
+            except OSError:
+                pass
+    return pids
+
+
+def read_usage(pid):
+    """(CPU seconds, RSS bytes) summed over a process tree, or None without /proc"""
+    if pid is None or not Path(f"/proc/{pid}").exists():
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    cpu = rss = 0
+    for child in process_tree(pid):
+        try:
+            fields = Path(f"/proc/{child}/stat").read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        cpu += (int(fields[11]) + int(fields[12])) / ticks  # utime + stime
+        rss += int(fields[21]) * page_size
+    return cpu, rss
+
+
+async def sample_server(pid, readings, stop):
+    while not stop.is_set():
+        usage = read_usage(pid)
+        if usage is not None:
+            readings.append((time.perf_counter(), *usage))
+        try:
+            await asyncio.wait_for(stop.wait(), SAMPLE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def percentiles(samples):
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {"median_s": float(p50), "p95_s": float(p95), "p99_s": float(p99), "best_s": min(samples)}
+
+
+async def run_level(url, clients, n, rounds, think, pid):
+    """Run clients sessions at once; one result per action and a summary for the level"""
+    sessions = [Session(url) for _ in range(clients)]
+    readings, stop = [], asyncio.Event()
+    sampler = asyncio.create_task(sample_server(pid, readings, stop))
+    start = time.perf_counter()
+    async with aiohttp.ClientSession() as http:
+        outcomes = await asyncio.gather(
+            *(workflow(session, http, n, rounds, think) for session in sessions),
+            return_exceptions=True,
+        )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await sampler
+
+    failures = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    for failure in failures[:3]:
+        print(f"clients={clients}: session failed: {failure!r}", file=sys.stderr)
+
+    info = {"clients": clients, "n": n, "rounds": rounds}
+    results = []
+    actions = {}
+    for session in sessions:
+        for action, samples in session.latencies.items():
+            actions.setdefault(action, ([], []))[0].extend(samples)
+            actions[action][1].extend(session.traffic[action])
+    for action, (samples, traffic) in actions.items():
+        results.append({
+            "name": f"{action}/clients={clients}",
+            **info,
+            "samples": len(samples),
+            **percentiles(samples),
+            "ws_messages": float(np.mean([m for m, _ in traffic])),
+            "ws_bytes": float(np.mean([b for _, b in traffic])),
+        })
+
+    all_samples = [s for samples, _ in actions.values() for s in samples]
+    summary = {
+        "name": f"all_actions/clients={clients}",
+        **info,
+        "samples": len(all_samples),
+        **(percentiles(all_samples) if all_samples else {"median_s": float("nan")}),
+        "actions_per_s": len(all_samples) / elapsed,
+        "failed_sessions": len(failures),
+        "timeouts": sum(session.timeouts for session in sessions),
+        "ws_messages": sum(session.messages for session in sessions),
+        "ws_bytes": sum(session.bytes for session in sessions),
+    }
+    if len(readings) >= 2:
+        (t0, cpu0, _), (t1, cpu1, _) = readings[0], readings[-1]
+        summary["server_cpu_percent"] = 100 * (cpu1 - cpu0) / (t1 - t0)
+        summary["server_rss_mb"] = max(rss for _, _, rss in readings) / 2**20
+    results.append(summary)
+    return results
+
+
+def start_server(url, timeout=60):
+    """Start main.py in its own process group and wait until it serves the page"""
+    process = subprocess.Popen(
+        [sys.executable, "main.py"], cwd=ROOT, start_new_session=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.5)
+    stop_server(process)
+    raise RuntimeError(f"The app did not answer on {url} within {timeout} s")
+
+
+def stop_server(process):
+    os.killpg(process.pid, signal.SIGTERM)
+    process.wait(timeout=10)
+
+
+async def run(url, levels, n, rounds, think, pid):
+    results = []
+    for clients in levels:
+        results.extend(await run_level(url, clients, n, rounds, think, pid))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the app with concurrent browser sessions")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/", help="page of the running app")
+    parser.add_argument("--clients", type=int, nargs="+", default=DEFAULT_CLIENTS,
+                        help="concurrent sessions per level")
+    parser.add_argument("--n", type=int, default=6, help="number of variables the sessions solve")
+    parser.add_argument("--rounds", type=int, default=3, help="fill/solve/steps/theme rounds per session")
+    parser.add_argument("--think", type=float, default=0.1, help="seconds between a session's actions")
+    parser.add_argument("--pid", type=int, help="server process for CPU and RSS readings")
+    parser.add_argument("--start", action="store_true", help="start main.py for the test and stop it after")
+    parser.add_argument(
+        "--output", default="benchmarks/results/load.json", help="JSON file for the results"
+    )
+    args = parser.parse_args(argv)
+
+    process = start_server(args.url) if args.start else None
+    pid = process.pid if process is not None else args.pid
+    try:
+        results = asyncio.run(run(args.url, args.clients, args.n, args.rounds, args.think, pid))
+    finally:
+        if process is not None:
+            stop_server(process)
+    write_results(args.output, "load", results)
+
+
+if __name__ == "__main__":
+    main()
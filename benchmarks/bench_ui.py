@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""Benchmark the page's render paths under NiceGUI's simulated user.
+
+Each operation is run on a live CramersRuleSolver page: render_grid,
+rebuild_ui, fill_random, clear_inputs and show_solution_with_data (regular
+and large-N). Besides the
+time of the Python call, the elements it created and the websocket
+messages and bytes sent to the browser afterwards are recorded.
+
+    python benchmarks/bench_ui.py
+    python benchmarks/bench_ui.py --sizes 3 18 --output ui.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+import numpy as np
+from nicegui import ui
+from nicegui.outbox import Outbox
+from nicegui.testing.user_simulation import user_simulation
+
+from common import integer_system, random_system, write_results
+from cramer_engine import solve
+import gui as page
+
+DEFAULT_SIZES = [2, 3, 6, 12, 18]
+LARGE_SIZES = [100, 1000]  # show_solution_with_data in large-N mode
+
+
+class WireCounter:
+    """Count the messages and JSON bytes the outbox sends to the browser"""
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+        self.original_emit = None
+
+    def install(self):
+        self.original_emit = Outbox._emit
+        counter = self
+
+        async def emit(outbox, message):
+            _, message_type, data = message
+            counter.messages += 1
+            counter.bytes += len(json.dumps([message_type, data], default=str))
+            await counter.original_emit(outbox, message)
+
+        Outbox._emit = emit
+
+    def uninstall(self):
+        Outbox._emit = self.original_emit
+
+
+async def flush(client):
+    """Wait until the outbox has sent everything queued for the client"""
+    await asyncio.sleep(0)
+    while client.outbox.updates or client.outbox.messages:
+        await asyncio.sleep(0.001)
+    await asyncio.sleep(0.001)
+
+
+async def measure(name, client, wire, operation, repeat, **info):
+    """Run operation() repeat times; median time, elements created and wire traffic per run"""
+    await flush(client)
+    timings, created, messages, sent = [], [], [], []
+    for _ in range(repeat):
+        first_id = client.next_element_id
+        wire.messages = wire.bytes = 0
+        start = time.perf_counter()
+        with client:
+            operation()
+        timings.append(time.perf_counter() - start)
+        created.append(client.next_element_id - first_id)
+        await flush(client)
+        messages.append(wire.messages)
+        sent.append(wire.bytes)
+    return {
+        "name": name,
+        **info,
+        "best_s": min(timings),
+        "median_s": statistics.median(timings),
+        "repeat": repeat,
+        "elements_created": created[-1],
+        "ws_messages": messages[-1],
+        "ws_bytes": sent[-1],
+    }
+
+
+async def run(sizes, repeat, seed):
+    pages = []
+
+    def root():
+        solver = page.CramersRuleSolver(ui.context.client.id)
+        solver.build_page()
+        pages.append(solver)
+
+    rng = np.random.default_rng(seed)
+    results = []
+    wire = WireCounter()
+    wire.install()
+    # The simulated user is built for pytest; outside it, resetting NiceGUI's
+    # globals would look up a client and switch the app into script mode
+    fake_pytest = "PYTEST_CURRENT_TEST" not in os.environ
+    if fake_pytest:
+        os.environ["PYTEST_CURRENT_TEST"] = "benchmarks/bench_ui.py"
+    try:
+        async with user_simulation(root) as user:
+            await user.open("/")
+            solver = pages[-1]
+            client = user.client
+
+            for n in sizes:
+                A, B = integer_system(n, rng)
+                data = solve(A, B, exact=page.EXACT_INTEGER_MODE)
+                solver.n = n
+                solver.model.resize(n)
+
+                def render_grid():
+                    solver.grid_container.clear()
+                    with solver.grid_container:
+                        solver.render_grid()
+
+                results.append(await measure(f"render_grid/n={n}", client, wire, render_grid, repeat, n=n))
+                results.append(await measure(f"rebuild_ui/n={n}", client, wire, solver.rebuild_ui, repeat, n=n))
+                results.append(await measure(f"fill_random/n={n}", client, wire, solver.fill_random, repeat, n=n))
+                results.append(await measure(f"clear_inputs/n={n}", client, wire, solver.clear_inputs, repeat, n=n))
+                results.append(await measure(
+                    f"show_solution_with_data/n={n}", client, wire,
+                    lambda: solver.show_solution_with_data(data), repeat, n=n,
+                ))
+
+            for n in LARGE_SIZES:
+                data = solve(*random_system(n, rng), exact=False)
+                results.append(await measure(
+                    f"show_solution_with_data/large/n={n}", client, wire,
+                    lambda: solver.show_solution_with_data(data), repeat, n=n,
+                ))
+    finally:
+        wire.uninstall()
+        if fake_pytest:
+            del os.environ["PYTEST_CURRENT_TEST"]
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the NiceGUI render paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", default="benchmarks/results/ui.json", help="JSON file for the results"
+    )
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.sizes, args.repeat, args.seed))
+    write_results(args.output, "ui", results)
+
+
+if __name__ == "__main__":
+    main()
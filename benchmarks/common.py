@@ -0,0 +1,101 @@
+"""Shared helpers for the benchmark scripts: timing, inputs and JSON output"""
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from generators import generate_system
+
+
+def time_call(func, repeat=5, min_time=0.05):
+    """Seconds per call of func(): best and median of repeat samples of at least min_time"""
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+    samples = [t / number for t in timer.repeat(repeat, number)]
+    return {
+        "best_s": min(samples),
+        "median_s": statistics.median(samples),
+        "loops": number,
+        "repeat": repeat,
+    }
+
+
+def peak_memory(func):
+    """Peak bytes allocated while func() runs (NumPy reports its buffers to tracemalloc)"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def random_system(n, rng):
+    """Well-conditioned float system"""
+    return rng.standard_normal((n, n)), rng.standard_normal(n)
+
+
+def ill_conditioned_system(n, rng, cond=1e10):
+    """Float system with singular values spread from 1 down to 1/cond"""
+    U, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    V, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    A = (U * np.logspace(0, -np.log10(cond), n)) @ V.T
+    return A, rng.standard_normal(n)
+
+
+def integer_system(n, rng):
+    """Whole-number system like the page's Random button (exact mode)"""
+    return generate_system("uniform", n, seed=rng)
+
+
+def metadata():
+    """Environment details stored with every result file"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+    }
+
+
+def write_results(path, suite, results):
+    """Save results as {"suite", "meta", "results"} JSON and print one line per result"""
+    for result in results:
+        timing = result.get("median_s")
+        extra = ", ".join(
+            f"{key}={value:.3g}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in result.items()
+            if key not in ("name", "best_s", "median_s", "loops", "repeat")
+        )
+        print(f"{result['name']:<40} {timing * 1e3:10.4f} ms  {extra}")
+
+    data = {"suite": suite, "meta": metadata(), "results": results}
+    if path:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+        print(f"Saved {len(results)} results to {path}")
+    return data
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""Compare two benchmark result files and flag regressions.
+
+    python benchmarks/compare.py old/engine.json benchmarks/results/engine.json
+    python benchmarks/compare.py old/ui.json new/ui.json --threshold 1.2 --fail
+"""
+import argparse
+import json
+import sys
+
+COUNTERS = ("elements_created", "ws_messages", "ws_bytes")
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data, {result["name"]: result for result in data["results"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25,
+        help="flag results whose median time or counters grew by more than this factor (default: 1.25)",
+    )
+    parser.add_argument(
+        "--fail", action="store_true", help="exit with status 1 when a regression is flagged"
+    )
+    args = parser.parse_args(argv)
+
+    old_data, old = load(args.baseline)
+    new_data, new = load(args.current)
+    print(f"baseline {old_data['meta'].get('commit')}  current {new_data['meta'].get('commit')}")
+
+    regressions = 0
+    for name, result in new.items():
+        before = old.get(name)
+        if before is None:
+            print(f"{name:<40} new")
+            continue
+        ratio = result["median_s"] / before["median_s"]
+        notes = [
+            f"{key} {before[key]} -> {result[key]}"
+            for key in COUNTERS
+            if key in result and result[key] != before.get(key)
+        ]
+        flag = ""
+        if ratio > args.threshold or any(
+            result.get(key, 0) > before.get(key, 0) * args.threshold for key in COUNTERS
+        ):
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<40} {before['median_s'] * 1e3:10.4f} -> {result['median_s'] * 1e3:10.4f} ms"
+              f"  x{ratio:5.2f}  {', '.join(notes)}{flag}")
+
+    print(f"{regressions} regression(s) in {len(new)} results")
+    return 1 if regressions and args.fail else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""Solve linear systems with Cramer's Rule from the command line.
+
+Each system is written as the rows of its augmented matrix [A | B], one row
+per line with n + 1 numbers separated by spaces or commas. With n + k numbers
+per row, B has k columns: they are all solved with one factorization of A and
+reported one right-hand side at a time. Several systems can go in one file,
+separated by blank lines. Lines starting with # are ignored.
+
+    python cli.py systems.txt
+    echo "2 1 5
+    1 3 10" | python cli.py
+"""
+import argparse
+import json
+import math
+import sys
+
+import numpy as np
+
+from cramer_engine import (
+    build_system,
+    format_condition,
+    format_solution,
+    format_steps,
+    rhs_column,
+    rhs_count,
+    solve,
+)
+
+# Largest n solved exactly; exact integers grow with n and Bareiss slows down quickly beyond it
+MAX_EXACT_N = 18
+
+
+def read_systems(stream):
+    """Yield the augmented rows of every system in a text stream"""
+    rows = []
+    for line in stream:
+        line = line.strip()
+        if line.startswith("#"):
+            continue
+        if not line:
+            if rows:
+                yield rows
+                rows = []
+            continue
+        rows.append(line.replace(",", " ").split())
+    if rows:
+        yield rows
+
+
+def parse_system(rows):
+    """Split augmented rows into float arrays A and B (B is (n, k) for k > 1 columns)"""
+    n = len(rows)
+    width = len(rows[0])
+    if width <= n or any(len(row) != width for row in rows):
+        raise ValueError(
+            f"Expected {n} rows of n + k numbers, the same k on every row (augmented [A | B])"
+        )
+    if width == n + 1:
+        return build_system([row[:n] for row in rows], [row[n] for row in rows])
+    return build_system([row[:n] for row in rows], [row[n:] for row in rows])
+
+
+def solution_record(data):
+    """JSON-friendly summary of a solution dict; inf and NaN (not valid JSON) become null"""
+    det_A_text, det_Ai_texts, solution_texts = format_solution(data)
+    return {
+        "n": len(data["solutions"]),
+        "det_A": det_A_text,
+        "det_Ai": det_Ai_texts,
+        "solutions": [float(x) if math.isfinite(x) else None for x in data["solutions"]],
+        "solutions_text": solution_texts,
+        "cond": data["cond"] if math.isfinite(data["cond"]) else None,
+        "exact": "exact" in data,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve AX = B with Cramer's Rule")
+    parser.add_argument(
+        "files", nargs="*", default=["-"], help="input files (default: stdin)"
+    )
+    parser.add_argument(
+        "--float",
+        dest="exact",
+        action="store_false",
+        help="always use floating point, even for whole-number systems",
+    )
+    parser.add_argument(
+        "--max-exact-n",
+        type=int,
+        default=MAX_EXACT_N,
+        help=f"solve larger systems in floating point (default: {MAX_EXACT_N})",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print one JSON object per system"
+    )
+    parser.add_argument(
+        "--steps", action="store_true", help="print the detailed solution steps"
+    )
+    args = parser.parse_args(argv)
+
+    failures = 0
+    index = 0
+    for path in args.files:
+        try:
+            stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        except OSError as e:
+            failures += 1
+            print(f"Could not read {path}: {e.strerror}", file=sys.stderr)
+            continue
+        with stream:
+            for rows in read_systems(stream):
+                index += 1
+                try:
+                    A, B = parse_system(rows)
+                    data = solve(A, B, exact=args.exact and len(A) <= args.max_exact_n)
+                except (ValueError, np.linalg.LinAlgError) as e:
+                    failures += 1
+                    if args.json:
+                        print(json.dumps({"system": index, "error": str(e)}))
+                    else:
+                        print(f"System {index}: {e}", file=sys.stderr)
+                    continue
+
+                k = rhs_count(data)
+                for c in range(k):
+                    column = rhs_column(data, c)
+                    record = solution_record(column)
+                    if args.json:
+                        rhs = {"rhs": c + 1} if k > 1 else {}
+                        print(json.dumps({"system": index, **rhs, **record}))
+                        continue
+
+                    rhs = f", B column {c + 1} of {k}" if k > 1 else ""
+                    print(f"System {index} (n = {record['n']}{rhs})")
+                    if args.steps:
+                        print(format_steps(column))
+                        continue
+                    print(f"  det(A) = {record['det_A']}")
+                    print(f"  cond(A) ≈ {format_condition(column['cond'])}")
+                    for i, text in enumerate(record["solutions_text"]):
+                        print(f"  x{i + 1} = {text}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,920 @@
+"""Headless Cramer's Rule engine.
+
+Everything here is plain NumPy / Python, so it can be imported from scripts,
+tests, workers and the command line without pulling in NiceGUI.
+"""
+import hashlib
+import io
+import math
+import time
+from collections import OrderedDict
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+# A system whose estimated condition number reaches this has no correct digits
+# left in double precision and is treated as "no unique solution"
+SINGULAR_COND = 1 / np.finfo(float).eps
+# Extra right-hand sides solved alongside B to estimate ||A^-1||
+CONDITION_PROBES = 4
+# Mixed precision: most float64 correction steps per system, and the condition
+# number beyond which float32 factors cannot drive refinement to convergence
+REFINEMENT_STEPS = 10
+MIXED_MAX_COND = 1 / np.finfo(np.float32).eps
+
+
+@lru_cache(maxsize=64)
+def condition_probes(n):
+    """Fixed Gaussian vectors (n, CONDITION_PROBES), so estimates are reproducible"""
+    probes = np.random.default_rng(n).standard_normal((n, CONDITION_PROBES))
+    probes.setflags(write=False)
+    return probes
+
+
+def condition_estimate(A, probe_solutions):
+    """Estimate the condition number ||A||_F * ||A^-1||_F (also for stacks of A).
+
+    For Gaussian z the mean of ||A^-1 z||^2 is ||A^-1||_F^2, so the solutions
+    of the probe vectors give ||A^-1||_F, in practice within a factor of
+    about 3 at any N. This bounds the usual 2-norm condition number from
+    above and matches it when A is close to singular. The probes are solved
+    with the same factorization as B, so the estimate costs O(n^2) instead
+    of another O(n^3) pass.
+    """
+    inv_norm = np.sqrt((probe_solutions ** 2).sum(axis=(-2, -1)) / probe_solutions.shape[-1])
+    return np.linalg.norm(A, axis=(-2, -1)) * inv_norm
+
+
+def cramer_solve(A, B):
+    """Apply Cramer's Rule without building the column-replaced matrices.
+
+    Since x = A^-1 B, every det(A_i) equals det(A) * x_i, so one LU-based
+    solve gives all of them instead of n separate determinants. The same
+    solve handles the condition probes; a system is rejected as singular by
+    its condition number, which unlike det(A) does not depend on the scale
+    of the entries. det(A) is also returned as sign and log|det(A)|, since
+    the float value over- or underflows for large N. The time of each phase
+    is returned in "timings" (seconds).
+
+    B may also be an (n, k) matrix of k right-hand sides: they are all solved
+    with the one factorization, and det_Ai_list, solutions and verification
+    become (n, k) matrices with one column per right-hand side.
+    """
+    start = time.perf_counter()
+    det_sign, log_abs_det = np.linalg.slogdet(A)
+    if det_sign == 0:
+        raise np.linalg.LinAlgError("System has no unique solution (det(A) = 0)")
+
+    det_done = time.perf_counter()
+    probes = condition_probes(len(B))
+    k = rhs_count({"B": B})
+    try:
+        X = np.linalg.solve(A, np.column_stack([B, probes]))
+    except np.linalg.LinAlgError:
+        raise np.linalg.LinAlgError("System has no unique solution (det(A) = 0)") from None
+    solutions = X[:, :k].reshape(B.shape)
+    cond = float(condition_estimate(A, X[:, k:]))
+    if not cond < SINGULAR_COND:
+        raise np.linalg.LinAlgError(
+            f"System has no unique solution (A is singular to working precision, cond(A) ≈ {cond:.1e})"
+        )
+    with np.errstate(over="ignore", under="ignore"):
+        det_A = float(det_sign * np.exp(log_abs_det))
+        det_Ai_list = det_A * solutions
+
+    # Verification
+    cramer_done = time.perf_counter()
+    verification = A @ solutions
+    verification_done = time.perf_counter()
+
+    return {
+        "A": A,
+        "B": B,
+        "det_A": det_A,
+        "det_Ai_list": det_Ai_list,
+        "solutions": solutions,
+        "verification": verification,
+        "det_sign": float(det_sign),
+        "log_abs_det": float(log_abs_det),
+        "cond": cond,
+        "timings": {
+            "det": det_done - start,
+            "cramer": cramer_done - det_done,
+            "verification": verification_done - cramer_done,
+        },
+    }
+
+
+def float64_solutions(A, B):
+    """det(A) sign and log, condition estimates and solutions for a (k, n, n) stack.
+
+    Exactly singular systems get cond = inf and NaN solutions; the rest share
+    one stacked solve of B and the condition probes.
+    """
+    # Stacked log-determinants; only an exactly singular LU stops a system here
+    det_sign, log_abs_det = np.linalg.slogdet(A)
+    regular = det_sign != 0
+
+    probes = condition_probes(A.shape[1])
+    solutions = np.full(B.shape, np.nan)
+    cond = np.full(len(A), np.inf)
+    if regular.any():
+        rhs = np.concatenate(
+            [B[regular][..., None], np.broadcast_to(probes, (int(regular.sum()), *probes.shape))],
+            axis=2,
+        )
+        X = np.linalg.solve(A[regular], rhs)
+        solutions[regular] = X[..., 0]
+        cond[regular] = condition_estimate(A[regular], X[..., 1:])
+    return det_sign, log_abs_det, cond, solutions
+
+
+def mixed_solutions(A, B):
+    """float64_solutions with float32 factorizations and float64 iterative refinement.
+
+    Each system is inverted once in float32; every refinement step then costs
+    one float64 residual r = B - A x and one float32 correction x += A^-1 r,
+    both O(n^2), until the residual meets the float64 backward-error bound
+    ||r|| <= sqrt(n) * eps * ||A|| * ||x|| (infinity norms, as LAPACK's
+    dsgesv). NumPy exposes no reusable LU, so the inverse stands in for it.
+    Systems that are singular in float32, too ill-conditioned for float32
+    (cond >= MIXED_MAX_COND), or whose residual stops shrinking within
+    REFINEMENT_STEPS are solved again with float64_solutions. det(A) and the
+    condition number of refined systems carry float32 accuracy.
+
+    Returns (det_sign, log_abs_det, cond, solutions, refinement_steps, fallback).
+    """
+    k, n = B.shape
+    # Entries outside the float32 range turn into inf or 0 here and end up in the fallback
+    with np.errstate(over="ignore", invalid="ignore"):
+        A32 = A.astype(np.float32, copy=False)
+        det_sign, log_abs_det = np.linalg.slogdet(A32)
+    det_sign = det_sign.astype(float)
+    log_abs_det = log_abs_det.astype(float)
+    usable = (det_sign != 0) & np.isfinite(log_abs_det)
+
+    solutions = np.full(B.shape, np.nan)
+    cond = np.full(k, np.inf)
+    steps = np.zeros(k, dtype=int)
+    converged = np.zeros(k, dtype=bool)
+    if usable.any():
+        subset = slice(None) if usable.all() else usable
+        A_sub, B_sub = A[subset], B[subset]
+        with np.errstate(over="ignore", invalid="ignore"):
+            inverse = np.linalg.inv(A32[subset])
+            cond_sub = np.linalg.norm(A_sub, axis=(1, 2)) * np.linalg.norm(inverse, axis=(1, 2))
+        tolerance = math.sqrt(n) * np.finfo(float).eps * np.abs(A_sub).sum(axis=2).max(axis=1)
+
+        # einsum casts float32 operands in small buffers, so float64 copies of A are never made
+        x = np.einsum("kij,kj->ki", inverse, B_sub.astype(np.float32)).astype(float)
+        active = cond_sub < MIXED_MAX_COND
+        done = np.zeros(len(x), dtype=bool)
+        taken = np.zeros(len(x), dtype=int)
+        previous = np.full(len(x), np.inf)
+        for step in range(REFINEMENT_STEPS + 1):
+            residual = B_sub - np.einsum("kij,kj->ki", A_sub, x)
+            residual_norm = np.abs(residual).max(axis=1)
+            finished = active & (residual_norm <= tolerance * np.abs(x).max(axis=1))
+            done |= finished
+            taken[finished] = step
+            # A residual that no longer shrinks means the float32 inverse is too inaccurate
+            active &= ~finished & (residual_norm < previous)
+            if step == REFINEMENT_STEPS or not active.any():
+                break
+            previous = residual_norm
+            correction = np.einsum("kij,kj->ki", inverse, residual.astype(np.float32))
+            x += np.where(active[:, None], correction, 0.0)
+
+        solutions[subset] = x
+        cond[subset] = cond_sub
+        steps[subset] = taken
+        converged[subset] = done
+
+    fallback = ~converged
+    if fallback.any():
+        det_sign[fallback], log_abs_det[fallback], cond[fallback], solutions[fallback] = (
+            float64_solutions(A[fallback].astype(float), B[fallback])
+        )
+        steps[fallback] = 0
+    return det_sign, log_abs_det, cond, solutions, steps, fallback
+
+
+def solve_batch(A, B, max_cond=None, precision="double"):
+    """Apply Cramer's Rule to a stack of systems A[k] x = B[k] in one vectorized pass.
+
+    A has shape (k, n, n) and B has shape (k, n). Singular systems do not stop
+    the batch: they are flagged in the "singular" mask and their solutions,
+    det(A_i) values and residuals are NaN. With max_cond, systems whose
+    condition estimate exceeds it are rejected the same way and flagged in
+    "ill_conditioned"; the estimate comes out of the batch solve itself.
+
+    precision="mixed" factors in float32 and refines the solutions to float64
+    accuracy (see mixed_solutions); a float32 A is then used as is, halving
+    the memory the batch needs. "refinement_steps" counts the correction
+    steps per system and "fallback" flags systems that were solved in float64
+    because refinement could not converge.
+    """
+    A = np.asarray(A)
+    B = np.asarray(B, dtype=float)
+    if A.ndim != 3 or A.shape[1] != A.shape[2] or B.shape != A.shape[:2]:
+        raise ValueError(
+            f"Expected A of shape (k, n, n) and B of shape (k, n), got {A.shape} and {B.shape}"
+        )
+    if precision == "mixed":
+        if A.dtype != np.float32:
+            A = A.astype(float, copy=False)
+        det_sign, log_abs_det, cond, solutions, steps, fallback = mixed_solutions(A, B)
+    elif precision == "double":
+        A = A.astype(float, copy=False)
+        det_sign, log_abs_det, cond, solutions = float64_solutions(A, B)
+        steps = np.zeros(len(A), dtype=int)
+        fallback = np.zeros(len(A), dtype=bool)
+    else:
+        raise ValueError(f'precision must be "double" or "mixed", got {precision!r}')
+
+    # Same singularity test as cramer_solve, plus the caller's conditioning limit
+    singular = ~(cond < SINGULAR_COND)
+    ill_conditioned = ~singular & (cond > max_cond) if max_cond is not None else np.zeros_like(singular)
+    rejected = singular | ill_conditioned
+    solutions[rejected] = np.nan
+
+    with np.errstate(over="ignore", under="ignore"):
+        det_A = det_sign * np.exp(log_abs_det)
+        det_Ai = det_A[:, None] * solutions
+
+    residuals = np.einsum("kij,kj->ki", A, solutions) - B
+
+    return {
+        "det_A": det_A,
+        "det_Ai": det_Ai,
+        "det_sign": det_sign,
+        "log_abs_det": log_abs_det,
+        "cond": cond,
+        "solutions": solutions,
+        "residuals": residuals,
+        "singular": singular,
+        "ill_conditioned": ill_conditioned,
+        "refinement_steps": steps,
+        "fallback": fallback,
+    }
+
+
+def bareiss_solve(A, B):
+    """Exact Cramer's Rule with fraction-free Gauss-Jordan (Bareiss) elimination.
+
+    A and B hold Python ints (or Fractions). Every division in the elimination
+    is exact, so intermediate values stay the size of a minor instead of
+    growing like naive Fraction elimination. Returns (det_A, det_Ai_list,
+    solutions) where the solutions are Fractions, or raises LinAlgError if
+    det(A) == 0. When the rows of B are lists (k right-hand sides), they are
+    eliminated together and det_Ai_list and solutions hold one list of k
+    values per row.
+    """
+    n = len(A)
+    columns = B if n and isinstance(B[0], list) else [[b] for b in B]
+    width = len(columns[0]) if n else 1
+    M = [list(A[i]) + list(columns[i]) for i in range(n)]
+    exact_div = all(isinstance(v, int) for row in M for v in row)
+    prev = 1
+    sign = 1
+
+    for k in range(n):
+        # Any non-zero pivot works, there is no rounding to worry about
+        p = next((r for r in range(k, n) if M[r][k] != 0), None)
+        if p is None:
+            raise np.linalg.LinAlgError("System has no unique solution (det(A) = 0)")
+        if p != k:
+            M[k], M[p] = M[p], M[k]
+            sign = -sign
+
+        pivot = M[k][k]
+        row_k = M[k]
+        for i in range(n):
+            if i == k:
+                continue
+            row_i = M[i]
+            factor = row_i[k]
+            for j in range(k + 1, n + width):
+                value = pivot * row_i[j] - factor * row_k[j]
+                row_i[j] = value // prev if exact_div else value / prev
+            row_i[k] = 0
+            if i < k:
+                # Earlier pivots are all scaled up to the current one
+                row_i[i] = pivot
+        prev = pivot
+
+    # Every diagonal entry now equals det(PA); the B columns hold det(PA_i)
+    det_A = sign * prev
+    det_Ai_rows = [[sign * value for value in M[i][n:]] for i in range(n)]
+    solution_rows = [[Fraction(det_Ai, det_A) for det_Ai in row] for row in det_Ai_rows]
+    if columns is not B:
+        return det_A, [row[0] for row in det_Ai_rows], [row[0] for row in solution_rows]
+    return det_A, det_Ai_rows, solution_rows
+
+
+def exact_cramer_solve(A, B):
+    """Apply Cramer's Rule exactly to whole-number inputs (float arrays).
+
+    The answer is exact however badly A is conditioned, but the condition
+    estimate is still reported: it says how much rounding in the inputs
+    themselves would move the solution.
+    """
+    start = time.perf_counter()
+    det_A, det_Ai_list, solutions = bareiss_solve(
+        A.astype(np.int64).tolist(), B.astype(np.int64).tolist()
+    )
+    float_solutions = float_array(solutions)
+    elimination_done = time.perf_counter()
+    # Solutions beyond the float range are inf; their verification is not meaningful
+    with np.errstate(over="ignore", invalid="ignore"):
+        verification = A @ float_solutions
+    verification_done = time.perf_counter()
+    probes = condition_probes(len(B))
+    try:
+        cond = float(condition_estimate(A, np.linalg.solve(A, probes)))
+    except np.linalg.LinAlgError:
+        # Singular to float LU (e.g. entries near 2**52) while det(A) != 0 exactly
+        cond = math.inf
+
+    return {
+        "A": A,
+        "B": B,
+        "det_A": to_float(det_A),
+        "det_Ai_list": float_array(det_Ai_list),
+        "solutions": float_solutions,
+        "verification": verification,
+        "exact": {
+            "det_A": det_A,
+            "det_Ai_list": det_Ai_list,
+            "solutions": solutions,
+        },
+        "det_sign": float(np.sign(det_A)),
+        "log_abs_det": math.log(abs(det_A)),
+        "cond": cond,
+        "timings": {
+            "elimination": elimination_done - start,
+            "verification": verification_done - elimination_done,
+            "condition": time.perf_counter() - verification_done,
+        },
+    }
+
+
+def to_float(value):
+    """float(value), or ±inf for an exact integer or fraction beyond the float range"""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+def float_array(values):
+    """Float array of exact integers or fractions (nested lists for several B columns)"""
+    return np.frompyfunc(to_float, 1, 1)(np.array(values, dtype=object)).astype(float)
+
+
+def is_whole_number_system(A, B):
+    """True if every entry of A and B is a whole number that fits in an int64"""
+    values = np.concatenate([A.ravel(), B.ravel()])
+    return bool(np.all(np.abs(values) < 2**53) and np.all(values == np.round(values)))
+
+
+class MissingValueError(ValueError):
+    """Raised when a coefficient or constant has not been filled in"""
+
+
+def build_system(matrix_values, vector_values):
+    """Turn raw input values (None or "" for empty cells) into float arrays A and B.
+
+    vector_values holds one constant per equation, or a list of k constants
+    per equation for k right-hand sides; B then has shape (n, k).
+    """
+    n = len(vector_values)
+
+    # Get matrix A
+    A = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            val = matrix_values[i][j]
+            if val is None or val == "":
+                raise MissingValueError("Please fill all coefficient values")
+            A[i][j] = float(val)
+
+    # Get vector B (or the matrix of k right-hand sides)
+    multi = n > 0 and isinstance(vector_values[0], (list, tuple))
+    rows = vector_values if multi else [[val] for val in vector_values]
+    B = np.zeros((n, len(rows[0]) if n else 1))
+    for i in range(n):
+        for c, val in enumerate(rows[i]):
+            if val is None or val == "":
+                raise MissingValueError("Please fill all constant values")
+            B[i][c] = float(val)
+
+    return A, B if multi else B[:, 0]
+
+
+class SystemModel:
+    """The augmented matrix [A | B] held in NumPy arrays, with a mask of filled cells.
+
+    Columns n to n + k - 1 of values / filled are the k constant vectors of B.
+    """
+
+    def __init__(self, n, k=1):
+        self.values = np.zeros((n, n + k))
+        self.filled = np.zeros((n, n + k), dtype=bool)
+
+    @property
+    def n(self):
+        return len(self.values)
+
+    @property
+    def k(self):
+        return self.values.shape[1] - len(self.values)
+
+    def resize(self, n, k=None):
+        """Change the size, keeping the overlapping coefficients and constants"""
+        old_n, old_k = self.n, self.k
+        k = old_k if k is None else k
+        m = min(n, old_n)
+        c = min(k, old_k)
+        values = np.zeros((n, n + k))
+        filled = np.zeros((n, n + k), dtype=bool)
+        values[:m, :m] = self.values[:m, :m]
+        filled[:m, :m] = self.filled[:m, :m]
+        values[:m, n:n + c] = self.values[:m, old_n:old_n + c]
+        filled[:m, n:n + c] = self.filled[:m, old_n:old_n + c]
+        self.values = values
+        self.filled = filled
+
+    def get(self, i, j):
+        return float(self.values[i, j]) if self.filled[i, j] else None
+
+    def set(self, i, j, value):
+        if value is None or value == "":
+            self.values[i, j] = 0.0
+            self.filled[i, j] = False
+        else:
+            self.values[i, j] = float(value)
+            self.filled[i, j] = True
+
+    def clear(self):
+        self.values[:] = 0.0
+        self.filled[:] = False
+
+    def rows(self):
+        """The values as nested lists with None for empty cells, ready for input widgets"""
+        return [
+            [value if filled else None for value, filled in zip(value_row, filled_row)]
+            for value_row, filled_row in zip(self.values.tolist(), self.filled.tolist())
+        ]
+
+    def load(self, A, B):
+        """Replace the contents with a complete system (B of shape (n,) or (n, k))"""
+        B = np.asarray(B).reshape(len(B), -1)
+        n, k = B.shape
+        self.values = np.empty((n, n + k))
+        self.values[:, :n] = A
+        self.values[:, n:] = B
+        self.filled = np.ones((n, n + k), dtype=bool)
+
+    def system(self):
+        """The arrays A and B, or MissingValueError if any cell is empty.
+
+        B has shape (n,) for one right-hand side and (n, k) for several.
+        """
+        n = self.n
+        if not self.filled[:, :n].all():
+            raise MissingValueError("Please fill all coefficient values")
+        if not self.filled[:, n:].all():
+            raise MissingValueError("Please fill all constant values")
+        B = self.values[:, n:].copy()
+        return self.values[:, :n].copy(), B[:, 0] if self.k == 1 else B
+
+
+def split_augmented(M):
+    """Split an augmented matrix [A | B] of shape (n, n + k) into float arrays A and B.
+
+    B is a vector for k = 1 and an (n, k) matrix of right-hand sides otherwise.
+    """
+    M = np.asarray(M, dtype=float)
+    if M.ndim != 2 or M.shape[0] == 0 or M.shape[1] <= M.shape[0]:
+        raise ValueError(
+            f"Expected an augmented matrix [A | B] of shape (n, n + k), got {M.shape}"
+        )
+    if not np.isfinite(M).all():
+        raise ValueError("All values must be finite numbers")
+    n = M.shape[0]
+    B = M[:, n:] if M.shape[1] > n + 1 else M[:, n]
+    return np.ascontiguousarray(M[:, :n]), np.ascontiguousarray(B)
+
+
+def parse_system_text(text):
+    """Parse pasted text or CSV: one row of [A | B] per line, separated by spaces, tabs, commas or semicolons"""
+    if not text.strip():
+        raise ValueError("There are no numbers to import")
+    table = text.replace(",", " ").replace(";", " ")
+    try:
+        M = np.loadtxt(io.StringIO(table), ndmin=2, comments="#")
+    except ValueError as e:
+        raise ValueError(f"Could not read the numbers: {e}") from None
+    return split_augmented(M)
+
+
+def check_system_size(n, k, max_n=None, max_k=None):
+    """Raise ValueError if a system of n equations with k right-hand sides is over the limits (None: no limit)"""
+    if max_n is not None and n > max_n:
+        raise ValueError(f"Systems may have at most {max_n} variables, got {n}")
+    if max_k is not None and k > max_k:
+        raise ValueError(f"At most {max_k} right-hand-side columns are supported, got {k}")
+
+
+def npz_member_shape(archive, name):
+    """Shape of an array in an open .npz archive, read from its header without loading the data"""
+    with archive.zip.open(f"{name}.npy") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, _, _ = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, _ = np.lib.format.read_array_header_2_0(f)
+    return shape
+
+
+def load_system_file(path, max_n=None, max_k=None):
+    """Load a system from .csv / .txt, .npy or .npz.
+
+    .npy files hold the augmented matrix and are memory-mapped. .npz files
+    hold arrays "A" and "B" (B of shape (n,) or (n, k)), or a single
+    augmented matrix. For both, systems over max_n equations or max_k
+    right-hand sides are rejected from the array headers, before any
+    value is read.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".npy":
+        M = np.load(path, mmap_mode="r")
+        if M.ndim == 2:
+            check_system_size(M.shape[0], M.shape[1] - M.shape[0], max_n, max_k)
+        return split_augmented(M)
+
+    if suffix == ".npz":
+        with np.load(path) as archive:
+            if "A" in archive.files and "B" in archive.files:
+                A_shape = npz_member_shape(archive, "A")
+                B_shape = npz_member_shape(archive, "B")
+                if len(A_shape) != 2 or len(B_shape) not in (1, 2) or A_shape != (B_shape[0], B_shape[0]):
+                    raise ValueError(
+                        f"Expected A of shape (n, n) and B of shape (n,) or (n, k), "
+                        f"got {A_shape} and {B_shape}"
+                    )
+                check_system_size(B_shape[0], B_shape[1] if len(B_shape) == 2 else 1, max_n, max_k)
+                A = np.asarray(archive["A"], dtype=float)
+                B = np.asarray(archive["B"], dtype=float)
+                return split_augmented(np.column_stack([A, B]))
+            if len(archive.files) == 1:
+                shape = npz_member_shape(archive, archive.files[0])
+                if len(shape) == 2:
+                    check_system_size(shape[0], shape[1] - shape[0], max_n, max_k)
+                return split_augmented(archive[archive.files[0]])
+            raise ValueError("Expected arrays named A and B, or a single augmented matrix")
+
+    delimiter = "," if suffix == ".csv" else None
+    try:
+        M = np.loadtxt(path, delimiter=delimiter, ndmin=2, comments="#")
+    except ValueError as e:
+        raise ValueError(f"Could not read the numbers: {e}") from None
+    return split_augmented(M)
+
+
+def solve(A, B, exact=True, incremental=None):
+    """Solve AX = B with Cramer's Rule, exactly when allowed and the inputs are whole numbers.
+
+    Float solves go through the given IncrementalSolver when there is one, so
+    small edits to the previous system are handled as rank-1 updates.
+    """
+    if exact and is_whole_number_system(A, B):
+        return exact_cramer_solve(A, B)
+    if incremental is not None:
+        return incremental.solve(A, B)
+    return cramer_solve(A, B)
+
+
+class IncrementalSolver:
+    """Re-solve after a single-cell edit with rank-1 updates instead of a full solve.
+
+    The inverse of the last solved A is kept. Changing one a_ij is a rank-1
+    update: det(A) follows from the matrix determinant lemma and the inverse
+    from Sherman-Morrison, both in O(n^2). Changes to B only need A^-1 B.
+    Anything else, an update that would divide by a near-zero term, a residual
+    that drifts too far or too many updates in a row falls back to a full
+    solve with cramer_solve. Below min_n a full LAPACK solve is cheaper than
+    the bookkeeping, so small systems are always solved from scratch.
+    """
+
+    def __init__(self, max_updates=32, tol=1e-8, min_n=48):
+        self.max_updates = max_updates
+        self.min_n = min_n
+        self.tol = tol
+        self.A = None
+        self.det_sign = None
+        self.log_abs_det = None
+        self.A_inv = None
+        self.updates = 0
+        self.full_solves = 0
+        self.incremental_solves = 0
+
+    def can_update(self, A):
+        """True if A is the last solved A with at most one cell changed, so solve() skips the factorization"""
+        return (
+            self.A is not None
+            and A.shape == self.A.shape
+            and len(A) >= self.min_n
+            and self.updates < self.max_updates
+            and np.count_nonzero(A != self.A) <= 1
+        )
+
+    def solve(self, A, B):
+        if self.can_update(A):
+            data = self._update(A, B, np.argwhere(A != self.A))
+            if data is not None:
+                self.incremental_solves += 1
+                return data
+        return self._refactor(A, B)
+
+    def remember(self, A, data):
+        """Use a full solve of A made elsewhere (e.g. in a worker process) as the base for updates"""
+        self.A = None
+        if len(A) < self.min_n or "exact" in data:
+            return
+        # The inverse is only formed once an edit actually needs it
+        self.A = A.copy()
+        self.det_sign = data["det_sign"]
+        self.log_abs_det = data["log_abs_det"]
+        self.A_inv = None
+        self.updates = 0
+
+    def _refactor(self, A, B):
+        self.A = None
+        data = cramer_solve(A, B)
+        self.full_solves += 1
+        self.remember(A, data)
+        return data
+
+    def _update(self, A, B, changed):
+        start = time.perf_counter()
+        if self.A_inv is None:
+            self.A_inv = np.linalg.inv(self.A)
+        A_inv = self.A_inv
+        det_sign = self.det_sign
+        log_abs_det = self.log_abs_det
+
+        if len(changed):
+            i, j = changed[0]
+            delta = A[i, j] - self.A[i, j]
+            # A' = A + delta * e_i e_j^T
+            denom = 1.0 + delta * A_inv[j, i]
+            if abs(denom) < self.tol:
+                return None
+            det_sign = det_sign * np.sign(denom)
+            log_abs_det = log_abs_det + np.log(abs(denom))
+            A_inv = A_inv - np.outer(A_inv[:, i], A_inv[j, :]) * (delta / denom)
+
+        # With the inverse at hand the condition number is exact and O(n^2);
+        # near-singular results are left to a full solve to report
+        cond = float(np.linalg.norm(A) * np.linalg.norm(A_inv))
+        if not cond < SINGULAR_COND:
+            return None
+
+        solutions = A_inv @ B
+        with np.errstate(over="ignore", under="ignore"):
+            det_A = float(det_sign * np.exp(log_abs_det))
+        update_done = time.perf_counter()
+        verification = A @ solutions
+
+        # Reject the update if the residual has drifted away from a fresh solve
+        scale = (np.abs(A) @ np.abs(solutions)).sum() + np.abs(B).sum()
+        if np.abs(verification - B).sum() > self.tol * max(scale, 1.0):
+            return None
+
+        self.A = A.copy()
+        self.A_inv = A_inv
+        self.det_sign = det_sign
+        self.log_abs_det = log_abs_det
+        self.updates += 1
+
+        return {
+            "A": A,
+            "B": B,
+            "det_A": det_A,
+            "det_Ai_list": det_A * solutions,
+            "solutions": solutions,
+            "verification": verification,
+            "det_sign": float(det_sign),
+            "log_abs_det": float(log_abs_det),
+            "cond": cond,
+            "timings": {
+                "update": update_done - start,
+                "verification": time.perf_counter() - update_done,
+            },
+        }
+
+
+def rhs_count(data):
+    """Number of right-hand sides (columns of B) in a solution dict"""
+    B = data["B"]
+    return 1 if np.ndim(B) == 1 else B.shape[1]
+
+
+def rhs_column(data, c):
+    """Right-hand side c of a solve with several B columns, as a one-column solution dict.
+
+    All columns come out of the same solve, so this only slices the arrays.
+    """
+    k = rhs_count(data)
+    if k == 1:
+        return data
+    column = {key: data[key] for key in ("A", "det_A", "det_sign", "log_abs_det", "cond") if key in data}
+    for key in ("B", "det_Ai_list", "solutions", "verification"):
+        column[key] = data[key][:, c]
+    exact = data.get("exact")
+    if exact:
+        column["exact"] = {
+            "det_A": exact["det_A"],
+            "det_Ai_list": [row[c] for row in exact["det_Ai_list"]],
+            "solutions": [row[c] for row in exact["solutions"]],
+        }
+    column["rhs"] = (c, k)
+    return column
+
+
+def format_solution(data):
+    """Text for det(A), every det(A_i) and every x_i of a solution dict.
+
+    Exact results print as integers / fractions, float results as decimals.
+    """
+    exact = data.get("exact")
+    if exact:
+        det_A_text = str(exact["det_A"])
+        det_Ai_texts = [str(d) for d in exact["det_Ai_list"]]
+        solution_texts = [
+            str(x) if x.denominator == 1 else f"{x} ≈ {to_float(x):.6f}"
+            for x in exact["solutions"]
+        ]
+    else:
+        det_sign, log_abs_det = determinant_parts(data)
+        det_A_text = format_determinant(det_sign, log_abs_det)
+        with np.errstate(divide="ignore"):
+            det_Ai_texts = [
+                format_determinant(det_sign * np.sign(x), log_abs_det + np.log(abs(x)))
+                for x in data["solutions"]
+            ]
+        solution_texts = [f"{x:.6f}" for x in data["solutions"]]
+    return det_A_text, det_Ai_texts, solution_texts
+
+
+def determinant_parts(data):
+    """(sign, log|det(A)|) of a solution dict, also for dicts from before they were stored"""
+    if "log_abs_det" in data:
+        return data["det_sign"], data["log_abs_det"]
+    det_A = data["det_A"]
+    return float(np.sign(det_A)), math.log(abs(det_A)) if det_A else -math.inf
+
+
+def format_determinant(sign, log_abs):
+    """A determinant given as sign and log of its magnitude, as a decimal or, when
+    that would overflow or round to zero, as mantissa and power of ten"""
+    if sign == 0 or log_abs == -math.inf:
+        return "0.000000"
+    if math.log(1e-4) <= log_abs < math.log(1e12):
+        return f"{sign * math.exp(log_abs):.6f}"
+    exponent = log_abs / math.log(10)
+    power = math.floor(exponent)
+    return f"{'-' if sign < 0 else ''}{10 ** (exponent - power):.6f}e{power:+03d}"
+
+
+def format_condition(cond):
+    """Condition estimate with a hint at the digits it costs"""
+    if not math.isfinite(cond):
+        return "inf (singular in double precision)"
+    digits = max(0, math.log10(cond)) if cond > 0 else 0
+    return f"{cond:.2e} (about {digits:.0f} of ~16 significant digits may be lost)"
+
+
+def solution_nbytes(data):
+    """Bytes held by the NumPy arrays of a solution dict, including nested columns"""
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, dict):
+        return sum(solution_nbytes(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return sum(solution_nbytes(value) for value in data)
+    return 0
+
+
+class SolutionCache:
+    """Bounded LRU cache of solution dicts, keyed on the contents of A and B plus the solve mode.
+
+    max_size caps the number of entries and max_bytes (None: no limit) the
+    bytes of their arrays (see solution_nbytes); a solution larger than
+    max_bytes on its own is not cached.
+    """
+
+    def __init__(self, max_size, max_bytes=None):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}  # key -> bytes of the entry's arrays
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(A, B, mode):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{mode}:{A.shape}:{B.shape}:{A.dtype}".encode())
+        digest.update(np.ascontiguousarray(A).tobytes())
+        digest.update(np.ascontiguousarray(B).tobytes())
+        return digest.hexdigest()
+
+    def get(self, A, B, mode):
+        """Return the cached solution dict, or None on a miss"""
+        key = self.key(A, B, mode)
+        data = self.entries.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def put(self, A, B, mode, data):
+        size = solution_nbytes(data)
+        if self.max_size <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return
+        key = self.key(A, B, mode)
+        self.nbytes += size - self.sizes.get(key, 0)
+        self.entries[key] = data
+        self.sizes[key] = size
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size or (
+            self.max_bytes is not None and self.nbytes > self.max_bytes
+        ):
+            oldest, _ = self.entries.popitem(last=False)
+            self.nbytes -= self.sizes.pop(oldest)
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def format_steps(data):
+    """The detailed solution steps of a one-column solution dict (see rhs_column) as plain text"""
+    n = len(data["B"])
+    A = data["A"]
+    B = data["B"]
+    det_A_text, det_Ai_texts, solution_texts = format_solution(data)
+    rule = "=" * 60
+    lines = ["SYSTEM OF EQUATIONS:", rule]
+    if "rhs" in data:
+        c, k = data["rhs"]
+        lines.insert(0, f"RIGHT-HAND SIDE {c + 1} OF {k}")
+
+    for i in range(n):
+        eq_parts = [f"{A[i][j]:.2f}x{j + 1}" for j in range(n)]
+        lines.append(" + ".join(eq_parts) + f" = {B[i]:.2f}")
+
+    lines += ["", f"Determinant of [A] = {det_A_text}"]
+    if "cond" in data:
+        lines.append(f"Condition number ≈ {format_condition(data['cond'])}")
+    lines.append(rule)
+
+    # Calculating Solutions
+    lines += ["", "CALCULATING SOLUTIONS:", rule]
+    for i, sol in enumerate(solution_texts):
+        lines += [
+            "",
+            f"x{i + 1} = det(A{i + 1}) / det(A)",
+            f"x{i + 1} = {det_Ai_texts[i]} / {det_A_text}",
+            f"x{i + 1} = {sol}",
+        ]
+
+    # Final Solution
+    lines += ["", rule, "FINAL SOLUTION:", rule]
+    lines += [f"x{i + 1} = {sol}" for i, sol in enumerate(solution_texts)]
+
+    # Verification
+    lines += ["", rule, "VERIFICATION (AX = B):", rule]
+    for i in range(n):
+        match = "=" if abs(data["verification"][i] - B[i]) < 0.01 else "≈"
+        lines.append(f"{data['verification'][i]:.6f} {match} {B[i]:.6f}")
+
+    lines += ["", rule]
+    return "\n".join(lines)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""Random linear systems from chosen families, generated in bulk with NumPy.
+
+Every family builds a whole stack of systems with array operations, so a
+batch of thousands costs a handful of NumPy calls. The same seed gives the
+same systems. The page's Random button, the benchmarks and load tests use
+these functions, and from the command line they write batches to .npz files
+(arrays "A" and "B"; a single system can be imported into the page):
+
+    python generators.py spd 64 --count 1000 --seed 1 --output spd64.npz
+    python generators.py known_det 12 --det -6 --output system.npz
+"""
+import argparse
+
+import numpy as np
+
+VALUE_RANGE = 999  # Whole numbers in uniform A and in every B lie in [-VALUE_RANGE, VALUE_RANGE]
+
+
+def uniform(rng, count, n):
+    """Whole numbers drawn uniformly; singular only by rare accident"""
+    return rng.integers(-VALUE_RANGE, VALUE_RANGE + 1, size=(count, n, n)).astype(float)
+
+
+def diagonally_dominant(rng, count, n):
+    """Whole numbers where |a_ii| exceeds the rest of row i, so A is never singular"""
+    A = rng.integers(-99, 100, size=(count, n, n)).astype(float)
+    return with_dominant_diagonal(rng, A)
+
+
+def spd(rng, count, n):
+    """Whole-number symmetric positive definite matrices M M^T + n I"""
+    M = rng.integers(-9, 10, size=(count, n, n)).astype(float)
+    return M @ M.transpose(0, 2, 1) + n * np.eye(n)
+
+
+def known_det(rng, count, n, det=1):
+    """Whole numbers with det(A) == det exactly.
+
+    A = P L U P^T for a unit lower triangular L, an upper triangular U with
+    diagonal (det, 1, ..., 1) and a random permutation P, so det(A) = det.
+    The off-diagonal entries of L and U are sparse -1, 0 or 1, which keeps A
+    small and well conditioned. With det = ±1 a whole-number B has a
+    whole-number solution.
+    """
+    if det == 0 or det != int(det):
+        raise ValueError(f"det must be a nonzero whole number, got {det}")
+    density = min(1.0, 2 / n)
+    L = np.tril(sparse_signs(rng, count, n, density), -1) + np.eye(n)
+    U = np.triu(sparse_signs(rng, count, n, density), 1) + np.eye(n)
+    U[:, 0, 0] = det
+    A = L @ U
+    perm = np.argsort(rng.random((count, n)), axis=1)
+    A = np.take_along_axis(A, perm[:, :, None], axis=1)
+    return np.take_along_axis(A, perm[:, None, :], axis=2)
+
+
+def near_singular(rng, count, n, cond=1e12):
+    """Float matrices with singular values spread from 1 down to 1/cond"""
+    U, _ = np.linalg.qr(rng.standard_normal((count, n, n)))
+    V, _ = np.linalg.qr(rng.standard_normal((count, n, n)))
+    sigma = np.logspace(0, -np.log10(cond), n)
+    return (U * sigma) @ V.transpose(0, 2, 1)
+
+
+def banded(rng, count, n, bandwidth=1):
+    """Diagonally dominant whole numbers with a_ij = 0 for |i - j| > bandwidth"""
+    A = rng.integers(-99, 100, size=(count, n, n)).astype(float)
+    i, j = np.indices((n, n))
+    A[:, np.abs(i - j) > bandwidth] = 0
+    return with_dominant_diagonal(rng, A)
+
+
+def sparse_signs(rng, count, n, density):
+    """-1, 0 or 1 entries, nonzero with probability about density"""
+    signs = rng.integers(-1, 2, size=(count, n, n))
+    return (signs * (rng.random((count, n, n)) < density)).astype(float)
+
+
+def with_dominant_diagonal(rng, A):
+    """Replace the diagonals of a stack so every row is strictly diagonally dominant"""
+    count, n, _ = A.shape
+    diagonal = np.arange(n)
+    A[:, diagonal, diagonal] = 0
+    margin = rng.integers(1, 100, size=(count, n))
+    sign = rng.choice([-1.0, 1.0], size=(count, n))
+    A[:, diagonal, diagonal] = sign * (np.abs(A).sum(axis=2) + margin)
+    return A
+
+
+# Family name -> (label, function(rng, count, n, **options))
+FAMILIES = {
+    "uniform": ("Uniform integers", uniform),
+    "diagonally_dominant": ("Diagonally dominant", diagonally_dominant),
+    "spd": ("Symmetric positive definite", spd),
+    "known_det": ("Integer, known determinant", known_det),
+    "near_singular": ("Near-singular", near_singular),
+    "banded": ("Banded", banded),
+}
+
+
+def generate_systems(family, count, n, k=1, seed=None, **options):
+    """Stack of count random systems: A of shape (count, n, n), B of (count, n) or (count, n, k).
+
+    seed is anything np.random.default_rng accepts, including a Generator,
+    which is then used as is. Options go to the family: det for known_det,
+    cond for near_singular and bandwidth for banded.
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown family {family!r}, expected one of {', '.join(FAMILIES)}")
+    rng = np.random.default_rng(seed)
+    A = FAMILIES[family][1](rng, count, n, **options)
+    shape = (count, n) if k == 1 else (count, n, k)
+    B = rng.integers(-VALUE_RANGE, VALUE_RANGE + 1, size=shape).astype(float)
+    return A, B
+
+
+def generate_system(family, n, k=1, seed=None, **options):
+    """One random system (A, B) from a family, B of shape (n,) or (n, k)"""
+    A, B = generate_systems(family, 1, n, k, seed, **options)
+    return A[0], B[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write random linear systems to an .npz file")
+    parser.add_argument("family", choices=FAMILIES)
+    parser.add_argument("n", type=int, help="number of variables")
+    parser.add_argument("--count", type=int, default=1, help="number of systems (default: 1)")
+    parser.add_argument("--rhs", type=int, default=1, help="columns of B (default: 1)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--det", type=int, help="determinant of known_det systems (default: 1)")
+    parser.add_argument("--cond", type=float, help="condition number of near_singular systems")
+    parser.add_argument("--bandwidth", type=int, help="bandwidth of banded systems (default: 1)")
+    parser.add_argument("--output", "-o", default="systems.npz")
+    args = parser.parse_args(argv)
+
+    options = {
+        name: value
+        for name, value in (("det", args.det), ("cond", args.cond), ("bandwidth", args.bandwidth))
+        if value is not None
+    }
+    try:
+        A, B = generate_systems(args.family, args.count, args.n, args.rhs, args.seed, **options)
+    except (TypeError, ValueError) as e:
+        parser.error(str(e))
+    if args.count == 1:
+        # A single (A, B) pair, importable into the page
+        A, B = A[0], B[0]
+    np.savez(args.output, A=A, B=B)
+    print(f"Wrote {args.count} {args.family} system(s) with n = {args.n} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
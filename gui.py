@@ -0,0 +1,1618 @@
+"""The NiceGUI page, the HTTP API and the state they share; main.py starts it"""
+import asyncio
+import math
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from functools import partial
+
+import numpy as np
+from fastapi.responses import PlainTextResponse
+from nicegui import Client, app, ui
+
+from api import SolveAPI
+from cramer_engine import (
+    MissingValueError,
+    IncrementalSolver,
+    SolutionCache,
+    SystemModel,
+    determinant_parts,
+    format_condition,
+    format_determinant,
+    format_solution,
+    format_steps,
+    load_system_file,
+    parse_system_text,
+    rhs_column,
+    rhs_count,
+    solution_nbytes,
+    solve,
+)
+from generators import FAMILIES, generate_system
+from history import SolveHistory
+from metrics import Metrics, PhaseTimer
+from sweep import parse_sweep_text, plot_indices, sweep
+from workers import SolveWorkers
+
+# ============= CUSTOMIZATION =============
+CUSTOM_FONT = (
+    "'Open Sans', 'Inter', 'Segoe UI', 'Roboto', sans-serif"  # Change this to your preferred font
+)
+LOGO_IMAGE_PATH = "CCElogo.png"  # Set to your logo image path e.g., 'logo.png' or leave as None for text logo
+INPUT_BOX_WIDTH = 80  # Width of input boxes in pixels (default: 70)
+EXACT_INTEGER_MODE = True  # Use exact (fraction-free) arithmetic when every input is a whole number
+SESSION_IDLE_TIMEOUT = 30 * 60  # Seconds without interaction before a browser session is evicted
+MAX_RETAINED_SOLUTIONS = 200  # Sessions that keep their last solution for redisplay (oldest dropped first)
+MAX_RETAINED_BYTES = 256 * 2**20  # Array bytes of those retained solutions (an N = 1000 solution is about 8 MB)
+SOLUTION_CACHE_SIZE = 256  # Solved systems remembered for instant re-solves (0 disables the cache)
+SOLUTION_CACHE_BYTES = 256 * 2**20  # Array bytes the cache may hold (None: only SOLUTION_CACHE_SIZE applies)
+HISTORY_PATH = "solve_history.sqlite3"  # SQLite file keeping every solve across restarts (None disables the history)
+HISTORY_MAX_ENTRIES = 10000  # Solves kept in the history (oldest deleted first; None keeps all)
+HISTORY_PAGE_SIZE = 10  # Solves listed per page of the history panel
+HISTORY_SCOPE = "browser"  # "browser": a browser lists and restores only its own solves, also after reloads and restarts; "shared": everyone's
+STORAGE_SECRET = os.environ.get("CRAMER_STORAGE_SECRET", "change-this-secret")  # Signs the cookie holding each browser's id
+HISTORY_MAX_N = 18  # Larger systems are not recorded (one N = 1000 system alone takes 8 MB)
+MAX_GRID_N = 18  # Largest N drawn as a full grid of input boxes
+MAX_LARGE_N = 1000  # Largest N accepted in large-N mode (virtualized grid)
+MAX_RHS_COLUMNS = 32  # Most right-hand-side columns (B) solved against one A
+MAX_UPLOAD_BYTES = 32 * 2**20  # Largest file accepted by the import dialog (an N = 1000 .npy is about 8 MB)
+RANDOM_FAMILY = "uniform"  # System family of the Random button until another is picked (see generators.py)
+RANDOM_SEED = None  # Seed of each session's random systems, for repeatable demos (None: fresh every session)
+SWEEP_POINTS = 1000  # Values of t a parametric sweep starts with
+SWEEP_MAX_POINTS = 20000  # Most values of t solved in one sweep
+SWEEP_PLOT_POINTS = 1000  # Points drawn per curve; longer sweeps are thinned keeping their peaks
+VIEWPORT_SIZE = 8  # Rows and columns shown at once in large-N mode
+MAX_SHOWN_SOLUTIONS = 200  # Most x_i values listed at once for a large system
+SOLVE_EXECUTOR = "process"  # Where large solves run: "process", "thread" or "inline" (on the event loop)
+SOLVE_WORKERS = 2  # Worker processes/threads shared by all sessions
+OFFLOAD_MIN_N = 48  # Smaller systems are solved inline; handing them to a worker costs more than the solve
+MAX_SOLVES_IN_FLIGHT = 1  # Offloaded solves one session may have running at once
+API_MAX_BATCH_SIZE = 10000  # Most systems accepted by one POST /api/solve/batch
+API_MAX_BATCH_COEFFICIENTS = 1_000_000  # Most values of A and B summed over one batch's systems
+API_BATCH_CHUNK = 64  # Systems solved per worker call while streaming a batch
+API_MAX_CONCURRENT_SOLVES = 1  # API solves on the pool at once; keep below SOLVE_WORKERS for the page
+CONDITION_WARNING = 1e8  # Condition estimates above this are highlighted as a precision warning
+SLOW_SOLVE_SECONDS = None  # Log solves slower than this with their phase breakdown (None disables the log)
+# =========================================
+# Theme Colors
+THEMES = {
+    "dark": {
+        "bg": "#0a0a0a",
+        "surface": "#1a1a1a",
+        "card": "#2a2a2a",
+        "text": "#ffffff",
+        "text_secondary": "#a0a0a0",
+        "border": "#404040",
+        "neon_primary": "#00ff88",
+        "neon_secondary": "#00ddff",
+        "neon_error": "#ff0055",
+        "neon_warning": "#ffaa00",
+        "input_bg": "#151515",
+        "input_text": "#ffffff",
+    },
+    "light": {
+        "bg": "#f5f5f5",
+        "surface": "#ffffff",
+        "card": "#fafafa",
+        "text": "#1a1a1a",
+        "text_secondary": "#666666",
+        "border": "#d0d0d0",
+        "neon_primary": "#006432",
+        "neon_secondary": "#006080",
+        "neon_error": "#cc0044",
+        "neon_warning": "#dd8800",
+        "input_bg": "#ffffff",
+        "input_text": "#1a1a1a",
+    },
+}
+
+
+def theme_css():
+    """CSS custom properties for every palette in THEMES, selected by a class on <body>"""
+    blocks = []
+    for name, colors in THEMES.items():
+        props = " ".join(
+            f"--cr-{key.replace('_', '-')}: {value};" for key, value in colors.items()
+        )
+        blocks.append(f"body.theme-{name} {{ {props} }}")
+    return "\n".join(blocks)
+
+
+class CramersRuleSolver:
+    def __init__(self, client_id=None, browser_id=None):
+        self.client_id = client_id
+        self.browser_id = browser_id  # Kept in a cookie across reloads; owns this browser's history
+        self.last_active = time.monotonic()
+        self.n = 3
+        self.k = 1  # Right-hand-side columns of B
+        self.matrix_inputs = []
+        self.vector_inputs = []  # One list of k constant inputs per row
+        self.solution_container = None
+        self.solution_view = None  # Part of the solution container showing one B column
+        self.rhs_page = 0  # B column shown in the results
+        self.current_theme = "dark"
+        self.main_container = None
+        self.theme_button = None
+        self.last_solution_data = None
+        self.n_select = None
+        self.k_select = None
+        self.header_container = None
+        self.footer_container = None
+        self.footer_label = None
+        self.incremental = IncrementalSolver()  # Keeps A and A^-1 of the last solve for rank-1 updates
+        self.grid_card = None
+        self.grid_column = None
+        self.header_row = None
+        self.header_labels = []
+        self.grid_rows = []
+        self.grid_width_class = None
+        self.import_dialog = None
+        self.import_text = None
+        self.history_dialog = None
+        self.history_list = None
+        self.history_pagination = None
+        self.sweep_dialog = None
+        self.sweep_text = None
+        self.sweep_range = None
+        self.sweep_result = None
+        self.filling = False  # True while the model is being copied into the input boxes
+        self.grid_container = None
+        # The inputs live here; the grid and viewport boxes show it and write edits back
+        self.model = SystemModel(self.n, self.k)
+        self.random_family = RANDOM_FAMILY
+        self.rng = np.random.default_rng(RANDOM_SEED)
+        self.view_row = 0
+        self.view_col = 0
+        self.view_rhs = 0  # B column shown in the large-N viewport
+        self.viewport_inputs = []
+        self.viewport_b_inputs = []
+        self.viewport_header_labels = []
+        self.viewport_row_labels = []
+        self.view_row_input = None
+        self.view_col_input = None
+        self.view_rhs_input = None
+        self.viewport_b_label = None
+        self.pending_solves = set()  # pool jobs (concurrent futures) of this session not finished yet
+        self.solve_tasks = set()  # asyncio tasks waiting for those jobs; cancel_solves cancels them
+
+    def touch(self):
+        """Mark the session as active so it is not evicted"""
+        self.last_active = time.monotonic()
+
+    def store_solution(self, data):
+        """Keep the latest solution for redisplay, within the global retention cap"""
+        self.last_solution_data = data
+        sessions.retain_solution(self.client_id, solution_nbytes(data))
+
+    def drop_solution(self):
+        """Forget the latest solution, its share of the retention caps and the factorization kept for updates"""
+        self.last_solution_data = None
+        # A fresh solver, so an update still running on a thread cannot store into it
+        self.incremental = IncrementalSolver()
+        sessions.release_solution(self.client_id)
+
+    def toggle_theme(self):
+        """Switch palettes by flipping the theme class on <body>; no element is rebuilt"""
+        self.touch()
+        old_theme = self.current_theme
+        self.current_theme = "light" if old_theme == "dark" else "dark"
+        ui.query("body").classes(
+            remove=f"theme-{old_theme}", add=f"theme-{self.current_theme}"
+        )
+        self.theme_button.set_text("🌙" if self.current_theme == "light" else "☀️")
+
+    def clear_inputs(self):
+        """Clear all input fields"""
+        self.touch()
+        self.cancel_solves()
+        self.model.clear()
+        self.refresh_inputs()
+
+        self.solution_container.clear()
+        self.drop_solution()
+        ui.notify("All inputs cleared", type="positive")
+
+    def fill_random(self, family=None):
+        """Fill all input fields with a random system of the chosen family (uniform: max 3 digits)"""
+        self.touch()
+        if family is not None:
+            self.random_family = family
+        A, B = generate_system(self.random_family, self.n, self.k, self.rng)
+        self.model.load(A, B)
+        self.refresh_inputs()
+
+        ui.notify(f"Random values generated ({FAMILIES[self.random_family][0]})", type="positive")
+
+    def on_cell_change(self, i, j, value):
+        """Write an edited coefficient box back to the model"""
+        if not self.filling:
+            self.touch()
+            self.model.set(i, j, value)
+
+    def on_constant_change(self, i, c, value):
+        """Write an edited constant box (B column c) back to the model"""
+        if not self.filling:
+            self.touch()
+            self.model.set(i, self.model.n + c, value)
+
+    def render_import_dialog(self):
+        """Dialog for pasting a system or uploading a CSV / .npy / .npz file"""
+        with (
+            ui.dialog() as self.import_dialog,
+            ui.card().classes("p-4 md:p-6").style(
+                "background: var(--cr-card); min-width: 340px"
+            ),
+        ):
+            ui.label("Import System").classes("text-lg md:text-xl font-bold").style(
+                "color: var(--cr-neon-secondary)"
+            )
+            ui.label("Paste the rows of [A | B], one equation per line (B may have several columns)").classes(
+                "text-sm"
+            ).style("color: var(--cr-text-secondary)")
+            self.import_text = (
+                ui.textarea(placeholder="2 1 5\n1 3 10")
+                .classes("w-full font-mono")
+                .props('outlined input-style="color: var(--cr-input-text)"')
+            )
+            ui.upload(
+                label="...or upload .csv, .txt, .npy or .npz",
+                auto_upload=True,
+                on_upload=self.import_upload,
+                on_rejected=lambda: ui.notify(
+                    f"Files are limited to {MAX_UPLOAD_BYTES // 2**20} MB", type="warning"
+                ),
+                max_file_size=MAX_UPLOAD_BYTES,
+            ).props('accept=".csv,.txt,.npy,.npz" flat').classes("w-full")
+            with ui.row().classes("w-full justify-end gap-2"):
+                ui.button("Cancel", on_click=self.import_dialog.close).props("flat")
+                ui.button("Import", on_click=self.import_pasted).props(
+                    "rounded"
+                ).style("background: var(--cr-neon-primary); color: #000; font-weight: bold")
+
+    def open_import_dialog(self):
+        self.touch()
+        self.import_dialog.open()
+
+    def import_pasted(self):
+        """Import the pasted text"""
+        self.touch()
+        try:
+            A, B = parse_system_text(self.import_text.value or "")
+        except ValueError as e:
+            ui.notify(str(e), type="negative")
+            return
+        self.load_system(A, B)
+
+    async def import_upload(self, e):
+        """Import an uploaded file (saved to disk so .npy files can be memory-mapped)"""
+        self.touch()
+        suffix = os.path.splitext(e.file.name)[1].lower()
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        try:
+            await e.file.save(path)
+            A, B = load_system_file(path, max_n=MAX_LARGE_N, max_k=MAX_RHS_COLUMNS)
+        except (ValueError, OSError) as error:
+            ui.notify(f"Could not import {e.file.name}: {error}", type="negative")
+            return
+        finally:
+            os.remove(path)
+        self.load_system(A, B)
+
+    def load_system(self, A, B, action="Imported"):
+        """Resize the grid to the system and fill every cell in one batched update.
+
+        Returns False when the system is too large for the page.
+        """
+        n = len(B)
+        k = 1 if B.ndim == 1 else B.shape[1]
+        if not 2 <= n <= MAX_LARGE_N:
+            ui.notify(
+                f"Systems must have between 2 and {MAX_LARGE_N} variables, got {n}",
+                type="warning",
+            )
+            return False
+        if k > MAX_RHS_COLUMNS:
+            ui.notify(
+                f"At most {MAX_RHS_COLUMNS} right-hand-side columns are supported, got {k}",
+                type="warning",
+            )
+            return False
+
+        self.update_grid(n, k)
+        self.n_select.value = n
+        self.k_select.value = k
+
+        # The model keeps full precision; the boxes only show the rounded values
+        self.model.load(A, B)
+        self.refresh_inputs()
+        self.import_dialog.close()
+        ui.notify(f"{action} a {n}×{n} system", type="positive")
+        return True
+
+    def render_history_dialog(self):
+        """Dialog listing past solves a page at a time, each with a Restore button"""
+        with (
+            ui.dialog() as self.history_dialog,
+            ui.card().classes("p-4 md:p-6").style(
+                "background: var(--cr-card); min-width: 340px; max-width: 720px"
+            ),
+        ):
+            ui.label("Solve History").classes("text-lg md:text-xl font-bold").style(
+                "color: var(--cr-neon-secondary)"
+            )
+            self.history_list = ui.column().classes("w-full gap-1")
+            with ui.row().classes("w-full items-center justify-between gap-2"):
+                # Only the summaries of the shown page are read from the database
+                self.history_pagination = ui.pagination(
+                    1, 1, direction_links=True,
+                    on_change=lambda e: self.show_history_page(e.value),
+                ).props("max-pages=5 boundary-numbers")
+                ui.button("Close", on_click=self.history_dialog.close).props("flat")
+
+    async def open_history_dialog(self):
+        self.touch()
+        if self.history_pagination.value == 1:
+            await self.show_history_page(1)
+        else:
+            self.history_pagination.value = 1  # shows page 1 through on_change
+        self.history_dialog.open()
+
+    def history_owner(self):
+        """Owner whose solves this page lists, or None when the history is shared"""
+        return self.browser_id if HISTORY_SCOPE == "browser" else None
+
+    async def show_history_page(self, page):
+        """List one page of past solves, newest first"""
+        owner = self.history_owner()
+        count = await history_workers.run(solve_history.count, owner)
+        self.history_pagination.max = max(1, math.ceil(count / HISTORY_PAGE_SIZE))
+        entries = await history_workers.run(
+            solve_history.page, (page - 1) * HISTORY_PAGE_SIZE, HISTORY_PAGE_SIZE, owner
+        )
+        self.history_list.clear()
+        with self.history_list:
+            if not entries:
+                ui.label("No solves yet").style("color: var(--cr-text-secondary)")
+            for entry in entries:
+                n, k = entry["n"], entry["k"]
+                size = f"{n}×{n}" + (f", {k} B columns" if k > 1 else "")
+                det_text = format_determinant(entry["det_sign"], entry["log_abs_det"])
+                with ui.row().classes("w-full items-center gap-3 flex-nowrap"):
+                    ui.label(time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["created"]))).classes(
+                        "text-xs font-mono whitespace-nowrap"
+                    ).style("color: var(--cr-text-secondary)")
+                    ui.label(f"{size} · {entry['mode']} · det(A) = {det_text}").classes(
+                        "text-sm font-mono grow"
+                    ).style("color: var(--cr-text)")
+                    ui.label(f"{entry['seconds'] * 1e3:.1f} ms").classes("text-xs whitespace-nowrap").style(
+                        "color: var(--cr-text-secondary)"
+                    )
+                    ui.button("Restore", on_click=partial(self.restore_solve, entry["id"])).props(
+                        "flat dense"
+                    ).style("color: var(--cr-neon-primary)")
+
+    async def restore_solve(self, solve_id):
+        """Put a past system back into the grid and show its stored solution"""
+        self.touch()
+        data = await history_workers.run(solve_history.load, solve_id, self.history_owner())
+        if data is None:
+            ui.notify("This solve is no longer in the history", type="warning")
+            return
+        if not self.load_system(data["A"], data["B"], action="Restored"):
+            return
+        self.history_dialog.close()
+        self.store_solution(data)
+        self.show_solution_with_data(data)
+
+    def render_sweep_dialog(self):
+        """Dialog for solving a system with coefficients in t over a range of t and plotting the results"""
+        with (
+            ui.dialog() as self.sweep_dialog,
+            ui.card().classes("p-4 md:p-6").style(
+                "background: var(--cr-card); min-width: 340px; width: 900px; max-width: 95vw"
+            ),
+        ):
+            ui.label("Parametric Sweep").classes("text-lg md:text-xl font-bold").style(
+                "color: var(--cr-neon-secondary)"
+            )
+            ui.label(
+                "Rows of [A | b] whose entries may use t, e.g. 2*t - 1, sin(pi*t), 1/t, exp(-t); "
+                "separate entries with commas"
+            ).classes("text-sm").style("color: var(--cr-text-secondary)")
+            self.sweep_text = (
+                ui.textarea(placeholder="t, 1, 1\n1, t, 2")
+                .classes("w-full font-mono")
+                .props('outlined input-style="color: var(--cr-input-text)"')
+            )
+            with ui.row().classes("w-full items-end gap-3"):
+                self.sweep_range = (
+                    ui.number("t from", value=-2).props("outlined dense").classes("w-28"),
+                    ui.number("t to", value=2).props("outlined dense").classes("w-28"),
+                    ui.number("Points", value=SWEEP_POINTS, min=2, max=SWEEP_MAX_POINTS, precision=0)
+                    .props("outlined dense")
+                    .classes("w-28"),
+                )
+                ui.space()
+                ui.button("Close", on_click=self.sweep_dialog.close).props("flat")
+                ui.button("📈 Sweep", on_click=self.run_sweep).props("rounded").style(
+                    "background: var(--cr-neon-primary); color: #000; font-weight: bold"
+                )
+            self.sweep_result = ui.column().classes("w-full gap-2")
+
+    def open_sweep_dialog(self):
+        """Open the sweep dialog, starting from the grid's system when nothing was entered yet"""
+        self.touch()
+        if not self.sweep_text.value:
+            try:
+                A, B = self.model.system()
+            except MissingValueError:
+                A = B = None
+            if A is not None:
+                b = B if B.ndim == 1 else B[:, 0]
+                self.sweep_text.value = "\n".join(
+                    ", ".join(f"{v:.15g}" for v in row) for row in np.column_stack([A, b])
+                )
+        self.sweep_dialog.open()
+
+    async def run_sweep(self):
+        """Solve the system at every value of t in one batch and plot det(A)(t) and x_i(t)"""
+        self.touch()
+        start, stop, points = (field.value for field in self.sweep_range)
+        try:
+            rows = parse_sweep_text(self.sweep_text.value or "")
+        except ValueError as e:
+            ui.notify(str(e), type="negative")
+            return
+        if len(rows) < 2 or len(rows) > MAX_GRID_N:
+            ui.notify(f"Sweeps take systems of 2 to {MAX_GRID_N} equations, got {len(rows)}", type="warning")
+            return
+        if start is None or stop is None or start >= stop:
+            ui.notify("'t from' must be below 't to'", type="warning")
+            return
+        if points is None or not 2 <= points <= SWEEP_MAX_POINTS:
+            ui.notify(f"Sweeps take 2 to {SWEEP_MAX_POINTS} values of t", type="warning")
+            return
+        if len(self.pending_solves) >= MAX_SOLVES_IN_FLIGHT:
+            ui.notify("A solve is already running", type="warning")
+            return
+        t = np.linspace(start, stop, int(points))
+        try:
+            result = await self.wait_for_job(solve_workers.submit(sweep, rows, t))
+        except asyncio.CancelledError:
+            ui.notify("Sweep cancelled", type="info")
+            return
+        self.show_sweep(result)
+
+    def show_sweep(self, result):
+        """Summary and echarts of a sweep; each curve is thinned to SWEEP_PLOT_POINTS"""
+        t, roots = result["t"], result["det_roots"]
+        n = result["solutions"].shape[1]
+        summary = f"{len(t)} values of t, {int(result['singular'].sum())} singular"
+        if result["undefined"].any():
+            summary += f", {int(result['undefined'].sum())} undefined (an entry is not finite)"
+        if len(roots):
+            shown = ", ".join(f"{r:.6g}" for r in roots[:10])
+            summary += f". det(A) = 0 near t ≈ {shown}" + (f" and {len(roots) - 10} more" if len(roots) > 10 else "")
+
+        def curve(y):
+            indices = plot_indices(y, SWEEP_PLOT_POINTS)
+            return [[float(a), float(b) if np.isfinite(b) else None] for a, b in zip(t[indices], y[indices])]
+
+        def chart(title, series):
+            return {
+                "animation": False,
+                "title": {"text": title, "textStyle": {"color": "#888", "fontSize": 14}},
+                "tooltip": {"trigger": "axis"},
+                "legend": {"top": 0, "right": 0, "textStyle": {"color": "#888"}, "type": "scroll"},
+                "grid": {"left": 60, "right": 20, "top": 40, "bottom": 30},
+                "xAxis": {"type": "value", "name": "t", "min": float(t[0]), "max": float(t[-1])},
+                "yAxis": {"type": "value", "scale": True},
+                # Scroll zooms t, so spikes next to a singular t can be looked at closely
+                "dataZoom": [{"type": "inside"}],
+                "series": series,
+            }
+
+        # Roots of det(A) are drawn as vertical lines on both charts
+        roots_line = {
+            "symbol": "none",
+            "silent": True,
+            "lineStyle": {"type": "dashed", "color": "#FF004D"},
+            "label": {"show": False},
+            "data": [{"xAxis": float(r)} for r in roots[:50]],
+        }
+        det_series = [{
+            "name": "det(A)", "type": "line", "showSymbol": False,
+            "data": curve(result["det_A"]), "markLine": roots_line,
+        }]
+        x_series = [
+            {"name": f"x{i + 1}", "type": "line", "showSymbol": False, "data": curve(result["solutions"][:, i])}
+            for i in range(n)
+        ]
+        x_series[0]["markLine"] = roots_line
+
+        self.sweep_result.clear()
+        with self.sweep_result:
+            ui.label(summary).classes("text-sm").style("color: var(--cr-text)")
+            ui.echart(chart("det(A)(t)", det_series)).classes("w-full h-64")
+            ui.echart(chart("x_i(t)", x_series)).classes("w-full h-80")
+
+    def build_page(self):
+        """Create the page skeleton for this client and render its content"""
+        # Add responsive meta tag and CSS to hide number input spinners
+        ui.add_head_html('''
+            <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=5.0">
+            <style>
+                /* Hide number input spinners */
+                input[type=number]::-webkit-inner-spin-button,
+                input[type=number]::-webkit-outer-spin-button {
+                    -webkit-appearance: none;
+                    margin: 0;
+                }
+                input[type=number] {
+                    -moz-appearance: textfield;
+                    appearance: textfield;
+                }
+            </style>
+        ''')
+        # Theme palettes as CSS variables, switched with a class on <body>
+        ui.add_head_html(f"<style>{theme_css()}</style>")
+        ui.query("body").classes(f"theme-{self.current_theme}")
+        ui.colors(primary='#004488')
+
+        # Header
+        self.header_container = (
+            ui.header()
+            .classes("items-center justify-between px-4 md:px-6 py-4")
+            .style("background: var(--cr-surface); box-shadow: 0 2px 8px rgba(0,0,0,0.2)")
+        )
+
+        # Main content
+        self.main_container = (
+            ui.column()
+            .classes("w-full px-4 md:px-6 gap-6 flex-grow")
+            .style("max-width: 100vw;")
+        )
+
+        # Footer
+        self.footer_container = (
+            ui.footer()
+            .classes("w-full py-4")
+            .style("background: var(--cr-surface); margin-top: auto")
+        )
+        with self.footer_container:
+            with ui.row().classes("w-full justify-center"):
+                self.footer_label = (
+                    ui.label("© 2025 SAVIO PRINCE")
+                    .classes("text-sm")
+                    .style("color: var(--cr-text-secondary)")
+                )
+
+        self.rebuild_ui()
+
+    def rebuild_ui(self):
+        """Render the header and main content"""
+        # Update body
+        ui.query("body").style(
+            f"background: var(--cr-bg); margin: 0; padding: 0; font-family: {CUSTOM_FONT}; "
+            f"display: flex; flex-direction: column; min-height: 100vh"
+        )
+
+        # Update header
+        self.header_container.clear()
+        with self.header_container:
+            with ui.row().classes("items-center gap-4 md:gap-6 flex-1 flex-wrap"):
+
+                # ============= MODIFIED LOGO SECTION =============
+                # NOTE: This assumes 'logo.png' is in the SAME directory as main.py
+                ui.image(LOGO_IMAGE_PATH).style('max-width: 200px; height: auto;')
+                # If logo.png is missing, NiceGUI will show an error message
+                # instead of silently falling back to a text logo.
+                # =================================================
+
+                # Title
+                with ui.column().classes("gap-0"):
+                    ui.label("Cramer's Rule Solver").classes(
+                        "text-lg md:text-2xl font-bold"
+                    ).style("color: var(--cr-text)")
+                    ui.label("SAVIO PRINCE | CCE25EC053").classes(
+                        "text-xs md:text-sm"
+                    ).style("color: var(--cr-text-secondary)")
+
+            # Theme toggle button - emoji only
+            icon = "🌙" if self.current_theme == "light" else "☀️"
+            self.theme_button = (
+                ui.button(icon, on_click=self.toggle_theme)
+                .props("rounded flat")
+                .classes("px-3 md:px-4")
+                .style(
+                    f"background: #8B5DFF; color: #000; "
+                    f"font-weight: bold; font-size: 20px;"
+                )
+            )
+
+        # Rebuild main content
+        self.main_container.clear()
+        with self.main_container:
+            # Control Panel
+            with (
+                ui.card()
+                .classes("w-full max-w-4xl mx-auto p-4 md:p-6 rounded-lg")
+                .style("background: var(--cr-card)")
+            ):
+                # Variable selector and buttons - all in one responsive row
+                with ui.row().classes("items-center gap-3 md:gap-4 flex-wrap"):
+                    ui.label("Number of Variables (N):").classes(
+                        "text-base md:text-lg font-semibold whitespace-nowrap"
+                    ).style("color: var(--cr-text)")
+
+                    self.n_select = (
+                        ui.number(value=self.n, min=2, max=MAX_LARGE_N, step=1)
+                        .classes("rounded-lg no-spinner")
+                        .style(
+                            "background: var(--cr-input-bg); color: var(--cr-input-text) !important; "
+                            "border: 2px solid var(--cr-neon-secondary); width: 100px"
+                        )
+                        .props(
+                            'dense outlined input-style="color: var(--cr-input-text) !important"'
+                        )
+                    )
+
+                    ui.label("Right-hand Sides (k):").classes(
+                        "text-base md:text-lg font-semibold whitespace-nowrap"
+                    ).style("color: var(--cr-text)")
+
+                    self.k_select = (
+                        ui.number(value=self.k, min=1, max=MAX_RHS_COLUMNS, step=1)
+                        .classes("rounded-lg no-spinner")
+                        .style(
+                            "background: var(--cr-input-bg); color: var(--cr-input-text) !important; "
+                            "border: 2px solid var(--cr-neon-primary); width: 80px"
+                        )
+                        .props(
+                            'dense outlined input-style="color: var(--cr-input-text) !important"'
+                        )
+                    )
+
+                    # Vertical separator for larger screens
+                    with (
+                        ui.element("div")
+                        .classes("hidden md:block")
+                        .style(
+                            "width: 2px; height: 32px; background: var(--cr-border)"
+                        )
+                    ):
+                        pass
+
+                    # Action buttons - wrap to new line on small screens (no shadows)
+                    ui.button(
+                        "Update Grid",
+                        on_click=lambda: self.update_grid(
+                            int(self.n_select.value), int(self.k_select.value or 1)
+                        ),
+                    ).props("rounded flat").classes(
+                        "px-4 md:px-6 text-sm md:text-base"
+                    ).style(
+                        f"background: #31ccec; color: #000; "
+                        f"font-weight: bold; transition: all 0.2s;"
+                    )
+
+                    ui.button("🗑️ Clear", on_click=self.clear_inputs).props(
+                        "rounded flat"
+                    ).classes("px-4 md:px-6 text-sm md:text-base").style(
+                        f"background: #FF004D; color: #000; "
+                        f"font-weight: bold; transition: all 0.2s;"
+                    )
+
+                    # The button repeats the last family; the arrow opens the list of families
+                    with ui.dropdown_button(
+                        "🎲 Random", on_click=lambda: self.fill_random(), split=True, auto_close=True
+                    ).props("rounded flat").classes("px-4 md:px-6 text-sm md:text-base").style(
+                        f"background: #F57D1F; color: #000; "
+                        f"font-weight: bold; transition: all 0.2s;"
+                    ):
+                        for family, (label, _) in FAMILIES.items():
+                            ui.item(label, on_click=partial(self.fill_random, family))
+
+                    ui.button("📥 Import", on_click=self.open_import_dialog).props(
+                        "rounded flat"
+                    ).classes("px-4 md:px-6 text-sm md:text-base").style(
+                        "background: #8B5DFF; color: #000; "
+                        "font-weight: bold; transition: all 0.2s;"
+                    )
+
+                    ui.button("📈 Sweep", on_click=self.open_sweep_dialog).props(
+                        "rounded flat"
+                    ).classes("px-4 md:px-6 text-sm md:text-base").style(
+                        "background: #00DDFF; color: #000; "
+                        "font-weight: bold; transition: all 0.2s;"
+                    )
+
+                    if solve_history is not None:
+                        ui.button("🕘 History", on_click=self.open_history_dialog).props(
+                            "rounded flat"
+                        ).classes("px-4 md:px-6 text-sm md:text-base").style(
+                            "background: #FFD93D; color: #000; "
+                            "font-weight: bold; transition: all 0.2s;"
+                        )
+
+            self.render_import_dialog()
+            self.render_sweep_dialog()
+            if solve_history is not None:
+                self.render_history_dialog()
+
+            # Matrix Input Grid
+            with ui.column().classes("w-full") as self.grid_container:
+                if self.n > MAX_GRID_N:
+                    self.render_virtual_grid()
+                else:
+                    self.render_grid()
+
+            # Solve Button (no shadow)
+            with ui.row().classes("w-full justify-center mt-4"):
+                ui.button("🧮 Solve System", on_click=self.solve_system).props(
+                    "rounded size=lg"
+                ).classes("px-8 md:px-12 py-3").style(
+                    "background: var(--cr-neon-primary); color: #000; "
+                    f"font-size: 16px md:font-size: 18px; font-weight: bold; transition: all 0.2s;"
+                )
+
+            # Solution Display
+            self.solution_container = ui.column().classes("w-full mt-6")
+
+            # If we had a previous solution, redisplay it
+            if self.last_solution_data:
+                self.show_solution_with_data(self.last_solution_data)
+
+    async def solve_system(self):
+        """Solve the linear system using Cramer's Rule"""
+        self.touch()
+        if len(self.pending_solves) >= MAX_SOLVES_IN_FLIGHT:
+            ui.notify("A solve is already running", type="warning")
+            return
+        timer = PhaseTimer()
+        try:
+            with timer.phase("read_inputs"):
+                # Validation and reading are array operations on the model, no widget reads
+                A, B = self.model.system()
+
+            # Re-use a cached solution for unchanged inputs
+            # Large systems always use the float factorization path
+            exact = EXACT_INTEGER_MODE and len(B) <= MAX_GRID_N
+            mode = "exact" if exact else "float"
+            with timer.phase("cache_lookup"):
+                data = solution_cache.get(A, B, mode)
+                # Systems solved before, also in earlier runs, come back from the history
+                if data is None and solve_history is not None and len(B) <= HISTORY_MAX_N:
+                    data = await history_workers.run(solve_history.find, A, B, mode)
+                    if data is not None:
+                        solution_cache.put(A, B, mode, data)
+            if data is None:
+                # Apply Cramer's Rule and store all intermediate values
+                with timer.phase("solve"):
+                    data = await self.run_solve(A, B, exact)
+                timer.add_timings(data.get("timings", {}))
+                solution_cache.put(A, B, mode, data)
+            if solve_history is not None and len(B) <= HISTORY_MAX_N:
+                with timer.phase("history"):
+                    await history_workers.run(
+                        solve_history.record, data, mode, timer.total(), self.browser_id
+                    )
+            self.store_solution(data)
+
+            with timer.phase("render_solution"):
+                self.show_solution_with_data(self.last_solution_data)
+            metrics.record_solve(timer, len(B), mode)
+
+        except asyncio.CancelledError:
+            metrics.count_error("cancelled")
+            self.solution_container.clear()
+            ui.notify("Solve cancelled", type="info")
+        except MissingValueError as e:
+            metrics.count_error("missing_value")
+            ui.notify(str(e), type="warning")
+        except np.linalg.LinAlgError as e:
+            metrics.count_singular()
+            self.show_error(str(e))
+        except Exception as e:
+            metrics.count_error(type(e).__name__)
+            self.show_error(f"Error: {str(e)}")
+
+    async def run_solve(self, A, B, exact):
+        """Solve inline when small, otherwise on the worker pool while a pending card is shown"""
+        if len(B) < OFFLOAD_MIN_N or solve_workers.kind == "inline":
+            return solve(A, B, exact=exact, incremental=self.incremental)
+
+        # The incremental solver's state lives in this process and is not thread-safe,
+        # so it is only used off the loop by one thread and only when no other solve is running
+        incremental = None if self.pending_solves or exact else self.incremental
+        in_process = solve_workers.kind == "process"
+        if in_process and incremental is not None and incremental.can_update(A):
+            # A one-cell edit of the last system is an O(n^2) rank-1 update, not worth a worker process
+            job = update_workers.submit(incremental.solve, A, B)
+            in_process = False
+        elif in_process:
+            job = solve_workers.submit(solve, A, B, exact=exact)
+        else:
+            job = solve_workers.submit(solve, A, B, exact=exact, incremental=incremental)
+        self.show_pending(len(B))
+        data = await self.wait_for_job(job)
+        if in_process and incremental is not None:
+            # Later one-cell edits update this solve instead of sending A to a worker again
+            incremental.remember(A, data)
+        return data
+
+    async def wait_for_job(self, job):
+        """Wait for a pool job, which counts in pending_solves until it has finished on the pool.
+
+        cancel_solves() ends the wait at once, but a job that already started
+        keeps its place until it returns, so cancelling and solving again
+        cannot pile up abandoned jobs on the pool that other sessions share.
+        """
+        loop = asyncio.get_running_loop()
+
+        def finished(_):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self.pending_solves.discard, job)
+
+        self.pending_solves.add(job)
+        job.add_done_callback(finished)
+        task = asyncio.ensure_future(asyncio.wrap_future(job))
+        self.solve_tasks.add(task)
+        try:
+            return await task
+        finally:
+            self.solve_tasks.discard(task)
+
+    def cancel_solves(self):
+        """Cancel this session's offloaded solves and sweeps; their results are discarded"""
+        for task in self.solve_tasks:
+            task.cancel()
+
+    def show_pending(self, n):
+        """Display a progress card while a solve runs in the background"""
+        self.solution_container.clear()
+        with self.solution_container:
+            with (
+                ui.card()
+                .classes("w-full p-4 md:p-6 rounded-lg")
+                .style(
+                    "background: var(--cr-card); border: 2px solid var(--cr-neon-secondary);"
+                )
+            ):
+                with ui.row().classes("w-full items-center gap-4"):
+                    ui.spinner(size="lg").style("color: var(--cr-neon-secondary)")
+                    ui.label(f"Solving the {n}×{n} system…").classes(
+                        "text-base md:text-lg"
+                    ).style("color: var(--cr-text)")
+                    ui.space()
+                    ui.button("Cancel", on_click=self.cancel_solves).props(
+                        "outline rounded"
+                    ).style("color: var(--cr-neon-error)")
+
+    def show_solution_with_data(self, data):
+        """Display solution with all data, one right-hand side at a time"""
+        self.solution_container.clear()
+        k = rhs_count(data)
+        self.rhs_page = min(self.rhs_page, k - 1)
+        with self.solution_container:
+            if k > 1:
+                # Every column was solved together, so paging only re-renders the results
+                with ui.row().classes("w-full items-center justify-center gap-3 mb-4"):
+                    ui.label("Right-hand side").classes("text-base font-semibold").style(
+                        "color: var(--cr-text)"
+                    )
+                    ui.pagination(
+                        1,
+                        k,
+                        direction_links=True,
+                        value=self.rhs_page + 1,
+                        on_change=lambda e: self.show_rhs_column(data, e.value - 1),
+                    ).props("max-pages=7 boundary-numbers")
+            self.solution_view = ui.column().classes("w-full gap-0")
+        self.show_rhs_column(data, self.rhs_page)
+
+    def show_rhs_column(self, data, c):
+        """Show the results for B column c of a solution"""
+        self.touch()
+        self.rhs_page = c
+        if rhs_count(data) == 1:
+            column = data
+        else:
+            # Column views are kept on the solution so their steps text is cached too
+            columns = data.setdefault("rhs_columns", {})
+            column = columns[c] = columns.get(c) or rhs_column(data, c)
+
+        if len(column["B"]) > MAX_GRID_N:
+            self.show_large_solution(column)
+        else:
+            self.show_grid_solution(column)
+
+    def show_grid_solution(self, data):
+        """Solution card with every x_i and the expandable solution steps"""
+        self.solution_view.clear()
+
+        det_A_text, _, solution_texts = format_solution(data)
+
+        with self.solution_view:
+            # Quick Solution Display
+            with (
+                ui.card()
+                .classes("w-full p-4 md:p-6 rounded-lg")
+                .style(
+                    "background: var(--cr-card); border: 2px solid var(--cr-neon-primary);"
+                )
+            ):
+                ui.label("✓ Solution Found").classes(
+                    "text-xl md:text-2xl font-bold mb-4"
+                ).style("color: var(--cr-neon-primary)")
+
+                ui.label(f"det(A) = {det_A_text}").classes("text-sm").style(
+                    "color: var(--cr-text-secondary)"
+                )
+                self.render_condition(data)
+
+                ui.separator().style("background: var(--cr-border)")
+
+                for i, sol in enumerate(solution_texts):
+                    with ui.row().classes("items-center gap-2 mt-3 flex-wrap"):
+                        ui.label(f"x{i + 1}").classes(
+                            "text-base md:text-lg font-mono font-bold"
+                        ).style("color: var(--cr-neon-secondary); min-width: 40px")
+                        ui.label("=").style("color: var(--cr-text)")
+                        ui.label(sol).classes(
+                            "text-base md:text-lg font-mono"
+                        ).style("color: var(--cr-text)")
+
+            # Detailed Explanation (Expandable), rendered the first time it is opened
+            steps = (
+                ui.expansion("📊 Show Detailed Solution Steps", icon="calculate")
+                .classes("w-full mt-4")
+                .style(
+                    "background: var(--cr-card); border: 2px solid var(--cr-neon-warning); "
+                    "border-radius: 8px; color: var(--cr-text)"
+                )
+            )
+            steps.on_value_change(
+                lambda e: self.render_steps(steps, data) if e.value else None
+            )
+
+    def render_condition(self, data):
+        """Condition estimate under det(A), highlighted when precision is at risk"""
+        cond = data.get("cond")
+        if cond is None:
+            return
+        ill = cond > CONDITION_WARNING
+        ui.label(
+            f"{'⚠ ' if ill else ''}cond(A) ≈ {format_condition(cond)}"
+        ).classes("text-sm mb-4").style(
+            f"color: var(--cr-{'neon-warning' if ill else 'text-secondary'})"
+        )
+
+    def show_large_solution(self, data):
+        """Summary card for a large system: det(A), residual, statistics and requested x_i"""
+        self.solution_view.clear()
+        x = data["solutions"]
+        residual = np.abs(data["verification"] - data["B"]).max()
+
+        with self.solution_view:
+            with (
+                ui.card()
+                .classes("w-full p-4 md:p-6 rounded-lg")
+                .style(
+                    "background: var(--cr-card); border: 2px solid var(--cr-neon-primary);"
+                )
+            ):
+                ui.label(f"✓ Solution Found (N = {len(x)})").classes(
+                    "text-xl md:text-2xl font-bold mb-4"
+                ).style("color: var(--cr-neon-primary)")
+
+                summary = "\n".join(
+                    [
+                        f"det(A)        = {format_determinant(*determinant_parts(data))}",
+                        f"max |AX - B|  = {residual:.3e}",
+                        f"min x_i       = {x.min():.6f}  (x{int(x.argmin()) + 1})",
+                        f"max x_i       = {x.max():.6f}  (x{int(x.argmax()) + 1})",
+                        f"mean x_i      = {x.mean():.6f}",
+                        f"‖x‖₂          = {np.linalg.norm(x):.6f}",
+                    ]
+                )
+                ui.label(summary).classes("text-sm font-mono").style(
+                    "color: var(--cr-text); white-space: pre"
+                )
+                self.render_condition(data)
+
+                ui.separator().style("background: var(--cr-border)")
+
+                with ui.row().classes("items-center gap-2 mt-3 flex-wrap"):
+                    picker = (
+                        ui.input(placeholder="e.g. 1-10, 42")
+                        .classes("rounded-lg")
+                        .props(
+                            'dense outlined input-style="color: var(--cr-input-text) !important"'
+                        )
+                    )
+                    ui.button(
+                        "Show x_i",
+                        on_click=lambda: values.set_text(
+                            self.format_requested_solutions(x, picker.value)
+                        ),
+                    ).props("rounded flat").style(
+                        "background: #31ccec; color: #000; font-weight: bold;"
+                    )
+                values = ui.label().classes("text-base font-mono mt-2").style(
+                    "color: var(--cr-text); white-space: pre"
+                )
+
+    def format_requested_solutions(self, x, spec):
+        """Lines "x_i = value" for a spec like "1-10, 42" (1-based, capped at MAX_SHOWN_SOLUTIONS)"""
+        indices = []
+        for part in (spec or "").replace(" ", "").split(","):
+            if not part:
+                continue
+            try:
+                if "-" in part:
+                    start, stop = (int(v) for v in part.split("-", 1))
+                    indices.extend(range(start, stop + 1))
+                else:
+                    indices.append(int(part))
+            except ValueError:
+                return f"Could not read '{part}'"
+        indices = [i for i in indices if 1 <= i <= len(x)][:MAX_SHOWN_SOLUTIONS]
+        return "\n".join(f"x{i} = {x[i - 1]:.6f}" for i in indices)
+
+    def render_steps(self, expansion, data):
+        """Fill the steps expansion with one preformatted block (only once per solution)"""
+        if expansion.default_slot.children:
+            return
+
+        # The text is cached on the solution, so re-opening or redisplaying is free
+        start = time.perf_counter()
+        if "steps_text" not in data:
+            data["steps_text"] = format_steps(data)
+
+        with expansion:
+            with (
+                ui.column()
+                .classes("w-full p-4 gap-4 font-mono")
+                .style(
+                    "background: var(--cr-input-bg); color: var(--cr-text); overflow-x: auto"
+                )
+            ):
+                ui.label(data["steps_text"]).style(
+                    "color: var(--cr-text); white-space: pre"
+                )
+                ui.label("Created by @oivas000").classes(
+                    "text-sm mt-4 text-center"
+                ).style("color: var(--cr-text-secondary)")
+        metrics.observe_phase("render_steps", time.perf_counter() - start)
+
+    def show_error(self, message):
+        """Display error message"""
+        self.solution_container.clear()
+        with self.solution_container:
+            with (
+                ui.card()
+                .classes("w-full p-4 md:p-6 rounded-lg")
+                .style(
+                    "background: var(--cr-card); border: 2px solid var(--cr-neon-error);"
+                )
+            ):
+                ui.label("✗ Error").classes("text-xl md:text-2xl font-bold mb-2").style(
+                    "color: var(--cr-neon-error)"
+                )
+                ui.label(message).classes("text-sm md:text-base").style(
+                    "color: var(--cr-text)"
+                )
+
+    def update_grid(self, new_n, new_k=None):
+        """Update the matrix grid when N or the number of B columns changes"""
+        self.touch()
+        self.cancel_solves()
+        self.drop_solution()
+        self.solution_container.clear()
+        new_k = min(max(new_k or self.k, 1), MAX_RHS_COLUMNS)
+
+        # The model keeps the overlapping values whatever the grid does
+        self.model.resize(new_n, new_k)
+        if self.n <= MAX_GRID_N and new_n <= MAX_GRID_N and new_k == self.k:
+            self.resize_grid(new_n)
+            return
+
+        # Large systems or a new number of B columns: draw the grid again from the model
+        self.n = new_n
+        self.k = new_k
+        self.grid_container.clear()
+        with self.grid_container:
+            if new_n > MAX_GRID_N:
+                self.render_virtual_grid()
+            else:
+                self.render_grid()
+
+    def refresh_inputs(self):
+        """Show the model in the grid or the large-N viewport"""
+        if self.n > MAX_GRID_N:
+            self.refresh_viewport()
+        else:
+            self.refresh_grid()
+
+    def refresh_grid(self):
+        """Copy the model into the input boxes in one pass.
+
+        Only boxes whose value differs are assigned, and every change made in
+        one handler reaches the browser as a single update message.
+        """
+        values = self.model.rows()
+        n = self.n
+        self.filling = True
+        try:
+            for row_values, row_inputs, b_inputs in zip(values, self.matrix_inputs, self.vector_inputs):
+                for value, inp in zip(row_values[:n], row_inputs):
+                    if inp.value != value:
+                        inp.value = value
+                for value, inp in zip(row_values[n:], b_inputs):
+                    if inp.value != value:
+                        inp.value = value
+        finally:
+            self.filling = False
+
+    def grid_max_width_class(self):
+        """Determine max-width based on number of variables"""
+        # Use responsive widths for smaller systems, full width for larger ones
+        columns = self.n + self.k - 1
+        if columns <= 5:
+            return "max-w-4xl"  # ~896px
+        elif columns <= 8:
+            return "max-w-6xl"  # ~1152px
+        else:
+            return "max-w-full"  # Full width for 9+ variables
+
+    def grid_width(self):
+        """Calculate required width for the grid"""
+        # input width + 2px gap + equals + B columns
+        return (self.n + self.k - 1) * (INPUT_BOX_WIDTH + 2) + 112
+
+    def render_header_label(self, j):
+        """Column header for variable x_j"""
+        return ui.label(f"x{j + 1}").classes(
+            "text-sm md:text-base font-bold text-center"
+        ).style(
+            f"color: var(--cr-neon-secondary); width: {INPUT_BOX_WIDTH}px; flex-shrink: 0"
+        )
+
+    def render_coefficient_input(self, i, j):
+        """Coefficient input with colored border"""
+        return (
+            ui.number(
+                value=None,
+                format="%.2f",
+                placeholder=f"a{i + 1}{j + 1}",
+            )
+            .classes("rounded-lg no-spinner")
+            .style(
+                "background: var(--cr-input-bg); color: var(--cr-input-text) !important; "
+                f"border: 2px solid var(--cr-neon-secondary); width: {INPUT_BOX_WIDTH}px; flex-shrink: 0"
+            )
+            .props(
+                'dense outlined input-style="color: var(--cr-input-text) !important"'
+            )
+        )
+
+    def render_constant_input(self, i, c=0):
+        """Constant input with colored border (c is the B column)"""
+        return (
+            ui.number(
+                value=None,
+                format="%.2f",
+                placeholder=self.constant_name(i, c),
+            )
+            .classes("rounded-lg no-spinner")
+            .style(
+                "background: var(--cr-input-bg); color: var(--cr-input-text) !important; "
+                f"border: 2px solid var(--cr-neon-primary); width: {INPUT_BOX_WIDTH}px; flex-shrink: 0"
+            )
+            .props(
+                'dense outlined input-style="color: var(--cr-input-text) !important"'
+            )
+        )
+
+    def constant_name(self, i, c):
+        return f"b{i + 1}" if self.k == 1 else f"b{i + 1},{c + 1}"
+
+    def rhs_header(self, c):
+        return "B" if self.k == 1 else f"B{c + 1}"
+
+    def render_grid_input(self, i, j):
+        """Coefficient box of the full grid, writing edits to the model"""
+        inp = self.render_coefficient_input(i, j)
+        inp.on_value_change(lambda e: self.on_cell_change(i, j, e.value))
+        return inp
+
+    def render_grid_constant(self, i, c):
+        """Constant box of the full grid, writing edits to the model"""
+        inp = self.render_constant_input(i, c)
+        inp.on_value_change(lambda e: self.on_constant_change(i, c, e.value))
+        return inp
+
+    def render_data_row(self, i):
+        """One equation: n coefficient inputs, an equal sign and the k constant inputs"""
+        with ui.row().classes("items-center gap-2 mb-2") as row:
+            row_inputs = [self.render_grid_input(i, j) for j in range(self.n)]
+
+            # Equal sign
+            ui.label("=").classes(
+                "text-base md:text-lg font-bold text-center"
+            ).style(
+                "color: var(--cr-neon-primary); width: 40px; flex-shrink: 0"
+            )
+
+            # Constant inputs
+            b_inputs = [self.render_grid_constant(i, c) for c in range(self.k)]
+
+        self.grid_rows.append(row)
+        self.matrix_inputs.append(row_inputs)
+        self.vector_inputs.append(b_inputs)
+
+    def render_grid(self):
+        """Render the coefficient matrix and constant vector grid"""
+        self.matrix_inputs = []
+        self.vector_inputs = []
+        self.grid_rows = []
+        self.header_labels = []
+
+        self.grid_width_class = self.grid_max_width_class()
+        with (
+            ui.card()
+            .classes(f"w-full {self.grid_width_class} mx-auto p-4 md:p-6 rounded-lg")
+            .style(
+                "background: var(--cr-card); overflow-x: auto; overflow-y: visible;"
+            )
+        ) as self.grid_card:
+            ui.label("Linear System").classes(
+                "text-lg md:text-xl font-bold mb-4"
+            ).style("color: var(--cr-neon-secondary)")
+
+            # Container for the grid - always in a single row (no line breaks)
+            with ui.column().classes("gap-2").style(
+                f"min-width: {self.grid_width()}px;"
+            ) as self.grid_column:
+                # Header row
+                with ui.row().classes("items-center gap-2 mb-2") as self.header_row:
+                    # Column headers for variables
+                    self.header_labels = [
+                        self.render_header_label(j) for j in range(self.n)
+                    ]
+
+                    # Equal sign header
+                    ui.label("").classes("text-sm md:text-base font-bold").style(
+                        "color: var(--cr-text); width: 40px; flex-shrink: 0"
+                    )
+
+                    # B column headers
+                    for c in range(self.k):
+                        ui.label(self.rhs_header(c)).classes(
+                            "text-sm md:text-base font-bold text-center"
+                        ).style(
+                            f"color: var(--cr-neon-primary); width: {INPUT_BOX_WIDTH}px; flex-shrink: 0"
+                        )
+
+                # Data rows
+                for i in range(self.n):
+                    self.render_data_row(i)
+
+        self.refresh_grid()
+
+    def resize_grid(self, new_n):
+        """Add or remove only the rows and columns that changed, keeping existing inputs and values"""
+        old_n = self.n
+        if new_n == old_n:
+            return
+        self.n = new_n
+
+        # Drop rows and columns beyond the new size
+        for row in self.grid_rows[new_n:]:
+            self.grid_column.remove(row)
+        del self.grid_rows[new_n:]
+        del self.matrix_inputs[new_n:]
+        del self.vector_inputs[new_n:]
+        for j in range(new_n, old_n):
+            self.header_row.remove(self.header_labels[j])
+            for i in range(min(old_n, new_n)):
+                self.grid_rows[i].remove(self.matrix_inputs[i][j])
+        del self.header_labels[new_n:]
+        for row_inputs in self.matrix_inputs:
+            del row_inputs[new_n:]
+
+        # Insert new columns before the "=" sign of every remaining row
+        for j in range(old_n, new_n):
+            with self.header_row:
+                label = self.render_header_label(j)
+            label.move(target_index=j)
+            self.header_labels.append(label)
+            for i in range(old_n):
+                with self.grid_rows[i]:
+                    inp = self.render_grid_input(i, j)
+                inp.move(target_index=j)
+                self.matrix_inputs[i].append(inp)
+
+        # Append new rows
+        with self.grid_column:
+            for i in range(old_n, new_n):
+                self.render_data_row(i)
+
+        # Resize the card
+        new_width_class = self.grid_max_width_class()
+        if new_width_class != self.grid_width_class:
+            self.grid_card.classes(remove=self.grid_width_class, add=new_width_class)
+            self.grid_width_class = new_width_class
+        self.grid_column.style(f"min-width: {self.grid_width()}px;")
+
+
+    def render_virtual_grid(self):
+        """Render a fixed window of a large system; the data itself lives in self.model"""
+        size = min(VIEWPORT_SIZE, self.n)
+        self.view_row = min(self.view_row, self.n - size)
+        self.view_col = min(self.view_col, self.n - size)
+        self.view_rhs = min(self.view_rhs, self.k - 1)
+        self.viewport_inputs = []
+        self.viewport_b_inputs = []
+        self.viewport_header_labels = []
+        self.viewport_row_labels = []
+        label_style = "color: var(--cr-text-secondary); width: 48px; flex-shrink: 0"
+
+        with (
+            ui.card()
+            .classes("w-full max-w-full mx-auto p-4 md:p-6 rounded-lg")
+            .style("background: var(--cr-card); overflow-x: auto; overflow-y: visible;")
+        ):
+            ui.label(f"Linear System (N = {self.n}, large-N mode)").classes(
+                "text-lg md:text-xl font-bold mb-2"
+            ).style("color: var(--cr-neon-secondary)")
+
+            # Window position
+            with ui.row().classes("items-center gap-3 mb-4 flex-wrap"):
+                position_inputs = []
+                for text, value in (("First row", self.view_row), ("First column", self.view_col)):
+                    ui.label(text).classes("text-sm").style("color: var(--cr-text)")
+                    position_inputs.append(
+                        ui.number(
+                            value=value + 1,
+                            min=1,
+                            max=self.n - size + 1,
+                            step=1,
+                            on_change=self.scroll_viewport,
+                        )
+                        .classes("rounded-lg")
+                        .style("width: 100px")
+                        .props(
+                            'dense outlined input-style="color: var(--cr-input-text) !important"'
+                        )
+                    )
+                self.view_row_input, self.view_col_input = position_inputs
+                self.view_rhs_input = None
+                if self.k > 1:
+                    # One B column is shown at a time
+                    ui.label("B column").classes("text-sm").style("color: var(--cr-text)")
+                    self.view_rhs_input = (
+                        ui.number(
+                            value=self.view_rhs + 1,
+                            min=1,
+                            max=self.k,
+                            step=1,
+                            on_change=self.scroll_viewport,
+                        )
+                        .classes("rounded-lg")
+                        .style("width: 100px")
+                        .props(
+                            'dense outlined input-style="color: var(--cr-input-text) !important"'
+                        )
+                    )
+
+            width = size * (INPUT_BOX_WIDTH + 2) + 112 + 56  # grid + row labels
+            with ui.column().classes("gap-2").style(f"min-width: {width}px;"):
+                # Header row
+                with ui.row().classes("items-center gap-2 mb-2"):
+                    ui.label("").style(label_style)
+                    for j in range(size):
+                        self.viewport_header_labels.append(self.render_header_label(j))
+                    ui.label("").classes("text-sm md:text-base font-bold").style(
+                        "width: 40px; flex-shrink: 0"
+                    )
+                    self.viewport_b_label = ui.label("B").classes(
+                        "text-sm md:text-base font-bold text-center"
+                    ).style(
+                        f"color: var(--cr-neon-primary); width: {INPUT_BOX_WIDTH}px; flex-shrink: 0"
+                    )
+
+                # Data rows
+                for i in range(size):
+                    with ui.row().classes("items-center gap-2 mb-2"):
+                        self.viewport_row_labels.append(
+                            ui.label("").classes("text-sm font-mono").style(label_style)
+                        )
+                        row_inputs = []
+                        for j in range(size):
+                            inp = self.render_coefficient_input(i, j)
+                            inp.on_value_change(
+                                lambda e, i=i, j=j: self.on_viewport_change(i, j, e.value)
+                            )
+                            row_inputs.append(inp)
+                        self.viewport_inputs.append(row_inputs)
+
+                        ui.label("=").classes(
+                            "text-base md:text-lg font-bold text-center"
+                        ).style(
+                            "color: var(--cr-neon-primary); width: 40px; flex-shrink: 0"
+                        )
+
+                        b_inp = self.render_constant_input(i)
+                        b_inp.on_value_change(
+                            lambda e, i=i: self.on_viewport_change(i, None, e.value)
+                        )
+                        self.viewport_b_inputs.append(b_inp)
+
+        self.refresh_viewport()
+
+    def refresh_viewport(self):
+        """Show the model values for the current window in the existing viewport boxes"""
+        model = self.model
+        r0, c0 = self.view_row, self.view_col
+        self.filling = True
+        try:
+            for j, label in enumerate(self.viewport_header_labels):
+                label.set_text(f"x{c0 + j + 1}")
+            self.viewport_b_label.set_text(self.rhs_header(self.view_rhs))
+            for i, row_inputs in enumerate(self.viewport_inputs):
+                self.viewport_row_labels[i].set_text(f"#{r0 + i + 1}")
+                for j, inp in enumerate(row_inputs):
+                    inp.props["placeholder"] = f"a{r0 + i + 1},{c0 + j + 1}"
+                    inp.value = model.get(r0 + i, c0 + j)
+                    inp.update()
+                b_inp = self.viewport_b_inputs[i]
+                b_inp.props["placeholder"] = self.constant_name(r0 + i, self.view_rhs)
+                b_inp.value = model.get(r0 + i, model.n + self.view_rhs)
+                b_inp.update()
+        finally:
+            self.filling = False
+
+    def scroll_viewport(self):
+        """Move the window to the first row / column entered by the user"""
+        self.touch()
+        limit = self.n - len(self.viewport_inputs)
+        self.view_row = min(max(int(self.view_row_input.value or 1) - 1, 0), limit)
+        self.view_col = min(max(int(self.view_col_input.value or 1) - 1, 0), limit)
+        if self.view_rhs_input is not None:
+            self.view_rhs = min(max(int(self.view_rhs_input.value or 1) - 1, 0), self.k - 1)
+        self.refresh_viewport()
+
+    def on_viewport_change(self, i, j, value):
+        """Write an edited viewport box back to the model (j is None for the constant)"""
+        if self.filling:
+            return
+        self.touch()
+        col = self.model.n + self.view_rhs if j is None else self.view_col + j
+        self.model.set(self.view_row + i, col, value)
+
+
+class SessionRegistry:
+    """Per-client solver sessions with idle eviction and caps on retained solutions"""
+
+    def __init__(self, idle_timeout, max_retained_solutions, max_retained_bytes):
+        self.idle_timeout = idle_timeout
+        self.max_retained_solutions = max_retained_solutions
+        self.max_retained_bytes = max_retained_bytes
+        self.sessions = {}  # client id -> CramersRuleSolver
+        self.retained = OrderedDict()  # client id -> bytes of its last solution, oldest first
+        self.retained_bytes = 0
+
+    def add(self, client, solver):
+        self.sessions[client.id] = solver
+        client.on_delete(lambda: self.remove(client.id))
+
+    def remove(self, client_id):
+        solver = self.sessions.pop(client_id, None)
+        self.release_solution(client_id)
+        if solver is not None:
+            solver.cancel_solves()
+            solver.last_solution_data = None
+
+    def release_solution(self, client_id):
+        self.retained_bytes -= self.retained.pop(client_id, 0)
+
+    def retain_solution(self, client_id, nbytes):
+        """Record that a session holds a solution and drop the oldest ones over the caps.
+
+        The newest solution is always kept, so the page showing it can redraw it.
+        """
+        self.retained_bytes += nbytes - self.retained.pop(client_id, 0)
+        self.retained[client_id] = nbytes
+        while len(self.retained) > 1 and (
+            len(self.retained) > self.max_retained_solutions
+            or self.retained_bytes > self.max_retained_bytes
+        ):
+            oldest, size = self.retained.popitem(last=False)
+            self.retained_bytes -= size
+            solver = self.sessions.get(oldest)
+            if solver is not None:
+                solver.drop_solution()
+
+    def evict_idle(self):
+        """Delete sessions that have not been used for longer than the idle timeout"""
+        now = time.monotonic()
+        for client_id, solver in list(self.sessions.items()):
+            if now - solver.last_active > self.idle_timeout:
+                self.remove(client_id)
+                client = Client.instances.get(client_id)
+                if client is not None:
+                    client.delete()
+
+
+sessions = SessionRegistry(SESSION_IDLE_TIMEOUT, MAX_RETAINED_SOLUTIONS, MAX_RETAINED_BYTES)
+solve_workers = SolveWorkers(SOLVE_EXECUTOR, SOLVE_WORKERS)
+# Rank-1 updates need the session's IncrementalSolver, so they run on threads of this process
+update_workers = SolveWorkers("thread", SOLVE_WORKERS)
+solution_cache = SolutionCache(SOLUTION_CACHE_SIZE, SOLUTION_CACHE_BYTES)
+solve_history = SolveHistory(HISTORY_PATH, HISTORY_MAX_ENTRIES) if HISTORY_PATH else None
+# One thread makes every history call: the SQLite work stays off the event loop
+# and the connection is never used by two threads at once
+history_workers = SolveWorkers("thread", 1)
+metrics = Metrics(SLOW_SOLVE_SECONDS)
+metrics.add_reading(
+    "cramer_cache_events_total",
+    "Solution cache hits, misses and evictions",
+    lambda: {k: v for k, v in solution_cache.stats().items() if k in ("hits", "misses", "evictions")},
+    label="event",
+    kind="counter",
+)
+metrics.add_reading("cramer_cache_entries", "Solutions held in the cache", lambda: len(solution_cache.entries))
+metrics.add_reading("cramer_cache_bytes", "Array bytes of the solutions held in the cache", lambda: solution_cache.nbytes)
+metrics.add_reading(
+    "cramer_retained_solution_bytes",
+    "Array bytes of the last solutions kept by page sessions",
+    lambda: sessions.retained_bytes,
+)
+metrics.add_reading("cramer_sessions", "Connected page sessions", lambda: len(sessions.sessions))
+metrics.add_reading(
+    "cramer_page_solves_in_flight",
+    "Offloaded page solves still running",
+    lambda: sum(len(solver.pending_solves) for solver in sessions.sessions.values()),
+)
+solve_api = SolveAPI(
+    solve_workers,
+    solution_cache,
+    metrics,
+    max_n=MAX_LARGE_N,
+    max_exact_n=MAX_GRID_N if EXACT_INTEGER_MODE else 0,
+    offload_min_n=OFFLOAD_MIN_N,
+    max_batch_size=API_MAX_BATCH_SIZE,
+    max_coefficients=API_MAX_BATCH_COEFFICIENTS,
+    chunk_size=API_BATCH_CHUNK,
+    max_concurrent=API_MAX_CONCURRENT_SOLVES,
+)
+app.include_router(solve_api.router)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_page():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@ui.page("/")
+def index():
+    client = ui.context.client
+    solver = CramersRuleSolver(client.id, app.storage.browser["id"])
+    solver.build_page()
+    sessions.add(client, solver)
+
+
+app.timer(60, sessions.evict_idle)
+app.on_shutdown(solve_workers.shutdown)
+app.on_shutdown(update_workers.shutdown)
+if solve_history is not None:
+    app.on_shutdown(history_workers.shutdown)
+    app.on_shutdown(solve_history.close)
+
+
+def run():
+    ui.run(title="Cramer's Rule Solver", port=8000, storage_secret=STORAGE_SECRET)
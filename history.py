@@ -0,0 +1,204 @@
+"""Solve history kept in a local SQLite database.
+
+Every solve is a row of the solves table (when, how long) pointing at a row
+of the systems table, which holds each distinct system once: A, B and the
+result arrays as raw float64 blobs, det(A) as value, sign and log, the
+condition estimate, the phase timings and, for exact solves, the exact
+integers and fractions as JSON text. Systems are indexed on the content
+hash of (A, B, mode) that SolutionCache uses, so a system solved before,
+even in an earlier run of the app, is found without solving it again.
+"""
+import json
+import sqlite3
+import time
+from fractions import Fraction
+
+import numpy as np
+
+from cramer_engine import SolutionCache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS systems (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    mode TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    k INTEGER NOT NULL,
+    A BLOB NOT NULL,
+    B BLOB NOT NULL,
+    det_Ai BLOB NOT NULL,
+    solutions BLOB NOT NULL,
+    verification BLOB NOT NULL,
+    det_A REAL,
+    det_sign REAL NOT NULL,
+    log_abs_det REAL NOT NULL,
+    cond REAL NOT NULL,
+    exact TEXT,
+    timings TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS solves (
+    id INTEGER PRIMARY KEY,
+    system_id INTEGER NOT NULL REFERENCES systems (id),
+    created REAL NOT NULL,
+    seconds REAL NOT NULL,
+    owner TEXT
+);
+CREATE INDEX IF NOT EXISTS solves_system ON solves (system_id);
+"""
+
+
+def to_blob(values):
+    return np.ascontiguousarray(values, dtype="<f8").tobytes()
+
+
+def from_blob(blob, shape):
+    return np.frombuffer(blob, dtype="<f8").reshape(shape).copy()
+
+
+def exact_to_json(exact):
+    """Exact integers and fractions (or lists of them, one per B column) as JSON text"""
+    def text(value):
+        return [str(v) for v in value] if isinstance(value, list) else str(value)
+
+    return json.dumps({
+        "det_A": str(exact["det_A"]),
+        "det_Ai_list": [text(d) for d in exact["det_Ai_list"]],
+        "solutions": [text(x) for x in exact["solutions"]],
+    })
+
+
+def exact_from_json(text):
+    def parse(value, kind):
+        return [kind(v) for v in value] if isinstance(value, list) else kind(value)
+
+    exact = json.loads(text)
+    return {
+        "det_A": int(exact["det_A"]),
+        "det_Ai_list": [parse(d, int) for d in exact["det_Ai_list"]],
+        "solutions": [parse(x, Fraction) for x in exact["solutions"]],
+    }
+
+
+def owner_filter(owner):
+    """WHERE clause and parameters listing the solves of one owner, or of everyone for None"""
+    return ("WHERE solves.owner = ?", (owner,)) if owner is not None else ("", ())
+
+
+class SolveHistory:
+    """Every solve of the app, newest first, with the solved systems stored once.
+
+    With max_entries, the oldest solves beyond it are deleted together with
+    systems that no remaining solve refers to. Each solve can name an owner
+    (the app uses the browser); page, count and load then show only
+    that owner's solves, while find looks up any stored system.
+
+    The connection is not meant for concurrent use: the app makes all its
+    calls from one thread.
+    """
+
+    def __init__(self, path, max_entries=None):
+        self.max_entries = max_entries
+        # The app calls it from its one history thread and closes it from a shutdown hook on the event loop
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(SCHEMA)
+        if "owner" not in [row[1] for row in self.db.execute("PRAGMA table_info(solves)")]:
+            # Files written before solves had an owner; their solves belong to nobody
+            self.db.execute("ALTER TABLE solves ADD COLUMN owner TEXT")
+        self.db.execute("CREATE INDEX IF NOT EXISTS solves_owner ON solves (owner, id)")
+
+    def find(self, A, B, mode):
+        """The stored solution dict of a system, or None if it was never solved"""
+        row = self.db.execute(
+            "SELECT * FROM systems WHERE key = ?", (SolutionCache.key(A, B, mode),)
+        ).fetchone()
+        return None if row is None else self.solution(row)
+
+    def record(self, data, mode, seconds, owner=None):
+        """Store one solve of the system in a solution dict; returns the solve id"""
+        A, B = data["A"], data["B"]
+        n = len(B)
+        k = 1 if np.ndim(B) == 1 else B.shape[1]
+        with self.db:
+            self.db.execute(
+                "INSERT OR IGNORE INTO systems (key, mode, n, k, A, B, det_Ai, solutions, verification, "
+                "det_A, det_sign, log_abs_det, cond, exact, timings) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    SolutionCache.key(A, B, mode), mode, n, k,
+                    to_blob(A), to_blob(B), to_blob(data["det_Ai_list"]),
+                    to_blob(data["solutions"]), to_blob(data["verification"]),
+                    data["det_A"], data["det_sign"], data["log_abs_det"], data["cond"],
+                    exact_to_json(data["exact"]) if "exact" in data else None,
+                    json.dumps(data.get("timings", {})),
+                ),
+            )
+            (system_id,) = self.db.execute(
+                "SELECT id FROM systems WHERE key = ?", (SolutionCache.key(A, B, mode),)
+            ).fetchone()
+            cursor = self.db.execute(
+                "INSERT INTO solves (system_id, created, seconds, owner) VALUES (?, ?, ?, ?)",
+                (system_id, time.time(), seconds, owner),
+            )
+            if self.max_entries is not None:
+                self.prune(cursor.lastrowid - self.max_entries)
+        return cursor.lastrowid
+
+    def prune(self, last_id):
+        """Delete solves up to last_id and the systems left without a solve"""
+        self.db.execute("DELETE FROM solves WHERE id <= ?", (last_id,))
+        self.db.execute(
+            "DELETE FROM systems WHERE id NOT IN (SELECT DISTINCT system_id FROM solves)"
+        )
+
+    def count(self, owner=None):
+        where, parameters = owner_filter(owner)
+        return self.db.execute(f"SELECT COUNT(*) FROM solves {where}", parameters).fetchone()[0]
+
+    def page(self, offset, limit, owner=None):
+        """Summaries of limit solves, newest first, skipping the offset newest; no arrays are read"""
+        where, parameters = owner_filter(owner)
+        rows = self.db.execute(
+            "SELECT solves.id, solves.created, solves.seconds, systems.mode, systems.n, systems.k, "
+            "systems.det_sign, systems.log_abs_det, systems.cond "
+            f"FROM solves JOIN systems ON systems.id = solves.system_id {where} "
+            "ORDER BY solves.id DESC LIMIT ? OFFSET ?",
+            (*parameters, limit, offset),
+        ).fetchall()
+        names = ("id", "created", "seconds", "mode", "n", "k", "det_sign", "log_abs_det", "cond")
+        return [dict(zip(names, row)) for row in rows]
+
+    def load(self, solve_id, owner=None):
+        """The solution dict of a past solve, or None if it is no longer stored (or not the owner's)"""
+        where, parameters = owner_filter(owner)
+        row = self.db.execute(
+            "SELECT systems.* FROM solves JOIN systems ON systems.id = solves.system_id "
+            f"{where} {'AND' if where else 'WHERE'} solves.id = ?",
+            (*parameters, solve_id),
+        ).fetchone()
+        return None if row is None else self.solution(row)
+
+    def solution(self, row):
+        """Solution dict of a systems row"""
+        (_, _, _, n, k, A, B, det_Ai, solutions, verification,
+         det_A, det_sign, log_abs_det, cond, exact, timings) = row
+        shape = (n,) if k == 1 else (n, k)
+        data = {
+            "A": from_blob(A, (n, n)),
+            "B": from_blob(B, shape),
+            "det_A": det_A if det_A is not None else det_sign * np.exp(log_abs_det),
+            "det_Ai_list": from_blob(det_Ai, shape),
+            "solutions": from_blob(solutions, shape),
+            "verification": from_blob(verification, shape),
+            "det_sign": det_sign,
+            "log_abs_det": log_abs_det,
+            "cond": cond,
+            "timings": json.loads(timings),
+        }
+        if exact is not None:
+            data["exact"] = exact_from_json(exact)
+        return data
+
+    def close(self):
+        self.db.close()
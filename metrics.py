@@ -0,0 +1,169 @@
+"""Solve counters and per-phase timings in the Prometheus text format.
+
+Only plain Python is used, so recording a phase costs two perf_counter calls
+and a few dict updates. The running app serves render() on /metrics.
+"""
+import json
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Histogram buckets: system size N and phase durations in seconds
+SIZE_BUCKETS = (2, 3, 4, 6, 8, 12, 18, 32, 64, 128, 256, 512, 1000)
+SECONDS_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+
+slow_log = logging.getLogger("cramer.slow_solve")
+
+
+class Histogram:
+    """Cumulative-bucket histogram as Prometheus expects it"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels=""):
+        sep = "," if labels else ""
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}'
+        braces = f"{{{labels}}}" if labels else ""
+        yield f"{name}_sum{braces} {self.sum:.9g}"
+        yield f"{name}_count{braces} {self.count}"
+
+
+class PhaseTimer:
+    """Durations of the phases of one solve, in seconds"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_timings(self, timings):
+        """Add the engine's own phase timings from a solution dict"""
+        for name, seconds in timings.items():
+            self.add(name, seconds)
+
+    def total(self):
+        return time.perf_counter() - self.start
+
+
+class Metrics:
+    """Counters, the N distribution and phase histograms for all solves.
+
+    Readings are taken when /metrics is scraped: add_reading(name, description,
+    read) takes a function returning a number or a {label value: number} dict.
+    Solves slower than slow_solve_seconds are logged with their phase
+    breakdown (None disables the log).
+    """
+
+    def __init__(self, slow_solve_seconds=None):
+        self.slow_solve_seconds = slow_solve_seconds
+        self.solves = {}  # (source, mode) -> count
+        self.singular = {}  # source -> count
+        self.errors = {}  # kind -> count
+        self.sizes = Histogram(SIZE_BUCKETS)
+        self.phases = {}  # phase -> Histogram
+        self.readings = []  # (name, description, kind, label, read)
+
+    def add_reading(self, name, description, read, label=None, kind="gauge"):
+        self.readings.append((name, description, kind, label, read))
+
+    def observe_phase(self, phase, seconds):
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = Histogram(SECONDS_BUCKETS)
+        histogram.observe(seconds)
+
+    def count_solve(self, n, mode, source="page"):
+        key = (source, mode)
+        self.solves[key] = self.solves.get(key, 0) + 1
+        self.sizes.observe(n)
+
+    def count_singular(self, source="page"):
+        self.singular[source] = self.singular.get(source, 0) + 1
+
+    def count_error(self, kind):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def record_solve(self, timer, n, mode, source="page"):
+        """Count a finished solve, observe its phases and log it when slow"""
+        self.count_solve(n, mode, source)
+        total = timer.total()
+        for phase, seconds in timer.phases.items():
+            self.observe_phase(phase, seconds)
+        self.observe_phase("total", total)
+        if self.slow_solve_seconds is not None and total >= self.slow_solve_seconds:
+            slow_log.warning(
+                "slow solve %s",
+                json.dumps(
+                    {
+                        "n": n,
+                        "mode": mode,
+                        "source": source,
+                        "total_s": round(total, 6),
+                        "phases_s": {k: round(v, 6) for k, v in timer.phases.items()},
+                    }
+                ),
+            )
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def header(name, description, kind):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        header("cramer_solves_total", "Finished solves by source and mode", "counter")
+        for (source, mode), count in sorted(self.solves.items()):
+            lines.append(f'cramer_solves_total{{source="{source}",mode="{mode}"}} {count}')
+
+        header("cramer_singular_total", "Systems rejected as having no unique solution", "counter")
+        for source, count in sorted(self.singular.items()):
+            lines.append(f'cramer_singular_total{{source="{source}"}} {count}')
+
+        header("cramer_errors_total", "Failed solves by kind", "counter")
+        for kind, count in sorted(self.errors.items()):
+            lines.append(f'cramer_errors_total{{kind="{kind}"}} {count}')
+
+        header("cramer_system_size", "Number of variables N of solved systems", "histogram")
+        lines.extend(self.sizes.lines("cramer_system_size"))
+
+        header("cramer_phase_seconds", "Time spent per solve and render phase", "histogram")
+        for phase, histogram in sorted(self.phases.items()):
+            lines.extend(histogram.lines("cramer_phase_seconds", f'phase="{phase}"'))
+
+        for name, description, kind, label, read in self.readings:
+            header(name, description, kind)
+            value = read()
+            if isinstance(value, dict):
+                for key, number in value.items():
+                    lines.append(f'{name}{{{label}="{key}"}} {number}')
+            else:
+                lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
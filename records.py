@@ -0,0 +1,101 @@
+"""JSON records of solutions for the HTTP API.
+
+solve_chunk runs in the solve workers, so this module stays free of FastAPI
+and pydantic: a worker process only imports it and the engine.
+"""
+import numpy as np
+
+from cramer_engine import exact_cramer_solve, is_whole_number_system, solve_batch
+
+
+def finite_list(values):
+    """Floats for JSON; inf and NaN (not valid JSON) become null"""
+    return [float(v) if np.isfinite(v) else None for v in np.ravel(values)]
+
+
+def solution_json(data, with_system=True):
+    """JSON-friendly copy of a solution dict, with exact values as strings; with_system=False leaves out A and B"""
+    record = {"n": len(data["B"])}
+    if with_system:
+        record["A"] = np.asarray(data["A"]).tolist()
+        record["B"] = np.asarray(data["B"]).tolist()
+    record.update({
+        "det_A": finite_list([data["det_A"]])[0],
+        "det_Ai_list": finite_list(data["det_Ai_list"]),
+        "solutions": finite_list(data["solutions"]),
+        "verification": finite_list(data["verification"]),
+        "det_sign": float(data["det_sign"]),
+        "log_abs_det": finite_list([data["log_abs_det"]])[0],
+        "cond": finite_list([data["cond"]])[0],
+    })
+    if "exact" in data:
+        exact = data["exact"]
+        # Exact integers and fractions overflow JSON numbers, so they are sent as text
+        record["exact"] = {
+            "det_A": str(exact["det_A"]),
+            "det_Ai_list": [str(d) for d in exact["det_Ai_list"]],
+            "solutions": [str(x) for x in exact["solutions"]],
+        }
+    return record
+
+
+def ill_conditioned_error(cond, max_cond):
+    return {"error": f"System is too ill-conditioned (cond(A) ≈ {cond:.1e} > {max_cond:.1e})"}
+
+
+def solve_chunk(systems, max_exact_n, max_cond=None, precision="double"):
+    """Solve a list of (A, B, exact) systems in a worker.
+
+    Whole-number systems small enough for exact mode are solved one by one;
+    the rest are grouped by size and solved with one stacked solve_batch call
+    per group, in the requested precision. Returns one record (or {"error": ...}) per system, in order.
+    """
+    records = [None] * len(systems)
+    groups = {}
+    for index, (A, B, exact) in enumerate(systems):
+        if exact and len(B) <= max_exact_n and is_whole_number_system(A, B):
+            try:
+                data = exact_cramer_solve(A, B)
+            except np.linalg.LinAlgError as e:
+                records[index] = {"error": str(e)}
+                continue
+            if max_cond is not None and data["cond"] > max_cond:
+                records[index] = ill_conditioned_error(data["cond"], max_cond)
+            else:
+                records[index] = solution_json(data, with_system=False)
+        else:
+            groups.setdefault(len(B), []).append(index)
+
+    for indices in groups.values():
+        A = np.stack([systems[i][0] for i in indices])
+        B = np.stack([systems[i][1] for i in indices])
+        result = solve_batch(A, B, max_cond, precision)
+        for k, index in enumerate(indices):
+            if result["singular"][k]:
+                records[index] = {
+                    "error": "System has no unique solution "
+                    f"(A is singular to working precision, cond(A) ≈ {result['cond'][k]:.1e})"
+                }
+                continue
+            if result["ill_conditioned"][k]:
+                records[index] = ill_conditioned_error(result["cond"][k], max_cond)
+                continue
+            record = solution_json(
+                {
+                    "A": A[k],
+                    "B": B[k],
+                    "det_A": result["det_A"][k],
+                    "det_Ai_list": result["det_Ai"][k],
+                    "solutions": result["solutions"][k],
+                    "verification": B[k] + result["residuals"][k],
+                    "det_sign": result["det_sign"][k],
+                    "log_abs_det": result["log_abs_det"][k],
+                    "cond": result["cond"][k],
+                },
+                with_system=False,
+            )
+            if precision == "mixed":
+                record["refinement_steps"] = int(result["refinement_steps"][k])
+                record["fallback"] = bool(result["fallback"][k])
+            records[index] = record
+    return records
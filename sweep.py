@@ -0,0 +1,180 @@
+"""Parametric sweeps: systems whose coefficients are expressions in t.
+
+Each coefficient of [A | B] is an expression such as "2*t - 1" or
+"cos(pi*t)", parsed once into a syntax tree and evaluated with NumPy over
+all values of t at once. The sweep stacks the systems into a (count, n, n)
+array and solves them with one call to solve_batch, so det(A)(t) and the
+x_i(t) curves cost a handful of array operations rather than a loop.
+
+Expressions may use numbers, t, pi, e, + - * / ** and the functions in
+FUNCTIONS; anything else (names, attributes, calls of other functions) is
+rejected before it is evaluated.
+"""
+import ast
+
+import numpy as np
+
+from cramer_engine import solve_batch
+
+FUNCTIONS = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "exp": np.exp,
+    "log": np.log,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+}
+CONSTANTS = {"pi": np.pi, "e": np.e}
+BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+    ast.Pow: np.power,
+}
+UNARY_OPERATORS = {ast.UAdd: np.positive, ast.USub: np.negative}
+
+
+def parse_expression(text):
+    """Syntax tree of one coefficient expression; ValueError if it uses anything not allowed"""
+    try:
+        tree = ast.parse(text.strip(), mode="eval").body
+    except SyntaxError:
+        raise ValueError(f"Could not read the expression {text!r}") from None
+    # Function names are allowed only as the callee of a call
+    callees = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant):
+            allowed = type(node.value) in (int, float)
+        elif isinstance(node, ast.Name):
+            allowed = node.id == "t" or node.id in CONSTANTS or id(node) in callees
+        elif isinstance(node, ast.Call):
+            allowed = (
+                isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS
+                and len(node.args) == 1 and not node.keywords
+            )
+        elif isinstance(node, ast.BinOp):
+            allowed = type(node.op) in BINARY_OPERATORS
+        elif isinstance(node, ast.UnaryOp):
+            allowed = type(node.op) in UNARY_OPERATORS
+        else:
+            allowed = isinstance(node, (ast.Load, ast.operator, ast.unaryop))
+        if not allowed:
+            raise ValueError(f"Unsupported expression {text!r}")
+    return tree
+
+
+def evaluate(node, t):
+    """Value of a parsed expression for an array of t values (a float if it does not use t)"""
+    if isinstance(node, ast.Constant):
+        return float(node.value)
+    if isinstance(node, ast.Name):
+        if node.id == "t":
+            return t
+        if node.id in CONSTANTS:
+            return CONSTANTS[node.id]
+    elif isinstance(node, ast.BinOp):
+        return BINARY_OPERATORS[type(node.op)](evaluate(node.left, t), evaluate(node.right, t))
+    elif isinstance(node, ast.UnaryOp):
+        return UNARY_OPERATORS[type(node.op)](evaluate(node.operand, t))
+    elif isinstance(node, ast.Call):
+        return FUNCTIONS[node.func.id](evaluate(node.args[0], t))
+    raise ValueError(f"Unsupported expression {ast.unparse(node)!r}")
+
+
+def parse_sweep_text(text):
+    """Parse the rows of [A | B] with expression entries into a list of rows of syntax trees.
+
+    Entries are separated by commas, semicolons or tabs; a line with none of
+    them is split on spaces, so "2*t 1 5" works but "2 * t" needs commas.
+    """
+    rows = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if any(separator in line for separator in ",;\t"):
+            entries = line.replace(";", ",").replace("\t", ",").split(",")
+        else:
+            entries = line.split()
+        rows.append([parse_expression(entry) for entry in entries])
+    if not rows:
+        raise ValueError("There are no coefficients to sweep")
+    n = len(rows)
+    if any(len(row) != n + 1 for row in rows):
+        raise ValueError(f"Expected {n} rows of {n + 1} entries [A | b], one equation per line")
+    return rows
+
+
+def build_stack(rows, t):
+    """Augmented matrices [A(t) | b(t)] of shape (len(t), n, n + 1), one expression evaluation per entry"""
+    n = len(rows)
+    M = np.empty((len(t), n, n + 1))
+    with np.errstate(all="ignore"):
+        for i, row in enumerate(rows):
+            for j, node in enumerate(row):
+                M[:, i, j] = evaluate(node, t)
+    return M
+
+
+def sweep(rows, t, max_cond=None):
+    """Solve the system of parsed rows at every value of t in one batch.
+
+    Returns solve_batch's arrays for the stack plus "t", "undefined" (an
+    entry is not finite there, e.g. 1/t at t = 0; all results are NaN) and
+    "det_roots" (see det_roots).
+    """
+    t = np.asarray(t, dtype=float)
+    M = build_stack(rows, t)
+    n = len(rows)
+    undefined = ~np.isfinite(M).all(axis=(1, 2))
+    # Stand-in systems keep the factorization clear of NaN and inf
+    M[undefined] = np.column_stack([np.eye(n), np.zeros(n)])
+    result = solve_batch(M[:, :, :n], M[:, :, n], max_cond=max_cond)
+    for name in ("det_A", "det_Ai", "log_abs_det", "cond", "solutions", "residuals"):
+        result[name][undefined] = np.nan
+    result["det_sign"][undefined] = 0
+    result["singular"] &= ~undefined
+    result["t"] = t
+    result["undefined"] = undefined
+    result["det_roots"] = det_roots(t, result["det_A"], result["det_sign"], undefined)
+    return result
+
+
+def det_roots(t, det_A, det_sign, undefined):
+    """Sorted t values where det(A) is zero: samples with det(A) == 0 exactly and,
+    linearly interpolated, the places where it changes sign between neighbouring samples.
+
+    A sign change across a pole of an entry that no sample hits also shows up here.
+    """
+    exact = t[(det_sign == 0) & ~undefined]
+    i = np.flatnonzero(det_sign[:-1] * det_sign[1:] < 0)
+    d0, d1 = det_A[i], det_A[i + 1]
+    with np.errstate(all="ignore"):
+        fraction = np.where(np.isfinite(d0 - d1), d0 / (d0 - d1), 0.5)
+    return np.sort(np.concatenate([exact, t[i] + fraction * (t[i + 1] - t[i])]))
+
+
+def plot_indices(y, max_points):
+    """Indices of at most about max_points samples of y that keep the lowest and highest value of each stretch.
+
+    Spikes near singular t survive the thinning, and stretches where y is
+    NaN keep one NaN sample so the curve still shows the gap.
+    """
+    count = len(y)
+    if count <= max_points:
+        return np.arange(count)
+    size = -(-count // max(1, max_points // 2))
+    blocks = np.full(-(-count // size) * size, np.nan)
+    blocks[:count] = y
+    blocks = blocks.reshape(-1, size)
+    finite = np.isfinite(blocks)
+    low = np.where(finite, blocks, np.inf).argmin(axis=1)
+    high = np.where(finite, blocks, -np.inf).argmax(axis=1)
+    starts = np.arange(len(blocks)) * size
+    indices = np.unique(np.concatenate([starts + low, starts + high]))
+    return indices[indices < count]
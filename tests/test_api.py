@@ -0,0 +1,111 @@
+"""The HTTP API, served by a bare FastAPI app with inline workers"""
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import SolveAPI
+from cramer_engine import SolutionCache
+from metrics import Metrics
+from workers import SolveWorkers
+
+
+@pytest.fixture
+def client():
+    solve_api = SolveAPI(
+        SolveWorkers("inline", 1),
+        SolutionCache(8),
+        Metrics(None),
+        max_n=50,
+        max_exact_n=18,
+        offload_min_n=48,
+        max_batch_size=4,
+        max_coefficients=200,
+        chunk_size=2,
+        max_concurrent=1,
+    )
+    app = FastAPI()
+    app.include_router(solve_api.router)
+    return TestClient(app)
+
+
+def batch_lines(response):
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_solve(client):
+    record = client.post("/api/solve", json={"A": [[2, 1], [1, 3]], "B": [5, 10]}).json()
+    assert record["A"] == [[2, 1], [1, 3]] and record["B"] == [5, 10]
+    assert record["solutions"] == [1.0, 3.0]
+    assert record["exact"] == {"det_A": "5", "det_Ai_list": ["5", "15"], "solutions": ["1", "3"]}
+
+
+def test_solve_singular(client):
+    response = client.post("/api/solve", json={"A": [[1, 2], [2, 4]], "B": [1, 2]})
+    assert response.status_code == 422
+    assert "no unique solution" in response.json()["detail"]
+
+
+def test_batch_streams_one_line_per_system_in_order(client):
+    systems = [
+        {"A": [[2, 1], [1, 3]], "B": [5, 10]},
+        {"A": [[1, 2], [2, 4]], "B": [1, 2]},
+        {"A": [[1.5, 0], [0, 2]], "B": [3, 1], "exact": False},
+    ]
+    lines = batch_lines(client.post("/api/solve/batch", json={"systems": systems}))
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert lines[0]["solutions"] == [1.0, 3.0] and "exact" in lines[0]
+    assert "error" in lines[1]
+    assert lines[2]["solutions"] == [2.0, 0.5]
+    # Lines point back to their system by index instead of echoing it
+    assert not any("A" in line or "B" in line for line in lines)
+
+
+def test_batch_mixed_precision(client):
+    systems = [{"A": [[4.5, 1], [1, 3]], "B": [1, 2]}]
+    (line,) = batch_lines(
+        client.post("/api/solve/batch", json={"systems": systems, "precision": "mixed"})
+    )
+    assert line["fallback"] is False and line["refinement_steps"] >= 0
+
+
+def test_batch_max_cond(client):
+    systems = [{"A": [[1, 1], [1, 1.000000001]], "B": [1, 2]}]
+    (line,) = batch_lines(client.post("/api/solve/batch", json={"systems": systems, "max_cond": 1e3}))
+    assert "ill-conditioned" in line["error"]
+
+
+@pytest.mark.parametrize(
+    "body, detail",
+    [
+        ({"systems": [{"A": [[1, 0], [0, 1]], "B": [1, 1]}] * 5}, "systems per batch"),
+        ({"systems": [{"A": [[1] * 10] * 10, "B": [1] * 10}] * 2}, "coefficients per batch"),
+    ],
+)
+def test_batch_limits(client, body, detail):
+    response = client.post("/api/solve/batch", json=body)
+    assert response.status_code == 413
+    assert detail in response.json()["detail"]
+
+
+def test_batch_body_size_limit(client):
+    response = client.post(
+        "/api/solve/batch", content=b" " * 10000, headers={"content-type": "application/json"}
+    )
+    assert response.status_code == 413
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"systems": [{"A": [[1, 2, 3], [1, 2]], "B": [1, 2]}]},
+        {"systems": [{"A": [[1, "x"], [1, 2]], "B": [1, 2]}]},
+        {"systems": [{"A": [[1]], "B": [1]}]},
+        {"systems": [], "precision": "half"},
+    ],
+)
+def test_batch_validation_errors(client, body):
+    assert client.post("/api/solve/batch", json=body).status_code == 422
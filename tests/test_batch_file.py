@@ -0,0 +1,90 @@
+"""Chunked file solving of batch.py"""
+import numpy as np
+import pytest
+
+from batch import solve_file
+from cramer_engine import solve_batch
+
+
+@pytest.fixture
+def systems():
+    rng = np.random.default_rng(0)
+    A = rng.uniform(-1, 1, (25, 4, 4)) + 4 * np.eye(4)
+    B = rng.uniform(-1, 1, (25, 4))
+    A[7] = [[1, 2, 3, 4]] * 4  # singular
+    return A, B
+
+
+def write_input(path, A, B):
+    M = np.concatenate([A, B[..., None]], axis=2)
+    if path.suffix == ".npy":
+        np.save(path, M)
+    elif path.suffix == ".npz":
+        np.savez_compressed(path, A=A, B=B)
+    else:
+        np.savetxt(path, M.reshape(len(M), -1), delimiter="," if path.suffix == ".csv" else " ", fmt="%.17g")
+
+
+def read_output(path):
+    if path.suffix == ".npy":
+        records = np.load(path)
+        return {name: records[name] for name in records.dtype.names}
+    if path.suffix == ".npz":
+        with np.load(path) as archive:
+            return {name: archive[name] for name in archive.files}
+    table = np.loadtxt(path, delimiter=",", skiprows=1)
+    header = path.read_text().splitlines()[0].split(",")
+    return {
+        "det_A": table[:, header.index("det_A")],
+        "singular": table[:, header.index("singular")].astype(bool),
+        "solutions": table[:, [header.index(f"solutions_{i + 1}") for i in range(4)]],
+    }
+
+
+@pytest.mark.parametrize("source", [".npy", ".npz", ".csv", ".txt"])
+@pytest.mark.parametrize("output", [".npy", ".npz", ".csv"])
+def test_solve_file_matches_solve_batch(tmp_path, systems, source, output):
+    A, B = systems
+    source_path = tmp_path / f"systems{source}"
+    output_path = tmp_path / f"results{output}"
+    write_input(source_path, A, B)
+    count, singular, ill_conditioned = solve_file(source_path, output_path, chunk_size=4)
+    assert (count, singular, ill_conditioned) == (25, 1, 0)
+
+    expected = solve_batch(A, B)
+    results = read_output(output_path)
+    assert np.array_equal(results["singular"], expected["singular"])
+    assert np.allclose(results["det_A"], expected["det_A"])
+    assert np.allclose(results["solutions"], expected["solutions"], equal_nan=True)
+
+
+def test_solve_file_on_a_process_pool(tmp_path, systems):
+    A, B = systems
+    write_input(tmp_path / "systems.npz", A, B)
+    count, singular, _ = solve_file(tmp_path / "systems.npz", tmp_path / "results.npz", chunk_size=5, workers=2)
+    assert (count, singular) == (25, 1)
+    with np.load(tmp_path / "results.npz") as results:
+        assert np.allclose(results["solutions"], solve_batch(A, B)["solutions"], equal_nan=True)
+
+
+def test_solve_file_mixed_precision_and_max_cond(tmp_path, systems):
+    A, B = systems
+    A[3] = [[1, 1, 0, 0], [1, 1 + 1e-9, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
+    write_input(tmp_path / "systems.npy", A, B)
+    count, singular, ill_conditioned = solve_file(
+        tmp_path / "systems.npy", tmp_path / "results.npz", max_cond=1e6, precision="mixed"
+    )
+    assert (count, singular, ill_conditioned) == (25, 1, 1)
+    with np.load(tmp_path / "results.npz") as results:
+        assert {"refinement_steps", "fallback"} <= set(results.files)
+
+
+def test_solve_file_rejects_bad_files(tmp_path):
+    with pytest.raises(ValueError):
+        solve_file(tmp_path / "systems.npy", tmp_path / "results.json")
+    np.save(tmp_path / "bad.npy", np.zeros((3, 4, 4)))
+    with pytest.raises(ValueError, match="n \\+ 1"):
+        solve_file(tmp_path / "bad.npy", tmp_path / "results.npy")
+    (tmp_path / "bad.csv").write_text("1,2,3,4,5\n")
+    with pytest.raises(ValueError, match="n \\* \\(n \\+ 1\\)"):
+        solve_file(tmp_path / "bad.csv", tmp_path / "results.csv")
@@ -0,0 +1,61 @@
+"""The LRU SolutionCache"""
+import numpy as np
+
+from cramer_engine import SolutionCache, cramer_solve
+
+
+def system(seed, n=3):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-1, 1, (n, n)) + n * np.eye(n), rng.uniform(-1, 1, n)
+
+
+def test_hits_misses_and_evictions():
+    cache = SolutionCache(2)
+    systems = [system(seed) for seed in range(3)]
+    for A, B in systems[:2]:
+        assert cache.get(A, B, "float") is None
+        cache.put(A, B, "float", cramer_solve(A, B))
+    assert cache.get(*systems[0], "float") is not None
+    # The least recently used entry, systems[1], makes room for systems[2]
+    cache.put(*systems[2], "float", cramer_solve(*systems[2]))
+    assert cache.get(*systems[1], "float") is None
+    assert cache.get(*systems[0], "float") is not None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (2, 3, 1, 2)
+
+
+def test_key_covers_contents_and_mode():
+    A, B = system(0)
+    cache = SolutionCache(8)
+    cache.put(A, B, "float", cramer_solve(A, B))
+    assert cache.get(A.copy(), B.copy(), "float") is not None
+    assert cache.get(A, B, "exact") is None
+    B2 = B.copy()
+    B2[0] += 1e-12
+    assert cache.get(A, B2, "float") is None
+
+
+def test_zero_size_disables_the_cache():
+    A, B = system(0)
+    cache = SolutionCache(0)
+    cache.put(A, B, "float", cramer_solve(A, B))
+    assert cache.get(A, B, "float") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_byte_budget():
+    systems = [system(seed, n=50) for seed in range(4)]
+    data = cramer_solve(*systems[0])
+    nbytes = data["A"].nbytes + 4 * data["B"].nbytes  # A, B, det_Ai_list, solutions, verification
+    cache = SolutionCache(100, max_bytes=2 * nbytes)
+    for A, B in systems:
+        cache.put(A, B, "float", cramer_solve(A, B))
+    assert len(cache.entries) == 2
+    assert cache.nbytes == 2 * nbytes
+    assert cache.stats()["evictions"] == 2
+    assert cache.get(*systems[3], "float") is not None
+
+    # A solution larger than the whole budget is not cached at all
+    small = SolutionCache(100, max_bytes=nbytes - 1)
+    small.put(*systems[0], "float", cramer_solve(*systems[0]))
+    assert small.stats()["size"] == 0 and small.nbytes == 0
@@ -0,0 +1,57 @@
+"""The command-line solver, run through cli.main"""
+import io
+import json
+
+import numpy as np
+
+import cli
+
+# det(A) = 1 exactly, but LU in double precision finds A singular
+NEAR_2_52 = "4503599627370496 4503599627370497 1\n4503599627370495 4503599627370496 2\n"
+
+
+def run(capsys, monkeypatch, text, *args):
+    monkeypatch.setattr("sys.stdin", io.StringIO(text))
+    status = cli.main(list(args))
+    return status, capsys.readouterr()
+
+
+def test_text_output(capsys, monkeypatch):
+    status, out = run(capsys, monkeypatch, "2 1 5\n1 3 10\n\n1 2 1\n2 4 2\n")
+    assert status == 1
+    assert "det(A) = 5" in out.out
+    assert "x1 = 1" in out.out and "x2 = 3" in out.out
+    assert "System 2:" in out.err
+
+
+def test_singular_to_float_lu_prints_an_infinite_condition(capsys, monkeypatch):
+    status, out = run(capsys, monkeypatch, NEAR_2_52)
+    assert status == 0
+    assert "cond(A) ≈ inf" in out.out
+    assert "x1 = -4503599627370498" in out.out
+
+
+def test_json_output_is_valid_json(capsys, monkeypatch):
+    n = 21
+    c = 2**52 - 1
+    A = np.eye(n, dtype=object) - c * np.eye(n, k=-1, dtype=object)
+    A[-1, -1] = 2
+    rows = [[*A[i], 1 if i == 0 else 0] for i in range(n)]
+    text = NEAR_2_52 + "\n" + "\n".join(" ".join(str(v) for v in row) for row in rows) + "\n"
+    status, out = run(capsys, monkeypatch, text, "--json", "--max-exact-n", "30")
+    assert status == 0
+    first, second = [json.loads(line) for line in out.out.splitlines()]
+    assert first["cond"] is None and first["exact"]
+    assert second["solutions"][-1] is None
+    assert second["solutions_text"][-1].endswith("≈ inf")
+
+
+def test_max_exact_n_switches_to_float(capsys, monkeypatch):
+    status, out = run(capsys, monkeypatch, "2 1 5\n1 3 10\n", "--json", "--max-exact-n", "1")
+    assert status == 0
+    assert not json.loads(out.out)["exact"]
+
+
+def test_missing_file(capsys):
+    assert cli.main(["does-not-exist.txt"]) == 1
+    assert "Could not read does-not-exist.txt" in capsys.readouterr().err
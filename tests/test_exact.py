@@ -0,0 +1,77 @@
+"""Exact (Bareiss) Cramer's Rule for whole-number systems"""
+import math
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from cramer_engine import (
+    bareiss_solve,
+    cramer_solve,
+    exact_cramer_solve,
+    format_condition,
+    format_solution,
+    solve,
+)
+
+
+def test_bareiss_matches_float_solve():
+    rng = np.random.default_rng(1)
+    A = rng.integers(-9, 10, (6, 6))
+    B = rng.integers(-9, 10, 6)
+    det_A, det_Ai_list, solutions = bareiss_solve(A.tolist(), B.tolist())
+    assert det_A == round(np.linalg.det(A))
+    assert all(isinstance(x, Fraction) for x in solutions)
+    assert [Fraction(d, det_A) for d in det_Ai_list] == solutions
+    assert np.allclose([float(x) for x in solutions], np.linalg.solve(A, B))
+
+
+def test_bareiss_several_right_hand_sides():
+    det_A, det_Ai_list, solutions = bareiss_solve([[2, 1], [1, 3]], [[5, 1], [10, 0]])
+    assert det_A == 5
+    assert det_Ai_list == [[5, 3], [15, -1]]
+    assert solutions == [[1, Fraction(3, 5)], [3, Fraction(-1, 5)]]
+
+
+def test_bareiss_singular():
+    with pytest.raises(np.linalg.LinAlgError):
+        bareiss_solve([[1, 2], [2, 4]], [1, 2])
+
+
+def test_exact_solve_of_a_system_singular_to_float_lu():
+    # det(A) = 1 exactly, but LU in double precision rounds the last pivot to 0
+    A = np.array([[2.0**52, 2.0**52 + 1], [2.0**52 - 1, 2.0**52]])
+    B = np.array([1.0, 2.0])
+    with pytest.raises(np.linalg.LinAlgError):
+        cramer_solve(A, B)
+    data = solve(A, B)
+    assert data["exact"]["det_A"] == 1
+    assert data["exact"]["solutions"] == [-(2**52) - 2, 2**52 + 1]
+    assert data["cond"] == math.inf
+    assert format_condition(data["cond"]).startswith("inf")
+
+
+def test_exact_determinant_beyond_the_float_range():
+    n = 80
+    A = np.eye(n) * 10**5
+    B = np.full(n, 10.0**5)
+    data = exact_cramer_solve(A, B)
+    assert data["exact"]["det_A"] == 10 ** (5 * n)
+    assert data["det_A"] == math.inf
+    assert np.isfinite(data["log_abs_det"])
+    assert np.allclose(data["solutions"], 1.0)
+
+
+def test_exact_fraction_beyond_the_float_range():
+    # x_i = c**(i - 1) down the chain, halved in the last row: x_21 ≈ 5.9e311 and not whole
+    n = 21
+    c = 2**52 - 1
+    A = np.eye(n) - c * np.eye(n, k=-1)
+    A[-1, -1] = 2
+    B = np.zeros(n)
+    B[0] = 1
+    data = exact_cramer_solve(A, B)
+    assert data["exact"]["solutions"][-1] == Fraction(c**20, 2)
+    assert data["solutions"][-1] == math.inf
+    _, _, solution_texts = format_solution(data)
+    assert solution_texts[-1].endswith("/2 ≈ inf")
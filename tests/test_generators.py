@@ -0,0 +1,49 @@
+"""Random system families of generators.py"""
+import numpy as np
+import pytest
+
+from cramer_engine import bareiss_solve
+from generators import FAMILIES, generate_system, generate_systems
+
+
+@pytest.mark.parametrize("det", [1, -1, 6, -12])
+def test_known_det_is_exact(det):
+    A, _ = generate_systems("known_det", 20, 8, seed=1, det=det)
+    assert (A == np.round(A)).all()
+    for matrix in A:
+        det_A, _, _ = bareiss_solve(matrix.astype(np.int64).tolist(), [0] * 8)
+        assert det_A == det
+
+
+def test_known_det_with_unit_det_has_whole_number_solutions():
+    A, B = generate_system("known_det", 10, seed=2, det=-1)
+    _, _, solutions = bareiss_solve(A.astype(np.int64).tolist(), B.astype(np.int64).tolist())
+    assert all(x.denominator == 1 for x in solutions)
+
+
+@pytest.mark.parametrize("det", [0, 2.5])
+def test_known_det_rejects_other_determinants(det):
+    with pytest.raises(ValueError):
+        generate_systems("known_det", 1, 4, det=det)
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+def test_families_are_seeded_and_shaped(family):
+    A, B = generate_systems(family, 5, 6, k=3, seed=7)
+    assert A.shape == (5, 6, 6) and B.shape == (5, 6, 3)
+    A2, B2 = generate_systems(family, 5, 6, k=3, seed=7)
+    assert np.array_equal(A, A2) and np.array_equal(B, B2)
+
+
+def test_spd_and_banded_structure():
+    A, _ = generate_systems("spd", 4, 6, seed=3)
+    assert np.allclose(A, A.transpose(0, 2, 1))
+    assert (np.linalg.eigvalsh(A) > 0).all()
+    A, _ = generate_systems("banded", 4, 6, seed=3, bandwidth=1)
+    i, j = np.indices((6, 6))
+    assert (A[:, np.abs(i - j) > 1] == 0).all()
+
+
+def test_unknown_family():
+    with pytest.raises(ValueError, match="Unknown family"):
+        generate_systems("hilbert", 1, 3)
@@ -0,0 +1,21 @@
+"""The solver core and its command-line tools run without NiceGUI or FastAPI"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.parametrize("module", ["cramer_engine", "cli", "batch", "generators", "sweep", "records", "history"])
+def test_import_skips_the_web_stack(module):
+    code = (
+        f"import sys, {module}; "
+        "print(' '.join(m for m in ('nicegui', 'fastapi', 'pydantic') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
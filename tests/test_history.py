@@ -0,0 +1,59 @@
+"""The SQLite solve history"""
+import sqlite3
+
+import numpy as np
+
+from cramer_engine import cramer_solve, exact_cramer_solve
+from history import SolveHistory
+
+
+def test_history_round_trip(tmp_path):
+    history = SolveHistory(str(tmp_path / "history.sqlite3"), max_entries=2)
+    try:
+        rng = np.random.default_rng(0)
+        A, B = rng.uniform(-10, 10, (5, 5)) + 5 * np.eye(5), rng.uniform(-10, 10, 5)
+        float_data = cramer_solve(A, B)
+        exact_data = exact_cramer_solve(np.array([[2.0, 1.0], [1.0, 3.0]]), np.array([[5.0, 1.0], [10.0, 0.0]]))
+
+        float_id = history.record(float_data, "float", 0.1, owner="browser-a")
+        exact_id = history.record(exact_data, "exact", 0.2, owner="browser-b")
+
+        loaded = history.load(float_id)
+        for name in ("A", "B", "det_Ai_list", "solutions", "verification"):
+            assert np.array_equal(loaded[name], float_data[name])
+        assert loaded["det_A"] == float_data["det_A"]
+        assert "exact" not in loaded
+
+        loaded = history.load(exact_id, owner="browser-b")
+        assert loaded["B"].shape == (2, 2)
+        assert loaded["exact"] == exact_data["exact"]
+        assert history.load(exact_id, owner="browser-a") is None
+
+        assert history.find(A, B, "float") is not None
+        assert [row["id"] for row in history.page(0, 10, owner="browser-a")] == [float_id]
+        assert history.count() == 2
+
+        # The oldest solve and its system are pruned past max_entries
+        history.record(exact_data, "exact", 0.3)
+        assert history.count() == 2
+        assert history.find(A, B, "float") is None
+    finally:
+        history.close()
+
+
+def test_history_adds_owners_to_old_files(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE solves (id INTEGER PRIMARY KEY, system_id INTEGER NOT NULL, "
+        "created REAL NOT NULL, seconds REAL NOT NULL)"
+    )
+    db.execute("INSERT INTO solves (system_id, created, seconds) VALUES (1, 0, 0)")
+    db.commit()
+    db.close()
+    history = SolveHistory(path)
+    try:
+        assert history.count() == 1
+        assert history.count(owner="browser-a") == 0
+    finally:
+        history.close()
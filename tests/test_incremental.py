@@ -0,0 +1,63 @@
+"""Rank-1 updates of IncrementalSolver after single-cell edits"""
+import numpy as np
+import pytest
+
+from cramer_engine import IncrementalSolver, cramer_solve
+
+
+def random_system(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-10, 10, (n, n)) + n * np.eye(n), rng.uniform(-10, 10, n)
+
+
+def test_incremental_solver_rank_1_updates():
+    A, B = random_system(60)
+    solver = IncrementalSolver(min_n=48)
+    solver.solve(A, B)
+
+    A2 = A.copy()
+    A2[3, 7] += 2.5
+    data = solver.solve(A2, B)
+    expected = cramer_solve(A2, B)
+    assert solver.incremental_solves == 1
+    assert np.allclose(data["solutions"], expected["solutions"])
+    assert data["log_abs_det"] == pytest.approx(expected["log_abs_det"])
+    assert data["det_sign"] == expected["det_sign"]
+
+    # A new B alone reuses the inverse
+    B2 = B + 1.0
+    assert np.allclose(solver.solve(A2, B2)["solutions"], np.linalg.solve(A2, B2))
+    assert solver.incremental_solves == 2
+
+    # Two changed cells need a full solve
+    A3 = A2.copy()
+    A3[0, 0] += 1.0
+    A3[1, 1] += 1.0
+    assert not solver.can_update(A3)
+    solver.solve(A3, B)
+    assert solver.full_solves == 2
+
+
+def test_incremental_solver_skips_small_and_exact_systems():
+    A, B = random_system(4)
+    solver = IncrementalSolver(min_n=48)
+    solver.solve(A, B)
+    assert not solver.can_update(A)
+    big_A, _ = random_system(60)
+    solver.remember(big_A, {"exact": {}, "det_sign": 1.0, "log_abs_det": 0.0})
+    assert not solver.can_update(big_A)
+
+
+def test_incremental_solver_residual_bound_with_badly_scaled_columns():
+    A, B = random_system(60, seed=3)
+    A[:, 0] *= 1e8
+    solver = IncrementalSolver(min_n=48)
+    solver.solve(A, B)
+    for i in range(10):
+        A = A.copy()
+        A[i, (i + 1) % 60] += 3.0
+        data = solver.solve(A, B)
+        x = data["solutions"]
+        scale = (np.abs(A) @ np.abs(x)).sum() + np.abs(B).sum()
+        assert np.abs(A @ x - B).sum() <= solver.tol * scale
+        assert np.allclose(x, np.linalg.solve(A, B), rtol=1e-6, atol=1e-12)
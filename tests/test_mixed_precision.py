@@ -0,0 +1,36 @@
+"""float32 factorizations refined to float64 accuracy in solve_batch"""
+import numpy as np
+
+from cramer_engine import solve_batch
+
+
+
+def test_mixed_precision_batch():
+    rng = np.random.default_rng(2)
+    A = rng.uniform(-1, 1, (50, 16, 16)) + 16 * np.eye(16)
+    B = rng.uniform(-1, 1, (50, 16))
+    double = solve_batch(A, B)
+    mixed = solve_batch(A, B, precision="mixed")
+    assert not mixed["fallback"].any()
+    assert (mixed["refinement_steps"] > 0).all()
+    assert np.allclose(mixed["solutions"], double["solutions"], rtol=1e-12, atol=1e-14)
+    assert np.allclose(mixed["det_A"], double["det_A"], rtol=1e-5)
+
+
+def test_mixed_precision_falls_back_for_ill_conditioned_systems():
+    n = 10
+    hilbert = 1.0 / (np.arange(n)[:, None] + np.arange(n) + 1)
+    A = np.stack([hilbert, np.eye(n)])
+    B = np.ones((2, n))
+    mixed = solve_batch(A, B, precision="mixed")
+    assert mixed["fallback"].tolist() == [True, False]
+    assert np.allclose(mixed["solutions"], solve_batch(A, B)["solutions"])
+
+
+def test_float32_input_is_used_as_is():
+    rng = np.random.default_rng(4)
+    A = (rng.uniform(-1, 1, (8, 6, 6)) + 6 * np.eye(6)).astype(np.float32)
+    B = rng.uniform(-1, 1, (8, 6))
+    mixed = solve_batch(A, B, precision="mixed")
+    expected = np.linalg.solve(A.astype(float), B[..., None])[..., 0]
+    assert np.allclose(mixed["solutions"], expected, rtol=1e-12, atol=1e-14)
@@ -0,0 +1,44 @@
+"""The array-backed SystemModel behind the input grid"""
+import numpy as np
+import pytest
+
+from cramer_engine import MissingValueError, SystemModel
+
+
+
+def test_system_model_resize_keeps_the_overlap():
+    model = SystemModel(3, k=2)
+    model.load(np.arange(9.0).reshape(3, 3), np.array([[10.0, 20.0], [11.0, 21.0], [12.0, 22.0]]))
+
+    model.resize(4)
+    assert (model.n, model.k) == (4, 2)
+    assert model.get(2, 2) == 8.0
+    assert model.get(2, 4) == 12.0 and model.get(2, 5) == 22.0
+    assert model.get(3, 0) is None and model.get(0, 3) is None
+
+    model.resize(2, k=1)
+    assert model.rows() == [[0.0, 1.0, 10.0], [3.0, 4.0, 11.0]]
+    A, B = model.system()
+    assert B.shape == (2,)
+
+
+def test_set_get_and_missing_values():
+    model = SystemModel(2)
+    model.set(0, 0, "2")
+    model.set(0, 1, 1.5)
+    assert model.get(0, 0) == 2.0 and model.get(1, 1) is None
+    with pytest.raises(MissingValueError, match="coefficient"):
+        model.system()
+    model.set(1, 0, 0)
+    model.set(1, 1, 1)
+    with pytest.raises(MissingValueError, match="constant"):
+        model.system()
+    model.set(0, 2, 1)
+    model.set(1, 2, 2)
+    A, B = model.system()
+    assert A.tolist() == [[2.0, 1.5], [0.0, 1.0]] and B.tolist() == [1.0, 2.0]
+
+    model.set(0, 0, "")
+    assert model.get(0, 0) is None
+    model.clear()
+    assert not model.filled.any()
@@ -0,0 +1,45 @@
+"""The vectorized solve_batch over stacks of systems"""
+import numpy as np
+import pytest
+
+from cramer_engine import solve_batch
+
+
+def test_solve_batch_matches_single_solves():
+    rng = np.random.default_rng(0)
+    A = rng.uniform(-1, 1, (20, 5, 5)) + 5 * np.eye(5)
+    B = rng.uniform(-1, 1, (20, 5))
+    result = solve_batch(A, B)
+    assert np.allclose(result["solutions"], np.linalg.solve(A, B[..., None])[..., 0])
+    assert np.allclose(result["det_A"], np.linalg.det(A))
+    assert np.allclose(result["det_Ai"], result["det_A"][:, None] * result["solutions"])
+    assert np.allclose(result["residuals"], 0, atol=1e-12)
+    assert not result["singular"].any()
+
+
+def test_singular_systems_are_masked_without_stopping_the_batch():
+    A = np.array([np.eye(2), [[1.0, 2.0], [2.0, 4.0]], [[1.0, 1.0], [1.0, 1.0 + 1e-17]], [[2.0, 1.0], [1.0, 3.0]]])
+    B = np.array([[1.0, 2.0], [1.0, 2.0], [1.0, 2.0], [5.0, 10.0]])
+    result = solve_batch(A, B)
+    assert result["singular"].tolist() == [False, True, True, False]
+    assert np.isnan(result["solutions"][1:3]).all()
+    assert np.isnan(result["residuals"][1:3]).all()
+    assert result["det_sign"][1] == 0
+    assert np.allclose(result["solutions"][3], [1.0, 3.0])
+
+
+def test_max_cond_rejects_ill_conditioned_systems():
+    A = np.array([np.eye(2), [[1.0, 1.0], [1.0, 1.0 + 1e-9]]])
+    B = np.ones((2, 2))
+    result = solve_batch(A, B, max_cond=1e6)
+    assert result["ill_conditioned"].tolist() == [False, True]
+    assert not result["singular"].any()
+    assert np.isnan(result["solutions"][1]).all()
+    assert result["cond"][1] > 1e6
+
+
+def test_solve_batch_checks_shapes_and_precision():
+    with pytest.raises(ValueError):
+        solve_batch(np.zeros((2, 3, 3)), np.zeros((2, 2)))
+    with pytest.raises(ValueError):
+        solve_batch(np.eye(3)[None], np.ones((1, 3)), precision="half")
@@ -0,0 +1,62 @@
+"""Parametric sweeps of sweep.py"""
+import numpy as np
+import pytest
+
+from sweep import det_roots, parse_expression, parse_sweep_text, plot_indices, sweep
+
+
+def test_sweep_matches_single_solves():
+    rows = parse_sweep_text("2*t, 1, 5\n1, cos(pi*t), 10")
+    t = np.linspace(0, 1, 11)
+    result = sweep(rows, t)
+    for k, value in enumerate(t):
+        A = np.array([[2 * value, 1], [1, np.cos(np.pi * value)]])
+        assert result["det_A"][k] == pytest.approx(np.linalg.det(A), abs=1e-12)
+        if not result["singular"][k]:
+            assert np.allclose(result["solutions"][k], np.linalg.solve(A, [5, 10]))
+
+
+def test_det_roots_are_found_between_samples():
+    # det(A) = t**2 - 1/4 changes sign at ±1/2, which no sample hits
+    rows = parse_sweep_text("t 0.5 1\n0.5 t 2")
+    result = sweep(rows, np.linspace(-1, 1, 40))
+    assert np.allclose(result["det_roots"], [-0.5, 0.5], atol=1e-3)
+
+
+def test_exact_zero_of_det_is_a_root():
+    t = np.array([-1.0, 0.0, 1.0])
+    det_A = np.array([1.0, 0.0, 1.0])
+    roots = det_roots(t, det_A, np.sign(det_A), np.zeros(3, dtype=bool))
+    assert roots.tolist() == [0.0]
+
+
+def test_undefined_samples():
+    rows = parse_sweep_text("1/t, 0, 1\n0, 1, 1")
+    result = sweep(rows, np.array([-1.0, 0.0, 1.0]))
+    assert result["undefined"].tolist() == [False, True, False]
+    assert np.isnan(result["solutions"][1]).all()
+    assert not result["singular"][1]
+    assert np.allclose(result["solutions"][[0, 2], 0], [-1.0, 1.0])
+
+
+@pytest.mark.parametrize("text", ["__import__('os')", "t.real", "x + 1", "max(t)", "sin(t, 2)", "'a'"])
+def test_unsupported_expressions(text):
+    with pytest.raises(ValueError):
+        parse_expression(text)
+
+
+def test_parse_sweep_text_checks_the_shape():
+    with pytest.raises(ValueError, match="rows of 3 entries"):
+        parse_sweep_text("1 2\n3 4")
+    with pytest.raises(ValueError, match="no coefficients"):
+        parse_sweep_text("# only a comment\n")
+
+
+def test_plot_indices_keep_peaks():
+    y = np.zeros(10000)
+    y[1234] = 50.0
+    y[8765] = -50.0
+    indices = plot_indices(y, 100)
+    assert len(indices) <= 100
+    assert {1234, 8765} <= set(indices.tolist())
+    assert plot_indices(y[:50], 100).tolist() == list(range(50))
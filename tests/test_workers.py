@@ -0,0 +1,42 @@
+"""SolveWorkers and the launcher's behaviour in spawned solve workers"""
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from cramer_engine import solve
+from workers import SolveWorkers
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.parametrize("kind", ["inline", "thread", "process"])
+def test_run_returns_results_and_raises_errors(kind):
+    workers = SolveWorkers(kind, 1)
+
+    async def main():
+        data = await workers.run(solve, np.array([[2.0, 1.0], [1.0, 3.0]]), np.array([5.0, 10.0]))
+        with pytest.raises(np.linalg.LinAlgError):
+            await workers.run(solve, np.array([[1.0, 2.0], [2.0, 4.0]]), np.array([1.0, 2.0]))
+        return data
+
+    try:
+        data = asyncio.run(main())
+    finally:
+        workers.shutdown()
+    assert data["solutions"].tolist() == [1.0, 3.0]
+
+
+def test_main_does_not_start_the_app_in_solve_workers():
+    code = (
+        "import os, runpy, sys; os.environ['CRAMER_SOLVE_WORKER'] = '1'; "
+        "runpy.run_path('main.py', run_name='__mp_main__'); "
+        "print('nicegui' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
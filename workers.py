@@ -0,0 +1,58 @@
+"""Pool that runs solves off the event loop.
+
+Process workers are spawned, so each one runs main.py again as __mp_main__
+before taking jobs. SOLVE_WORKER_ENV is set for them, and main.py then
+skips the app: a worker only imports the modules its jobs are pickled from.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+SOLVE_WORKER_ENV = "CRAMER_SOLVE_WORKER"
+
+
+class SolveWorkers:
+    """Pool that runs solves off the event loop, created on first use"""
+
+    def __init__(self, kind, max_workers):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.executor = None
+
+    def get_executor(self):
+        if self.executor is None:
+            if self.kind == "process":
+                # Inherited by the spawned workers, so main.py does not build the app in them
+                os.environ[SOLVE_WORKER_ENV] = "1"
+                # spawn: forking a process that already runs the server threads is unsafe
+                self.executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self.executor = ThreadPoolExecutor(self.max_workers)
+        return self.executor
+
+    def submit(self, func, *args, **kwargs):
+        """Start func(*args, **kwargs) on the pool and return its concurrent.futures.Future.
+
+        Cancelling the future only removes a job that has not started yet; a
+        running job goes on until it returns.
+        """
+        if self.kind != "inline":
+            return self.get_executor().submit(func, *args, **kwargs)
+        future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    async def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on the pool; exceptions are re-raised here"""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None